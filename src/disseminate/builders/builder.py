@@ -13,8 +13,9 @@ from .executor import executor, run, runtime_error, runtime_success
 from .utils import generate_outfilepath, generate_mock_parameters
 from .exceptions import BuildError
 from ..signals import signal
-from ..utils.classes import all_subclasses
+from ..utils.classes import RegisteredClass, all_subclasses
 from ..utils.list import uniq, flatten
+from ..utils.trace import tracer
 from ..paths import TargetPath
 from .. import settings
 
@@ -39,7 +40,7 @@ class CustomFormatter(Formatter):
         return str(f).strip('-*`')
 
 
-class Builder(metaclass=ABCMeta):
+class Builder(RegisteredClass, metaclass=ABCMeta):
     """A build for an output file.
 
     Parameters
@@ -282,9 +283,11 @@ class Builder(metaclass=ABCMeta):
         inputs = list(self.parameters)
         if self.action:
             inputs.append(self.action)
-        return self.decision.build_needed(inputs=inputs,
-                                          output=self.outfilepath,
-                                          reset=reset)
+        with tracer.span(self.__class__.__name__ + '.build_needed',
+                         cat='decision', reset=reset):
+            return self.decision.build_needed(inputs=inputs,
+                                              output=self.outfilepath,
+                                              reset=reset)
 
     @property
     def parameters(self):
@@ -445,8 +448,12 @@ class Builder(metaclass=ABCMeta):
             logging.debug("'{}' run with: '{}'".format(self.__class__.__name__,
                                                        " ".join(args)))
 
-            # add the process to the executor pool
-            future = executor.submit(run, args=args, timeout=self.timeout)
+            # add the process to the executor pool. The run is traced in the
+            # track of the thread that runs it, if tracing is enabled.
+            traced_run = tracer.wrap(run, name=self.__class__.__name__,
+                                     cat='subprocess', cmd=" ".join(args))
+            future = executor.submit(traced_run, args=args,
+                                     timeout=self.timeout)
             self.future = future
 
     def build(self, complete=False):
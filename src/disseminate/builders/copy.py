@@ -1,11 +1,13 @@
 """
 A Builder to copy or link files.
 """
+import os
 import logging
 import pathlib
-from shutil import copyfile, SameFileError
+from shutil import copyfileobj
 
 from .builder import Builder
+from ..utils.file import atomic_open
 
 
 class Copy(Builder):
@@ -58,13 +60,15 @@ class Copy(Builder):
 
             # Copy the file if the 2 files have different paths and contents.
             # If they have the same path, or they are hardlinks of each other,
-            # then a shutil.SameFileError exception is raised.
-            try:
-                copyfile(infilepath, outfilepath)
+            # then nothing is copied. The output file is replaced atomically
+            # so that the previous file is available until the copy is done.
+            if not (outfilepath.exists() and
+                    os.path.samefile(infilepath, outfilepath)):
+                with open(infilepath, 'rb') as fsrc, \
+                        atomic_open(outfilepath, 'wb') as fdst:
+                    copyfileobj(fsrc, fdst)
                 logging.debug("Copying '{}' -> '{}'".format(infilepath,
                                                             outfilepath))
-            except SameFileError:
-                pass
 
             self.build_needed(reset=True)  # reset build flag
         return self.status
@@ -1,6 +1,9 @@
 """
 A decider that uses MD5 hashes.
 """
+import os
+import pathlib
+
 import diskcache
 
 from .decider import Decider, Decision
@@ -37,9 +40,13 @@ class Md5Decision(Decision):
             input_hash, output_hash = self.calculate_hash(inputs=inputs,
                                                           output=output)
             db[input_hash] = output_hash
+            self.parent_decider.record_output(output, output_hash)
             return False
+        elif cached_output_hash != output_hash:
+            return True
         else:
-            return cached_output_hash != output_hash
+            self.parent_decider.record_output(output, output_hash)
+            return False
 
     @staticmethod
     def calculate_hash(inputs, output):
@@ -58,9 +65,11 @@ class Md5Decider(Decider):
     decision_cls = Md5Decision
 
     _db = None
+    _outputs = None
 
     def __init__(self, env, name=None):
         self.name = name
+        self._outputs = dict()
         super().__init__(env)
 
     def __del__(self):
@@ -79,3 +88,67 @@ class Md5Decider(Decider):
         if self._db is None:
             self._db = diskcache.Cache(self.db_path)
         return self._db
+
+    @staticmethod
+    def _output_key(output):
+        """The database key and file stats for an output file."""
+        path = os.path.abspath(output)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return path, None
+        return path, (stat.st_mtime_ns, stat.st_size)
+
+    def record_output(self, output, output_hash):
+        """Record the md5 hash for a built output file.
+
+        The hash is stored with the mtime and size of the file so that it
+        can be retrieved with :meth:`output_hash` without reading the file
+        while the file is unchanged.
+
+        Parameters
+        ----------
+        output : :obj:`.paths.TargetPath`
+            The outfilepath for the built file.
+        output_hash : str
+            The md5 hash for the output file.
+        """
+        if not isinstance(output, pathlib.Path):
+            return
+        path, stats = self._output_key(output)
+        if stats is None:
+            return
+
+        entry = stats + (output_hash,)
+        if self._outputs.get(path) != entry:
+            self._outputs[path] = entry
+            self.db['output:' + path] = entry
+
+    def output_hash(self, output):
+        """The recorded md5 hash for an output file.
+
+        Parameters
+        ----------
+        output : Union[str, :obj:`pathlib.Path`]
+            The path of the output file.
+
+        Returns
+        -------
+        output_hash : Union[str, None]
+            The md5 hash of the output file, or None if a hash wasn't
+            recorded or the file has changed since it was recorded.
+        """
+        path, stats = self._output_key(output)
+        if stats is None:
+            return None
+
+        entry = self._outputs.get(path)
+        if entry is None or entry[:2] != stats:
+            # Load the entry from the database. Missing entries are stored
+            # as well so that the database is only read once per file version
+            entry = self.db.get('output:' + path, None)
+            entry = tuple(entry) if entry is not None else None
+            if entry is None or entry[:2] != stats:
+                entry = stats + (None,)
+            self._outputs[path] = entry
+        return entry[2]
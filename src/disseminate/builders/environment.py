@@ -8,6 +8,7 @@ from .deciders import Decider
 from .scanners import Scanner
 from .composite_builders import ParallelBuilder
 from ..document import Document
+from ..label_manager.label_cache import LabelCache
 from ..paths import SourcePath, TargetPath
 from .. import settings
 
@@ -42,6 +43,7 @@ class Environment(object):
     target_root = None
 
     _cache_path = None
+    _label_cache = None
     _concrete_builders = None
 
     def __init__(self, src_filepath, target_root=None, parent_context=None):
@@ -93,6 +95,21 @@ class Environment(object):
             self._cache_path = cache_path
         return self._cache_path
 
+    @property
+    def label_cache(self):
+        """The :obj:`LabelCache <.label_manager.label_cache.LabelCache>` for
+        the labels of the project, or None if the label cache is disabled.
+        (See settings.label_cache)
+
+        The label cache file is saved in the cache_path when the root builder
+        is created.
+        """
+        if self._label_cache is None and settings.label_cache:
+            filepath = (pathlib.Path(self.target_root) / settings.cache_path /
+                        settings.label_cache_filename)
+            self._label_cache = LabelCache(filepath=filepath)
+        return self._label_cache
+
     @property
     def media_path(self):
         """The path for to prepend to subpaths for media files."""
@@ -214,6 +231,11 @@ class Environment(object):
         root_builder = ParallelBuilder(env=self)
         root_builder.clear_done = True
 
+        # Save the labels of the documents for the next load of the project
+        label_cache = self.label_cache
+        if label_cache is not None:
+            label_cache.save()
+
         # Get all of the documents
         subbuilders = self.collect_target_builders(document=document)
         root_builder.subbuilders += subbuilders
@@ -12,8 +12,11 @@ from .exceptions import BuildError
 from .utils import generate_mock_parameters, generate_outfilepath
 from ..paths import SourcePath
 from ..paths.utils import find_file
+from ..utils.file import write_text
 from ..utils.list import uniq
+from ..utils.string import hashtxt
 from ..utils.classes import weakattr
+from ..utils.trace import tracer
 from .. import settings
 
 
@@ -26,7 +29,7 @@ def run(template, context, outfilepath, target):
     else:
         rendered_string = template.render(**context, outfilepath=outfilepath,
                                           target=target)
-    outfilepath.write_text(rendered_string)
+    write_text(outfilepath, rendered_string)
     return outfilepath
 
 
@@ -181,9 +184,17 @@ class JinjaRender(Builder):
             # Scan for additional dependencies
             parameters += self.env.scanner.scan(parameters=parameters)
 
-            # add hashes (from tags) to context values
-            parameters += sorted(v.hash for v in context.values()
-                                 if hasattr(v, 'hash') and v.hash is not None)
+            # add hashes (from tags) to context values. The entries of
+            # documents with deferred tags are still strings, and these are
+            # hashed like the contents of tags.
+            document = getattr(context, 'document', None)
+            tag_keys = (context.get('process_context_tags', ())
+                        if document is not None and
+                        document.deferred is not None else ())
+            parameters += sorted(hashtxt(v) if isinstance(v, str) else v.hash
+                                 for k, v in context.items()
+                                 if (k in tag_keys and isinstance(v, str)) or
+                                 getattr(v, 'hash', None) is not None)
 
         return uniq(parameters)
 
@@ -242,19 +253,29 @@ class JinjaRender(Builder):
     def build(self, complete=False):
         template = self.template()
         context = self.context
+
+        # Create the tags of the document, if these were deferred
+        document = getattr(context, 'document', None)
+        if document is not None:
+            document.load_deferred()
+
         outfilepath = self.outfilepath
 
         logging.debug("Rendering '{}' with Jinja2 "
                       "'{}'".format(outfilepath, template))
-        if 'target' in context:
-            rendered_string = template.render(**context,
-                                              outfilepath=outfilepath)
-        else:
-            rendered_string = template.render(**context,
-                                              target=self.render_ext,
-                                              outfilepath=outfilepath)
-
-        outfilepath.write_text(rendered_string)
+        with tracer.span('JinjaRender', cat='render',
+                         template=template.name, outfilepath=outfilepath):
+            if 'target' in context:
+                rendered_string = template.render(**context,
+                                                  outfilepath=outfilepath)
+            else:
+                rendered_string = template.render(**context,
+                                                  target=self.render_ext,
+                                                  outfilepath=outfilepath)
+
+        # Replace the output file atomically so that the previous file is
+        # available until the new file is written
+        write_text(outfilepath, rendered_string)
         self.build_needed(reset=True)
         return self.status
 
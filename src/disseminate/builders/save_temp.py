@@ -5,6 +5,7 @@ import logging
 
 from .builder import Builder, BuildError
 from ..utils.classes import weakattr
+from ..utils.file import write_text
 
 
 class SaveTempFile(Builder):
@@ -53,7 +54,7 @@ class SaveTempFile(Builder):
 
         outfilepath = self.outfilepath
         logging.debug("Saving temporary file to '{}'".format(outfilepath))
-        outfilepath.write_text(string)
+        write_text(outfilepath, string)
 
         self.build_needed(reset=True)  # reset build flag
         return self.status
@@ -2,10 +2,10 @@
 A scanner object to find implicit dependencies.
 """
 from ...paths import SourcePath, TargetPath
-from ...utils.classes import all_subclasses
+from ...utils.classes import RegisteredClass, all_subclasses
 
 
-class Scanner(object):
+class Scanner(RegisteredClass):
     """A scanner object parses the contents of a file and finds implicit file
     dependencies.
     """
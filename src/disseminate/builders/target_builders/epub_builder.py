@@ -95,6 +95,9 @@ class EpubBuilder(TargetBuilder):
         """
         context = context or self.context
         cache_path = self.env.cache_path
+
+        # The toc tag is needed from the document
+        context.document.load_deferred()
         outfilepath = TargetPath(target_root=cache_path, target='xhtml',
                                  subpath='toc.xhtml')
 
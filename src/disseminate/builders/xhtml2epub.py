@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from .composite_builders import SequentialBuilder
 from ..paths.utils import find_file
 from ..utils.classes import weakattr
+from ..utils.file import atomic_open
 from ..utils.string import slugify
 
 
@@ -166,8 +167,9 @@ class XHtml2Epub(SequentialBuilder):
         logging.debug("Creating epub file '{}'".format(outfilepath))
 
         # Create the epub
-        with zipfile.ZipFile(outfilepath, 'w',
-                             compression=zipfile.ZIP_DEFLATED) as epub:
+        with atomic_open(outfilepath, 'wb') as f, \
+                zipfile.ZipFile(f, 'w',
+                                compression=zipfile.ZIP_DEFLATED) as epub:
             # Add the mimetype file
             epub.writestr('mimetype',
                           "application/epub+zip".encode(),
@@ -4,11 +4,11 @@ The Checker base class for checking dependencies.
 import shutil
 
 from .types import All, SoftwareDependency, SoftwareDependencyList
-from ..utils.classes import all_subclasses
+from ..utils.classes import RegisteredClass, all_subclasses
 from .exceptions import MissingHandler
 
 
-class Checker(All):
+class Checker(All, RegisteredClass):
     """Check for installed dependencies.
 
     .. note::
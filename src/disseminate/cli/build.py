@@ -10,34 +10,67 @@ import click
 
 from .options import file_options, check_out_dir
 from .utils.progressbar import ProgressTable
+from .setup.signals import print_signal_profile
 from ..builders.environment import Environment
+from ..signals.signals import signals
+from ..utils.trace import tracer
 
 
 @click.command()
 @file_options
 @click.option('-p', '--progress', is_flag=True, default=False,
               help="Show a progress bar for the build")
-def build(in_path, out_dir=None, progress=False):
+@click.option('--trace', required=False, default=None,
+              type=click.Path(file_okay=True, dir_okay=False, writable=True),
+              help="Save a trace of the build (Chrome trace-event format) to "
+                   "the given file")
+@click.option('--profile-signals', is_flag=True, default=False,
+              help="Show the call counts and timings of signal receivers")
+def build(in_path, out_dir=None, progress=False, trace=None,
+          profile_signals=False):
     """Build a disseminate project"""
-    # Setup the build environment
-    envs = Environment.create_environments(root_path=in_path,
-                                           target_root=out_dir)
-    docs = [env.root_document for env in envs]
-    check_out_dir(root_docs=docs, out_dir=out_dir)
+    # Record events for the trace and profile, if enabled. This must be done
+    # before creating the environments so that the document loads are
+    # included.
+    if trace is not None:
+        tracer.enable()
+    if profile_signals:
+        signals.enable_profiling()
 
-    for env in envs:
-        root_builder = env.create_root_builder()
-        builders = root_builder.flatten()
+    try:
+        # Setup the build environment
+        envs = Environment.create_environments(root_path=in_path,
+                                               target_root=out_dir)
+        docs = [env.root_document for env in envs]
+        check_out_dir(root_docs=docs, out_dir=out_dir)
 
-        if progress:  # Print progress, if enabled
-            progress_table = ProgressTable(environment=env)
-            progress_table.print_hdr()
-            progress_table.print_row(builders)
-
-        status = root_builder.status
-        while status in {'ready', 'building'}:
-            status = root_builder.build(complete=False)
+        for env in envs:
+            root_builder = env.create_root_builder()
+            builders = root_builder.flatten()
 
             if progress:  # Print progress, if enabled
+                progress_table = ProgressTable(environment=env)
+                progress_table.print_hdr()
                 progress_table.print_row(builders)
-        print('Build:', root_builder.status)
+
+            # The document is reloaded with each build step. Scan the source
+            # files once for the whole build.
+            with env.root_document.scanned_mtimes():
+                status = root_builder.status
+                while status in {'ready', 'building'}:
+                    status = root_builder.build(complete=False)
+
+                    if progress:  # Print progress, if enabled
+                        progress_table.print_row(builders)
+            print('Build:', root_builder.status)
+    finally:
+        # Save the trace, if enabled. The trace and profile are also saved
+        # for builds that fail
+        if trace is not None:
+            tracer.disable()
+            tracer.save(trace)
+
+        # Print the signal profile, if enabled
+        if profile_signals:
+            signals.disable_profiling()
+            print_signal_profile(signals)
@@ -12,7 +12,12 @@ from .. import settings
 @in_option  # only load the -i flag
 @click.option('--port', '-p', show_default=True, default=settings.default_port,
               help="The port to listen to for the webserver")
+@click.option('--watch/--no-watch', show_default=True, default=True,
+              help="Rebuild documents in the background when source files "
+                   "change")
 @debug_option
-def preview(in_path, out_dir=None, port=settings.default_port, debug=False):
+def preview(in_path, out_dir=None, port=settings.default_port, debug=False,
+            watch=True):
     """Preview documents with a local webserver"""
-    run_server(in_path=in_path, out_dir=out_dir, port=port, debug=debug)
+    run_server(in_path=in_path, out_dir=out_dir, port=port, debug=debug,
+               watch=watch)
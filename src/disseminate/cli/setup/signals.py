@@ -7,6 +7,7 @@ from string import ascii_lowercase
 from click import style
 
 from ..term import term_width
+from ..utils.progressbar import SimpleTable
 from ...utils.string import stub
 
 
@@ -63,3 +64,36 @@ def print_signals(signal_namespace):
             msg += wrap_fields.fill(rec_str) + '\n'
 
         print(msg)
+
+
+def print_signal_profile(signal_namespace, sort='cumulative'):
+    """Print a table of the profiled receivers for all signals.
+
+    Parameters
+    ----------
+    signal_namespace : :obj:`.signals.signals.Namespace`
+        The namespace for all signals.
+    sort : Optional[str]
+        The profile record attribute to sort the rows by.
+        ex: 'cumulative', 'self_time', 'count'
+
+    Returns
+    -------
+    None
+    """
+    hdrs = ('Signal', 'Receiver', 'Order', 'Calls', 'Cumulative (s)',
+            'Self (s)')
+    records = signal_namespace.profile_stats(sort=sort)
+    rows = [(r.signal, r.receiver, str(r.order), str(r.count),
+             "{:.4f}".format(r.cumulative), "{:.4f}".format(r.self_time))
+            for r in records]
+
+    # Get the column widths
+    spacing = 2
+    col_widths = [max([len(hdr)] + [len(row[i]) for row in rows]) + spacing
+                  for i, hdr in enumerate(hdrs)]
+
+    table = SimpleTable(*col_widths)
+    table.print_hdr(*hdrs)
+    for row in rows:
+        table.print_row(*row)
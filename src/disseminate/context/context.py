@@ -8,7 +8,7 @@ from weakref import ref
 
 from .utils import load_from_string
 from ..tags import Tag
-from ..utils.classes import all_attributes_values
+from ..utils.classes import RegisteredClass, all_attributes_values
 from ..utils.string import str_to_dict, str_to_list
 from .. import settings
 
@@ -18,7 +18,7 @@ class ContextException(Exception):
     pass
 
 
-class BaseContext(dict):
+class BaseContext(dict, RegisteredClass):
     """A context dict with entries used for rendering target documents.
 
     Contexts are suppose to be data container dicts--i.e. there are no
@@ -33,10 +33,11 @@ class BaseContext(dict):
               inheritance. The problem with these is that key lookup and
               __contains__ lookup are relatively slow, compared to a standard
               dict. For this reason, I've decided to implement the BaseContext
-              as a simple dict with values copied from a parent_context. The
-              downside of this approach is that it's more memory intensive, but
-              this is mitigated to a great extended from creating shallow
-              copies or weak references of parent_context entries.
+              as a simple dict with values taken from a parent_context.
+              Immutable values from the parent_context are shared, and
+              mutable values are copied when the context is reset. Tags are
+              bound to this context without copying their contents. Reads are
+              plain dict lookups.
 
     Parameters
     ----------
@@ -80,7 +81,7 @@ class BaseContext(dict):
     2
     >>> parent['a']
     1
-    >>> child['b'].append(1)
+    >>> child['b'].append(1)  # copied on reset
     >>> child['b']
     [1]
     >>> parent['b']
@@ -96,8 +97,6 @@ class BaseContext(dict):
     exclude_from_reset = set()
     replace = set()
 
-    _do_not_inherit = None
-
     def __init__(self, *args, **kwargs):
         super().__init__()
 
@@ -150,11 +149,7 @@ class BaseContext(dict):
             A set of all attributes that should not be inherited by child class
             instances.
         """
-        if cls.__dict__.get('_do_not_inherit') is None:
-            do_not_inherit = all_attributes_values(cls=cls,
-                                                   attribute='do_not_inherit')
-            cls._do_not_inherit = set(do_not_inherit)
-        return cls._do_not_inherit
+        return all_attributes_values(cls=cls, attribute='do_not_inherit')
 
     @property
     def parent_context(self):
@@ -226,9 +221,11 @@ class BaseContext(dict):
 
         .. note:: Entries in the parent_context are copied to this context.
                   If the parent_context entry is a mutable, like a list or
-                  dict, then a copy of that mutable is created if a 'copy'
-                  method exists for that mutable. However, mutables within
-                  those mutables will still point to the original.
+                  dict, then a shallow copy of that mutable is created.
+                  However, mutables within those mutables will still point to
+                  the original. Immutable entries are shared, and tags are
+                  copied without their contents so that they refer to this
+                  context.
 
         Examples
         --------
@@ -262,7 +259,25 @@ class BaseContext(dict):
         if parent_context is not None:
             do_not_inherit = self.find_do_not_inherit()
             keys_to_inherit = parent_context.keys() - do_not_inherit
-            self.match_update(parent_context, keys=keys_to_inherit)
+
+            # Entries that are not in this context are copied from the
+            # parent. The copies are made here, rather than when the entries
+            # are retrieved, so that key lookups stay plain dict lookups.
+            keys_to_copy = keys_to_inherit - self.keys()
+            for key in keys_to_copy:
+                value = parent_context[key]
+                if isinstance(value, Tag):
+                    # Tags are rendered with their context, so a copy that
+                    # refers to this context is needed. The contents aren't
+                    # changed once a tag is created, and these are shared.
+                    value = value.copy(new_context=self, shallow=True)
+                elif hasattr(value, 'copy'):
+                    value = value.copy()
+                self[key] = value
+
+            # Existing entries are updated from the parent
+            self.match_update(parent_context,
+                              keys=keys_to_inherit - keys_to_copy)
 
         # Copy in the initial value arguments. The initial values should
         # not be modified, so copies of mutabes are created
@@ -1,13 +1,98 @@
 """Utilities for contexts."""
+from functools import lru_cache
+
 import regex
 
 from ..utils.string import str_to_dict
+from .. import settings
 
 
 re_header_block = regex.compile(r'^[\s\n]*(-{3,})\s*\n'
                                 r'(?P<header>.+?)'
                                 r'(\n\s*\g<1>)\n?', regex.DOTALL)
 
+_re_header_open = regex.compile(r'[\s\n]*(-{3,})\s*\n')
+
+
+@lru_cache(maxsize=None)
+def _re_header_close(dashes):
+    """The regex to find the end of a header block opened with the given
+    dashes string."""
+    return regex.compile(r'\n\s*' + dashes + r'\n?')
+
+
+def split_header(string):
+    """Split the header block from the start of a string.
+
+    Only the header block, delineated by lines with 3 or more '-' characters,
+    at the start of the string is scanned. The rest of the string is not
+    searched.
+
+    Parameters
+    ----------
+    string : str
+        The string to split.
+
+    Returns
+    -------
+    header, rest : Tuple[Optional[str], str]
+        The header string and the rest of the string after the header block.
+        If the string doesn't start with a header block, the header is None
+        and the rest is the string itself.
+
+    Examples
+    --------
+    >>> split_header('---\\ntitle: one\\n---\\nbody')
+    ('title: one', 'body')
+    >>> split_header('body')
+    (None, 'body')
+    """
+    # Find the opening of the header block. The first non-whitespace characters
+    # of the string must be dashes, so most strings are rejected here.
+    m = _re_header_open.match(string)
+    if m is None:
+        return None, string
+
+    # Find the closing of the header block. The header should have at least 1
+    # character.
+    start = m.end()
+    m_close = _re_header_close(m.group(1)).search(string, start + 1)
+    if m_close is None:
+        return None, string
+
+    return string[start:m_close.start()], string[m_close.end():]
+
+
+@lru_cache(maxsize=settings.context_header_cache_size)
+def _parse_header(header):
+    # Parse a header string. The returned dict should not be modified since it
+    # is cached
+    return str_to_dict(header)
+
+
+def parse_header(header):
+    """Parse a header string into a dict.
+
+    Parsed headers are cached by their contents so that headers shared by
+    many documents, like template 'context.txt' files, are only parsed once.
+
+    Parameters
+    ----------
+    header : str
+        The header string with entries to parse.
+
+    Returns
+    -------
+    parsed_dict : dict
+        The parsed dict with keys and values as strings.
+
+    Examples
+    --------
+    >>> parse_header('title: one\\nauthor: two')
+    {'title': 'one', 'author': 'two'}
+    """
+    return dict(_parse_header(header))
+
 
 def find_header_entries(context):
     """Find context entries that contain a header string.
@@ -24,7 +109,7 @@ def find_header_entries(context):
     """
     keys = set()
     for k, v in context.items():
-        if isinstance(v, str) and re_header_block.match(v):
+        if isinstance(v, str) and split_header(v)[0] is not None:
             keys.add(k)
     return keys
 
@@ -44,19 +129,12 @@ def load_from_string(string):
        loaded values from the header.
     """
     # Pull out the header string, if available
-    m = re_header_block.match(string)
-    rest = None
-    if m is not None:
-        # Determine the start and end position of the header
-        start, end = m.span()
-
-        # Collect the rest of the string
-        rest = string[end:]
-
-        # Get the header part of the string
-        string = m.groupdict()['header']
+    header, rest = split_header(string)
+    if header is None:
+        # Parse the whole string, if there isn't a header block
+        header, rest = string, None
 
     # Parse the string
-    d = str_to_dict(string)
+    d = parse_header(header)
 
     return rest, d
@@ -2,11 +2,13 @@
 Classes and functions for rendering documents.
 """
 from shutil import rmtree
-from collections import OrderedDict
+from contextlib import contextmanager
 import logging
 import pathlib
 
 from .document_context import DocumentContext
+from .document_index import (SubdocumentsDict, build_documents_dict,
+                             build_documents_by_id)
 from . import exceptions, signals
 from ..paths import SourcePath
 from .. import settings
@@ -51,6 +53,9 @@ class Document(object):
         documents should be made to these documents. (i.e. when the
         sub-documents dict is cleared, the memory for the document objects
         should be released)
+
+        Changes to the sub-documents invalidate the project's
+        :class:`DocumentIndex <.document_index.DocumentIndex>`.
     """
 
     src_filepath = None
@@ -63,12 +68,17 @@ class Document(object):
     #: A flag to determine whether the document was successfully loaded
     _succesfully_loaded = False
 
+    #: The context entries to restore when the deferred tags of the document
+    #: are created, or None if the tags of the document weren't deferred
+    #: when the document was loaded. (See :meth:`load_deferred`)
+    deferred = None
+
     def __init__(self, src_filepath, environment, parent_context=None,
                  level=1):
         logging.debug("Creating document: {}".format(src_filepath))
 
         # Populate attributes
-        self.subdocuments = OrderedDict()
+        self.subdocuments = SubdocumentsDict(document=self)
         self._templates = dict()  # FIXME: Remove
 
         # Process the paths
@@ -115,11 +125,12 @@ class Document(object):
     @property
     def doc_ids(self):
         """The list of all doc_id for this document and all subdocuments."""
-        return [doc.doc_id for doc in self.documents_list(recursive=True)]
+        return list(self.documents_by_id(recursive=True).keys())
 
     @property
     def title(self):
         """The title for the document."""
+        self.load_deferred()
         if 'title' in self.context:
             # The title entry could be a string or a tag. If it's a tag, just
             # get the text for the tag.
@@ -148,6 +159,21 @@ class Document(object):
     def mtime(self):
         return self.context.get('mtime', None)
 
+    def src_mtime(self):
+        """The modification time of the source file.
+
+        Returns
+        -------
+        src_mtime : Union[float, None]
+            The modification time of the src_filepath, or None if the file
+            doesn't exist.
+        """
+        index = self.document_index
+        if index is not None:
+            return index.src_mtime(self.src_filepath)
+        src_filepath = self.src_filepath
+        return src_filepath.stat().st_mtime if src_filepath.is_file() else None
+
     @property
     def project_root(self):
         return self.context.get('project_root', None)
@@ -193,6 +219,12 @@ class Document(object):
     def label_manager(self):
         return self.context.get('label_manager', None)
 
+    @property
+    def document_index(self):
+        """The :class:`DocumentIndex <.document_index.DocumentIndex>` for
+        the project."""
+        return self.context.get('document_index', None)
+
     # TODO: rename to documents_by_src_filepath
     def documents_dict(self, document=None, only_subdocuments=False,
                        recursive=False):
@@ -212,28 +244,21 @@ class Document(object):
 
         Returns
         -------
-        document_dict : OrderedDict[:obj:`SourcePath <.paths.SourcePath>`, \
+        document_dict : Mapping[:obj:`SourcePath <.paths.SourcePath>`, \
             :obj:`Document <.Document>`]
-            An ordered dict of documents. The keys are src_filepaths and the
-            values are document objects.
+            A read-only, ordered view of documents cached in the document
+            index. The keys are src_filepaths and the values are document
+            objects.
         """
         document = self if document is None else document
-        doc_dict = OrderedDict()
-
-        if not only_subdocuments:
-            doc_dict[document.src_filepath] = document
-
-        for src_filepath, subdoc in document.subdocuments.items():
-
-            if recursive:
-                subdoc_dict = subdoc.documents_dict(only_subdocuments=False,
-                                                    recursive=recursive)
-                for k, v in subdoc_dict.items():
-                    doc_dict[k] = v
-            else:
-                doc_dict[subdoc.src_filepath] = subdoc
-
-        return doc_dict
+        index = document.document_index
+        if index is None:
+            return build_documents_dict(document=document,
+                                        only_subdocuments=only_subdocuments,
+                                        recursive=recursive)
+        return index.documents_dict(document=document,
+                                    only_subdocuments=only_subdocuments,
+                                    recursive=recursive)
 
     def documents_by_id(self, document=None, only_subdocuments=False,
                         recursive=True):
@@ -254,23 +279,20 @@ class Document(object):
 
         Returns
         -------
-        document_dict : OrderedDict[str, :obj:`Document <.Document>`]
-            An ordered dict of documents. The keys are doc_ids
-            and the values are document objects.
+        document_dict : Mapping[str, :obj:`Document <.Document>`]
+            A read-only, ordered view of documents cached in the document
+            index. The keys are doc_ids and the values are document objects.
         """
-        doc_dict = self.documents_dict(document=document,
-                                       only_subdocuments=only_subdocuments,
-                                       recursive=recursive)
-        dict_by_id = OrderedDict([(doc.doc_id, doc)
-                                  for doc in doc_dict.values()])
-
-        if len(dict_by_id) < len(doc_dict):
-            # there are duplicate doc_ids
-            msg = ("The project has multiple documents with the same doc_id. "
-                   "The doc_id should be unique for each document.")
-            raise exceptions.DocumentException(msg)
-
-        return dict_by_id
+        document = self if document is None else document
+        index = document.document_index
+        if index is None:
+            docs = build_documents_dict(document=document,
+                                        only_subdocuments=only_subdocuments,
+                                        recursive=recursive)
+            return build_documents_by_id(docs.values())
+        return index.documents_by_id(document=document,
+                                     only_subdocuments=only_subdocuments,
+                                     recursive=recursive)
 
     def documents_list(self, document=None, only_subdocuments=False,
                        recursive=False):
@@ -289,14 +311,20 @@ class Document(object):
 
         Returns
         -------
-        document_list : List[:obj:`Document <.Document>`]
-            An ordered list of documents.
+        document_list : Sequence[:obj:`Document <.Document>`]
+            A read-only, ordered view of documents cached in the document
+            index.
         """
-        doc_dict = self.documents_dict(document=document,
-                                       only_subdocuments=only_subdocuments,
-                                       recursive=recursive)
-
-        return list(doc_dict.values())
+        document = self if document is None else document
+        index = document.document_index
+        if index is None:
+            docs = build_documents_dict(document=document,
+                                        only_subdocuments=only_subdocuments,
+                                        recursive=recursive)
+            return list(docs.values())
+        return index.documents_list(document=document,
+                                    only_subdocuments=only_subdocuments,
+                                    recursive=recursive)
 
     def load_required(self):
         """Evaluate whether a load is required.
@@ -323,9 +351,9 @@ class Document(object):
 
         # 3. The mtime for the file is now later than the one stored in the
         #    context--i.e. the user saved the file.
-        src_mtime = self.src_filepath.stat().st_mtime
+        src_mtime = self.src_mtime()
         last_mtime = self.mtime
-        if last_mtime is None or src_mtime > last_mtime:
+        if last_mtime is None or src_mtime is None or src_mtime > last_mtime:
             logging.debug("Load required for {}: The '{}' source file is "
                           "newer than the loaded "
                           "document.".format(self, self.src_filepath.subpath))
@@ -343,6 +371,23 @@ class Document(object):
 
         return False
 
+    @contextmanager
+    def scanned_mtimes(self):
+        """A context manager that scans the mtimes of the source files in the
+        document tree once and uses these mtimes for the loads within the
+        'with' block.
+
+        Loads outside of the block scan the source files again so that
+        changes are found.
+        """
+        index = self.document_index
+        if index is None or index.scanning:
+            yield self
+        else:
+            documents = self.documents_list(recursive=True)
+            with index.scanned_mtimes(documents):
+                yield self
+
     def load(self, reload=False, level=1):
         """Load or reload the document into the context.
 
@@ -360,8 +405,16 @@ class Document(object):
             True, if a sub-document was (re)loaded.
         """
         document_loaded = False
+
+        # Scan the mtimes of the source files in the document tree once and
+        # use these for the load of the whole tree
+        index = self.document_index
+        if level == 1 and index is not None and not index.scanning:
+            with self.scanned_mtimes():
+                return self.load(reload=reload, level=level)
+
         # Check to make sure the file exists
-        if not self.src_filepath.is_file():  # file must exist
+        if self.src_mtime() is None:  # file must exist
             msg = "The source document '{}' must exist."
             raise exceptions.DocumentException(msg.format(self.src_filepath))
 
@@ -384,7 +437,8 @@ class Document(object):
                 raise exceptions.DocumentException(msg)
 
             # Emit the load signal
-            signals.document_onload.emit(document=self, context=self.context)
+            signals.document_onload.emit(document=self, context=self.context,
+                                         reload=reload)
 
             # The document has been loaded
             self._succesfully_loaded = True
@@ -403,6 +457,35 @@ class Document(object):
 
         return document_loaded
 
+    def load_deferred(self):
+        """Create the tags of the document, if these were deferred when the
+        document was loaded.
+
+        The tags of a document are deferred when its labels are restored
+        from the label cache. (See :class:`LabelCache
+        <.label_manager.label_cache.LabelCache>`)
+
+        Returns
+        -------
+        tags_loaded : bool
+            True, if the deferred tags were created.
+        """
+        deferred = self.deferred
+        if deferred is None:
+            return False
+        self.deferred = None
+
+        # Restore the context entries from before the labels were restored
+        context = self.context
+        for key, value in deferred.items():
+            if value is None:
+                context.pop(key, None)
+            else:
+                context[key] = value
+
+        signals.document_load_deferred.emit(document=self, context=context)
+        return True
+
     @staticmethod
     def _update_mtime(document, mtime=None):
         """Update the mtime of all subdocuments for a given document if the
@@ -464,9 +547,10 @@ class Document(object):
 
         # Get a dict with all documents owned by this document. This document
         # can control those documents, but it cannot control other documents in
-        # the root_dict. This avoids recursion.
-        subs_dict = self.documents_dict(only_subdocuments=False,
-                                        recursive=True)
+        # the root_dict. This avoids recursion. A copy of the view is needed to
+        # hold references to the documents while the subdocuments are cleared.
+        subs_dict = dict(self.documents_dict(only_subdocuments=False,
+                                             recursive=True))
 
         # Clear the subdocuments ordered dict and add new entries. Old entries
         # will automatically be deleted if the subdocument no longer holds a
@@ -517,16 +601,21 @@ class Document(object):
 
     def build_needed(self):
         """Evaluate whether a build is required"""
-        # Reload document
-        self.load()
-        return any(signals.document_build_needed.emit(document=self))
+        # Reload document. The target builders reload the document as well,
+        # and these loads reuse the same scan of the source files.
+        with self.scanned_mtimes():
+            self.load()
+            return any(signals.document_build_needed.emit(document=self))
 
     def build(self, complete=True):
         """Run a build of the document and all subdocuments."""
-        # Make sure the document (and subdocuments) are loaded
-        self.load()
-
-        # Send the 'document_build' signal
-        statuses = signals.document_build.emit(document=self,
-                                               complete=complete)
+        # Make sure the document (and subdocuments) are loaded. The target
+        # builders reload the document for each build step, and these loads
+        # reuse the same scan of the source files.
+        with self.scanned_mtimes():
+            self.load()
+
+            # Send the 'document_build' signal
+            statuses = signals.document_build.emit(document=self,
+                                                   complete=complete)
         return statuses[0] if len(statuses) == 1 else statuses
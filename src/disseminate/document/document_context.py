@@ -5,6 +5,7 @@ import weakref
 from copy import deepcopy
 
 from .exceptions import TargetNotFound
+from .document_index import DocumentIndex
 from ..context import BaseContext
 from ..label_manager import LabelManager
 from ..signals.signals import signal
@@ -34,6 +35,7 @@ class DocumentContext(BaseContext):
         'targets': set,
         'paths': list,
         'label_manager': LabelManager,
+        'document_index': DocumentIndex,
         'mtime': float,
         'doc_id': str,
         'process_context_tags': set,
@@ -80,6 +82,10 @@ class DocumentContext(BaseContext):
         #: The contents of the body (specified by body_attr) doesn't carry over
         #: because each body has its own body.
         settings.body_attr,
+
+        # The label ids of Ref tags, and their labels, are for the tags
+        # created in each document.
+        'ref_label_ids', 'ref_labels',
     }
 
     #: The keys for context entries that should not be removed when the
@@ -95,6 +101,7 @@ class DocumentContext(BaseContext):
         # context is reset. They should persist for a project, and they are
         # defined by the root document and build environment.
         'label_manager',
+        'document_index',
         'environment',
 
         # Keep the same list for paths when resetting. Note that will place
@@ -152,6 +159,8 @@ class DocumentContext(BaseContext):
         # Initialize the managers, if this is the root (document) context
         if self.get('label_manager', None) is None:
             self['label_manager'] = LabelManager(root_context=self)
+        if self.get('document_index', None) is None:
+            self['document_index'] = DocumentIndex()
 
         # Set the document's level. This is based off of the parent context's
         # level
@@ -0,0 +1,434 @@
+"""
+An index of the documents in a project's document tree.
+"""
+import os
+import stat
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from collections.abc import Mapping, Sequence
+
+from . import exceptions
+from .. import settings
+
+
+class DocumentsView(Mapping):
+    """A read-only, ordered mapping of documents.
+
+    The view only holds weak references to the documents, since the documents
+    are owned by their parent documents.
+
+    Parameters
+    ----------
+    refs : OrderedDict[Any, :obj:`weakref.ref`]
+        An ordered dict with weak references to documents as values.
+    """
+
+    __slots__ = ('_refs',)
+
+    def __init__(self, refs):
+        self._refs = refs
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, list(self.values()))
+
+    def __getitem__(self, key):
+        document = self._refs[key]()
+        if document is None:
+            raise KeyError(key)
+        return document
+
+    def __contains__(self, key):
+        return key in self._refs
+
+    def __iter__(self):
+        return iter(self._refs)
+
+    def __len__(self):
+        return len(self._refs)
+
+
+class DocumentsListView(Sequence):
+    """A read-only, ordered sequence of documents.
+
+    The view only holds weak references to the documents, since the documents
+    are owned by their parent documents.
+
+    Parameters
+    ----------
+    refs : Tuple[:obj:`weakref.ref`]
+        A tuple of weak references to documents.
+    """
+
+    __slots__ = ('_refs',)
+
+    def __init__(self, refs):
+        self._refs = refs
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, list(self))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [ref() for ref in self._refs[i]]
+        return self._refs[i]()
+
+    def __len__(self):
+        return len(self._refs)
+
+
+class SubdocumentsDict(OrderedDict):
+    """An ordered dict of the sub-documents of a document.
+
+    Changes to the dict invalidate the document index of the document tree.
+
+    Parameters
+    ----------
+    document : :obj:`Document <.Document>`
+        The document that owns the sub-documents.
+    """
+
+    def __init__(self, document):
+        super().__init__()
+        self._document = weakref.ref(document)
+
+    def changed(self):
+        """Invalidate the document index for the document tree."""
+        document = self._document()
+        context = getattr(document, 'context', None)
+        index = context.get('document_index') if context is not None else None
+        if index is not None:
+            index.invalidate()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.changed()
+
+    def clear(self):
+        super().clear()
+        self.changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.changed()
+        return value
+
+    def popitem(self, last=True):
+        item = super().popitem(last=last)
+        self.changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.changed()
+        return value
+
+    def move_to_end(self, key, last=True):
+        super().move_to_end(key, last=last)
+        self.changed()
+
+
+class DocumentIndex(object):
+    """An index of the documents in a project's document tree.
+
+    The index is created by the root document's context and shared with the
+    contexts of its sub-documents. It caches the ordered documents of each
+    document (and its sub-documents) by src_filepath and by doc_id, and these
+    are returned as read-only views. The index is invalidated when the
+    sub-documents of a document in the tree change.
+
+    The index also holds the modification times (mtimes) of the documents'
+    source files from a batched scan of their directories. The scanned mtimes
+    are used for the duration of a document tree load (see
+    :meth:`scanned_mtimes`), for the 'document_mtime_ttl' setting, or until
+    :meth:`clear_mtimes` is called if the index is watched by a filesystem
+    watcher.
+
+    Attributes
+    ----------
+    watched : bool
+        If True, the source files are watched by a filesystem watcher that
+        calls :meth:`clear_mtimes` when a file changes. The scanned mtimes
+        are then reused until they're cleared.
+    """
+
+    watched = False
+
+    def __init__(self):
+        self._views = dict()
+        self._mtimes = None
+        self._mtimes_time = None
+        self._scan_depth = 0
+
+    def invalidate(self):
+        """Clear the cached views of documents."""
+        self._views.clear()
+
+    def mtimes_current(self):
+        """Return True if the scanned mtimes can be reused."""
+        if self._mtimes is None:
+            return False
+        if self.watched:
+            return True
+        age = time.monotonic() - self._mtimes_time
+        return age < settings.document_mtime_ttl
+
+    def scan_mtimes(self, documents):
+        """Scan the mtimes for the source files of the given documents.
+
+        The directories of the source files are each scanned once with
+        :func:`os.scandir`. A scan is skipped if the previous one is still
+        current.
+
+        Parameters
+        ----------
+        documents : Iterable[:obj:`Document <.Document>`]
+            The documents whose source files should be scanned.
+        """
+        if self.mtimes_current():
+            return
+
+        # Group the filenames by directory
+        filenames_by_dir = dict()
+        for document in documents:
+            dirname, filename = os.path.split(str(document.src_filepath))
+            filenames_by_dir.setdefault(dirname, set()).add(filename)
+
+        # Scan the directories
+        mtimes = dict()
+        for dirname, filenames in filenames_by_dir.items():
+            try:
+                with os.scandir(dirname or '.') as entries:
+                    for entry in entries:
+                        if entry.name in filenames and entry.is_file():
+                            path = os.path.join(dirname, entry.name)
+                            mtimes[path] = entry.stat().st_mtime
+            except OSError:
+                continue
+
+        self._mtimes = mtimes
+        self._mtimes_time = time.monotonic()
+
+    @property
+    def scanning(self):
+        """True if the scanned mtimes are in use by :meth:`scanned_mtimes`."""
+        return self._scan_depth > 0
+
+    @contextmanager
+    def scanned_mtimes(self, documents):
+        """A context manager that scans the mtimes for the source files of
+        the given documents and uses these mtimes within the 'with' block.
+
+        Parameters
+        ----------
+        documents : Iterable[:obj:`Document <.Document>`]
+            The documents whose source files should be scanned.
+        """
+        self.scan_mtimes(documents)
+        self._scan_depth += 1
+        try:
+            yield self
+        finally:
+            self._scan_depth -= 1
+
+    def clear_mtimes(self):
+        """Clear the scanned mtimes so that source files are scanned again."""
+        self._mtimes = None
+
+    def src_mtime(self, src_filepath):
+        """The mtime for a source file.
+
+        Parameters
+        ----------
+        src_filepath : :obj:`SourcePath <.paths.SourcePath>`
+            The path of the source file.
+
+        Returns
+        -------
+        mtime : Union[float, None]
+            The mtime of the source file, or None if the file doesn't exist.
+        """
+        mtimes = self._mtimes
+        if mtimes is not None and (self._scan_depth or self.mtimes_current()):
+            mtime = mtimes.get(str(src_filepath))
+            if mtime is not None:
+                return mtime
+
+        # The file wasn't scanned. Stat it directly
+        try:
+            st = os.stat(src_filepath)
+        except OSError:
+            return None
+        return st.st_mtime if stat.S_ISREG(st.st_mode) else None
+
+    def documents_dict(self, document, only_subdocuments=False,
+                       recursive=False):
+        """The ordered documents of a document keyed by src_filepath.
+
+        Parameters
+        ----------
+        document : :obj:`Document <.Document>`
+            The document for which to retrieve the documents.
+        only_subdocuments : Optional[bool]
+            If True, only the sub-documents will be returned (not the document
+            itself.)
+        recursive : Optional[bool]
+            If True, the sub-documents of sub-documents are returned as well.
+
+        Returns
+        -------
+        documents : :obj:`DocumentsView`
+            A view of the documents keyed by src_filepath.
+        """
+        key = ('src_filepath', weakref.ref(document), only_subdocuments,
+               recursive)
+        view = self._views.get(key)
+        if view is None:
+            docs = build_documents_dict(document=document,
+                                        only_subdocuments=only_subdocuments,
+                                        recursive=recursive)
+            refs = OrderedDict((k, weakref.ref(v)) for k, v in docs.items())
+            view = DocumentsView(refs)
+            self._views[key] = view
+        return view
+
+    def documents_by_id(self, document, only_subdocuments=False,
+                        recursive=True):
+        """The ordered documents of a document keyed by doc_id.
+
+        Parameters
+        ----------
+        document : :obj:`Document <.Document>`
+            The document for which to retrieve the documents.
+        only_subdocuments : Optional[bool]
+            If True, only the sub-documents will be returned (not the document
+            itself.)
+        recursive : Optional[bool]
+            If True, the sub-documents of sub-documents are returned as well.
+
+        Returns
+        -------
+        documents : :obj:`DocumentsView`
+            A view of the documents keyed by doc_id.
+
+        Raises
+        ------
+        DocumentException
+            Raised if documents have the same doc_id.
+        """
+        key = ('doc_id', weakref.ref(document), only_subdocuments, recursive)
+        view = self._views.get(key)
+        if view is None:
+            docs = self.documents_dict(document=document,
+                                       only_subdocuments=only_subdocuments,
+                                       recursive=recursive)
+            docs = build_documents_by_id(docs.values())
+            refs = OrderedDict((k, weakref.ref(v)) for k, v in docs.items())
+            view = DocumentsView(refs)
+            self._views[key] = view
+        return view
+
+    def documents_list(self, document, only_subdocuments=False,
+                       recursive=False):
+        """The ordered list of documents of a document.
+
+        Parameters
+        ----------
+        document : :obj:`Document <.Document>`
+            The document for which to retrieve the documents.
+        only_subdocuments : Optional[bool]
+            If True, only the sub-documents will be returned (not the document
+            itself.)
+        recursive : Optional[bool]
+            If True, the sub-documents of sub-documents are returned as well.
+
+        Returns
+        -------
+        documents : :obj:`DocumentsListView`
+            A view of the ordered documents.
+        """
+        key = ('list', weakref.ref(document), only_subdocuments, recursive)
+        view = self._views.get(key)
+        if view is None:
+            docs = self.documents_dict(document=document,
+                                       only_subdocuments=only_subdocuments,
+                                       recursive=recursive)
+            view = DocumentsListView(tuple(docs._refs.values()))
+            self._views[key] = view
+        return view
+
+
+def build_documents_dict(document, only_subdocuments=False, recursive=False):
+    """Produce an ordered dict of a document and all its sub-documents.
+
+    Parameters
+    ----------
+    document : :obj:`Document <.Document>`
+        The document for which to create the document dict.
+    only_subdocuments : Optional[bool]
+        If True, only the sub-documents will be returned (not the document
+        itself.)
+    recursive : Optional[bool]
+        If True, the sub-documents of sub-documents are returned (in order)
+        in the ordered dict as well
+
+    Returns
+    -------
+    document_dict : OrderedDict[:obj:`SourcePath <.paths.SourcePath>`, \
+        :obj:`Document <.Document>`]
+        An ordered dict of documents. The keys are src_filepaths and the
+        values are document objects.
+    """
+    doc_dict = OrderedDict()
+
+    if not only_subdocuments:
+        doc_dict[document.src_filepath] = document
+
+    for src_filepath, subdoc in document.subdocuments.items():
+
+        if recursive:
+            subdoc_dict = subdoc.documents_dict(only_subdocuments=False,
+                                                recursive=recursive)
+            for k, v in subdoc_dict.items():
+                doc_dict[k] = v
+        else:
+            doc_dict[subdoc.src_filepath] = subdoc
+
+    return doc_dict
+
+
+def build_documents_by_id(documents):
+    """Produce an ordered dict of documents keyed by doc_id.
+
+    Parameters
+    ----------
+    documents : Iterable[:obj:`Document <.Document>`]
+        The ordered documents.
+
+    Returns
+    -------
+    document_dict : OrderedDict[str, :obj:`Document <.Document>`]
+        An ordered dict of documents. The keys are doc_ids and the values are
+        document objects.
+
+    Raises
+    ------
+    DocumentException
+        Raised if documents have the same doc_id.
+    """
+    documents = list(documents)
+    doc_dict = OrderedDict((doc.doc_id, doc) for doc in documents)
+
+    if len(doc_dict) < len(documents):
+        # there are duplicate doc_ids
+        msg = ("The project has multiple documents with the same "
+               "doc_id. The doc_id should be unique for each "
+               "document.")
+        raise exceptions.DocumentException(msg)
+
+    return doc_dict
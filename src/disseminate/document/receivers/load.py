@@ -2,14 +2,16 @@
 A receiver to load the document's string in the document context
 """
 from ..signals import document_onload
+from ...utils.file import read_text
 from ... import settings
 
 
 @document_onload.connect_via(order=200)
 def load_document(document, **kwargs):
     """Load the document text file into the document context."""
-    # Load the string from the src_filepath,
-    string = document.src_filepath.read_text()
+    # Load the string from the src_filepath. Large files are memory-mapped.
+    string = read_text(document.src_filepath,
+                       mmap_size=settings.document_mmap_size)
 
     # Place the text of the string in the 'body' attribute of the
     # context (see settings.body_attr)
@@ -1,6 +1,8 @@
 """
 A receiver to process headers in a context
 """
+import os
+import threading
 import regex
 import pathlib
 
@@ -42,27 +44,13 @@ def process_headers(context, **kwargs):
         # Update the context
         header_context.match_update(d)
 
-    # 2. Load the template paths and the 'context.txt' files
-    #    First load the template paths for the template and any parent
-    #    templates. The template_name may be different from the header_context
-    #    than the one specified in this context.
+    # 2. Load the template paths and the 'context.txt' files from the
+    #    template index. The template_name may be different from the
+    #    header_context than the one specified in this context.
     template_name = header_context.get('template') or context.get('template')
-    template_paths = find_template_paths(template_name=template_name)
-
-    for template_path in list(template_paths):
-        template_paths += find_jinja2_parent_templates(template_path)
-    template_paths = uniq(template_paths)
-
-    # Next, find the additional context files and load their context values.
-    # These are done in *reverse* order because the parent templates are
-    # listed last and the child templates listed first. The child template
-    # values take precedence.
-    template_context = BaseContext()
-
-    # Get the additional context filepaths in reverse order
-    fps = find_additional_context_filepaths(template_paths[::-1])
-    for context_filepath in fps:
-        template_context.load(context_filepath.read_text())
+    template = template_index.get(template_name)
+    template_paths = list(template.template_paths)
+    template_context = template.context
 
     # Now load the template paths and context values
     paths = context['paths']
@@ -75,6 +63,122 @@ def process_headers(context, **kwargs):
     context.match_update(header_context, overwrite=True)
 
 
+class TemplateEntry(object):
+    """The resolved paths and context values for a template.
+
+    Attributes
+    ----------
+    template_name : str
+        The name of the template. ex: books/tufte
+    template_paths : Tuple[:obj:`pathlib.Path`]
+        The template path directories for the template and its parent
+        templates.
+    context_filepaths : Tuple[:obj:`pathlib.Path`]
+        The additional context files (context.txt) for the template and its
+        parent templates, with the parent templates listed first.
+    context : :obj:`BaseContext <disseminate.context.BaseContext>`
+        The context values loaded from the context_filepaths. This context
+        should not be modified.
+    mtimes : Dict[:obj:`pathlib.Path`, float]
+        The modification times of the template directories, the template
+        files and their directories, and the context files used to resolve
+        the template.
+    """
+
+    __slots__ = ('template_name', 'template_paths', 'context_filepaths',
+                 'context', 'mtimes')
+
+    def __init__(self, template_name):
+        self.template_name = template_name
+
+        # Find the template paths for the template and its parent templates
+        template_paths = find_template_paths(template_name=template_name)
+        for template_path in list(template_paths):
+            template_paths += find_jinja2_parent_templates(template_path)
+        self.template_paths = tuple(uniq(template_paths))
+
+        # Next, find the additional context files and load their context
+        # values. These are done in *reverse* order because the parent
+        # templates are listed last and the child templates listed first. The
+        # child template values take precedence.
+        fps = find_additional_context_filepaths(self.template_paths[::-1])
+        self.context_filepaths = tuple(fps)
+
+        context = BaseContext()
+        for context_filepath in fps:
+            context.load(context_filepath.read_text())
+        self.context = context
+
+        # Record the modification times for the template directories, the
+        # template files and their directories, and the context files that
+        # were read. The other files and directories of the templates, like
+        # media files, aren't used to resolve the template.
+        paths = list(settings.module_template_paths)
+        for template_path in self.template_paths:
+            paths += [template_path, template_path.parent]
+            for template_file in template_path.glob('**/template*'):
+                paths += [template_file.parent, template_file]
+        paths += fps
+        self.mtimes = {p: _mtime(p) for p in uniq(paths)}
+
+    def is_current(self):
+        """Return True if the directories and files for the template haven't
+        changed."""
+        return all(_mtime(p) == mtime for p, mtime in self.mtimes.items())
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class TemplateIndex(object):
+    """A process-wide index of resolved templates.
+
+    Resolving a template requires searching the template directories, reading
+    the template files for parent templates and loading the 'context.txt'
+    files. The index stores the resolved :class:`TemplateEntry` for each
+    template name, and an entry is resolved again when the modification time
+    of one of its directories or files changes.
+    """
+
+    def __init__(self):
+        self._entries = dict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Clear the index."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, template_name):
+        """Return the resolved template entry for a template name.
+
+        Parameters
+        ----------
+        template_name : str
+            The name of the template. ex: books/tufte
+
+        Returns
+        -------
+        template_entry : :obj:`TemplateEntry`
+            The resolved template entry.
+        """
+        key = (template_name, tuple(settings.module_template_paths))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_current():
+                entry = TemplateEntry(template_name)
+                self._entries[key] = entry
+            return entry
+
+
+#: The template index for the process
+template_index = TemplateIndex()
+
+
 def find_template_paths(template_name):
     """Find template paths from a template name.
 
@@ -1,12 +1,16 @@
 """
 A receiver to process tag entries in a context
 """
-from ..signals import document_onload
+from contextlib import nullcontext
+
+from ..signals import document_onload, document_load_deferred
 from ...tags import TagFactory
+from ... import settings
 
 
 @document_onload.connect_via(order=10000)
-def process_tags(context, **kwargs):
+@document_load_deferred.connect_via(order=1000)
+def process_tags(context, document=None, **kwargs):
     """Convert context entries into tags for entries listed the
     process_context_tags' context entry.
 
@@ -18,7 +22,14 @@ def process_tags(context, **kwargs):
               with the settings.tag_prefix (e.g. '@test'). These *should not*
               be converted into asts, as they are required for simple string
               replacement.
+
+    .. note:: The tags are not created if they're deferred for the document.
+              (See :meth:`Document.load_deferred
+              <disseminate.document.Document.load_deferred>`)
     """
+    if document is not None and document.deferred is not None:
+        return context
+
     assert context.is_valid('process_context_tags')
 
     # Find the tags to process, based on the context entries in the
@@ -28,14 +39,18 @@ def process_tags(context, **kwargs):
     keys = set(context.keys())
     keys = keys.intersection(process_tags)
 
-    for k in keys:
-        value = context[k]
+    # Create the tags in batch mode, if enabled
+    batch = TagFactory.batch() if settings.tag_batch_mode else nullcontext()
+
+    with batch:
+        for k in keys:
+            value = context[k]
 
-        # Only process strings
-        if not isinstance(value, str):
-            continue
+            # Only process strings
+            if not isinstance(value, str):
+                continue
 
-        context[k] = TagFactory.tag(tag_name=k, tag_content=value,
-                                    tag_attributes='', context=context)
+            context[k] = TagFactory.tag(tag_name=k, tag_content=value,
+                                        tag_attributes='', context=context)
 
     return context
@@ -14,6 +14,12 @@ document_onload = signal('document_onload',
                          doc="Signal sent when a document is loaded. "
                          "Receivers take a document or document context "
                          "parameter.")
+document_load_deferred = signal('document_load_deferred',
+                                doc="Signal sent when the tags of a "
+                                "document, which were deferred when the "
+                                "document was loaded, are needed. Receivers "
+                                "take a document or document context "
+                                "parameter.")
 
 document_build = signal('document_build',
                         doc="Signal sent when a document's targets are "
@@ -0,0 +1,254 @@
+"""
+A persistent cache for the labels of a project's documents.
+"""
+import os
+import json
+import pathlib
+import hashlib
+import logging
+
+from .types import ContentLabel
+from ..utils.string import hashtxt
+
+
+def plain_value(value):
+    """Convert a context value into a value that can be serialized with json.
+
+    Parameters
+    ----------
+    value : Any
+        The context value to convert.
+
+    Returns
+    -------
+    plain_value : Union[str, int, float, bool, list, None]
+        The converted value. Tags are converted to the hash of their
+        contents, and other objects, like weakrefs and managers, are
+        converted to None.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    elif isinstance(value, pathlib.PurePath):
+        return str(value)
+    elif isinstance(value, dict):
+        items = [[str(k), plain_value(v)] for k, v in value.items()]
+        return sorted(items, key=lambda i: i[0])
+    elif isinstance(value, (list, tuple)):
+        return [plain_value(v) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return sorted(json.dumps(plain_value(v)) for v in value)
+    elif getattr(value, 'hash', None) is not None:
+        # Tags
+        return ['hash', value.hash]
+    return None
+
+
+def context_key(context):
+    """The key for the entries of a context that are used in creating the
+    tags of a document.
+
+    Parameters
+    ----------
+    context : :obj:`DocumentContext <.DocumentContext>`
+        The document context, before the tags are created.
+
+    Returns
+    -------
+    key : str
+        The md5 hex digest of the context entries. The strings for entries
+        that are converted to tags (See the 'process_context_tags' context
+        entry) are hashed like the contents of tags, so that the key is the
+        same whether an inherited entry was converted to a tag or not.
+    """
+    tag_keys = context.get('process_context_tags', ())
+
+    items = []
+    for key in sorted(context.keys()):
+        if key == 'mtime':
+            continue
+        value = context[key]
+        if key in tag_keys and isinstance(value, str):
+            value = ['hash', hashtxt(value)]
+        else:
+            value = plain_value(value)
+        items.append([key, value])
+
+    return hashlib.md5(json.dumps(items).encode()).hexdigest()
+
+
+class LabelCache(object):
+    """A cache of the labels for the documents of a project that is persisted
+    between runs.
+
+    The content labels created by the tags of each document are stored with
+    a key for the document's context entries before its tags are created
+    (See :func:`context_key`). The key includes the text of the document
+    and the entries inherited from its parent, like macros and the
+    'label_count'. When the project is loaded again, the labels of documents
+    with matching keys are restored in the label manager, and the creation
+    of their tags is deferred until the documents are rendered.
+
+    Parameters
+    ----------
+    filepath : :obj:`pathlib.Path`
+        The path of the cache file.
+
+    Attributes
+    ----------
+    entries : Dict[str, dict]
+        The cached entries keyed by doc_id. Each entry is a dict with the
+        context 'key', the 'labels', the 'ref_label_ids' and the
+        'label_count' of the document after its tags were created.
+    changed : bool
+        True, if the entries were changed since they were loaded or saved.
+    pending : Dict[str, Tuple[str, int]]
+        The context key and the number of labels in the label manager before
+        the tags are created, for documents that are being loaded without a
+        matching entry. These entries are updated once the tags of the
+        documents are created.
+    """
+
+    #: The version of the cache file format. Cache files with a different
+    #: version are ignored.
+    format_version = 2
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.entries = dict()
+        self.changed = False
+        self.pending = dict()
+        self.load()
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, self.filepath)
+
+    def load(self):
+        """Load the entries from the cache file.
+
+        Missing, unreadable and outdated cache files are ignored.
+        """
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        if (isinstance(data, dict) and
+           data.get('version') == self.format_version):
+            self.entries = data.get('documents', dict())
+        else:
+            self.entries = dict()
+        self.changed = False
+
+    def save(self):
+        """Save the entries to the cache file, if they've changed."""
+        if not self.changed:
+            return
+
+        data = {'version': self.format_version, 'documents': self.entries}
+
+        # Write to a temporary file first so that an interrupted write doesn't
+        # leave a partial cache file
+        tmp_filepath = str(self.filepath) + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(tmp_filepath), exist_ok=True)
+            with open(tmp_filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_filepath, self.filepath)
+        except OSError:
+            logging.warning("The label cache '{}' could not be "
+                            "saved.".format(self.filepath))
+            return
+        self.changed = False
+
+    def entry(self, doc_id, key):
+        """The cached entry for a document.
+
+        Parameters
+        ----------
+        doc_id : str
+            The doc_id of the document.
+        key : str
+            The key for the document's context. (See :func:`context_key`)
+
+        Returns
+        -------
+        entry : Union[dict, None]
+            The entry for the document, or None if the document doesn't have
+            an entry or the entry has a different key.
+        """
+        entry = self.entries.get(doc_id)
+        return entry if entry is not None and entry['key'] == key else None
+
+    def update(self, doc_id, key, labels, ref_label_ids, label_count):
+        """Update the cached entry of a document.
+
+        Parameters
+        ----------
+        doc_id : str
+            The doc_id of the document.
+        key : str
+            The key for the document's context. (See :func:`context_key`)
+        labels : Iterable[:obj:`ContentLabel \
+            <.label_manager.types.ContentLabel>`]
+            The content labels created by the document's tags.
+        ref_label_ids : Iterable[str]
+            The label ids referenced by the document's tags.
+        label_count : Union[int, None]
+            The 'label_count' context entry after the tags were created.
+        """
+        self.entries[doc_id] = {'key': key,
+                                'labels': self.dump_labels(labels),
+                                'ref_label_ids': sorted(ref_label_ids),
+                                'label_count': label_count}
+        self.changed = True
+
+    def purge(self, doc_ids):
+        """Remove the entries for documents that aren't in the given doc_ids.
+
+        Parameters
+        ----------
+        doc_ids : Iterable[str]
+            The doc_ids of the documents in the project.
+        """
+        for doc_id in self.entries.keys() - set(doc_ids):
+            del self.entries[doc_id]
+            self.changed = True
+
+    @staticmethod
+    def dump_labels(labels):
+        """Convert content labels into a list that can be stored in the cache
+        file.
+
+        Parameters
+        ----------
+        labels : Iterable[:obj:`ContentLabel \
+            <.label_manager.types.ContentLabel>`]
+            The labels to convert.
+
+        Returns
+        -------
+        dumped_labels : List[list]
+            The doc_id, label_id, kind and title of each label. The titles are
+            stored as text.
+        """
+        return [[label.doc_id, label.id, list(label.kind), label.title]
+                for label in labels]
+
+    @staticmethod
+    def load_labels(entry):
+        """Create the content labels for a cached entry.
+
+        Parameters
+        ----------
+        entry : dict
+            The cached entry for a document.
+
+        Returns
+        -------
+        labels : List[:obj:`ContentLabel <.label_manager.types.ContentLabel>`]
+            The labels of the entry.
+        """
+        return [ContentLabel(doc_id=doc_id, id=label_id, kind=tuple(kind),
+                             title=title)
+                for doc_id, label_id, kind, title in entry['labels']]
@@ -0,0 +1,73 @@
+"""
+Compiled label format strings.
+"""
+from ..utils.string import split_macros, resolve_macro, replace_macros
+
+#: The name of the macro for the label in label format strings
+label_macro = '@label'
+
+
+class LabelFormat(object):
+    """A label format string compiled into literal strings and macros.
+
+    The format string is split once, and labels are formatted by resolving
+    the macros for the label without searching the format string again.
+
+    Parameters
+    ----------
+    format_str : str
+        The label format string. ex: '@b{Fig. @label.number}'
+
+    Attributes
+    ----------
+    format_str : str
+        The label format string.
+    segments : List[Union[str, Tuple[str, str]]]
+        The literal strings and (macro, text) tuples for the macros of the
+        format string.
+
+    Examples
+    --------
+    >>> from disseminate.label_manager.types import ContentLabel
+    >>> label = ContentLabel('test.dm', 'fig:one', 'figure', title='One')
+    >>> label_format = LabelFormat('@b{Fig. @label.title}. ')
+    >>> label_format.format(label)
+    '@b{Fig. One}. '
+    """
+
+    __slots__ = ('format_str', 'segments')
+
+    def __init__(self, format_str):
+        self.format_str = format_str
+        self.segments = split_macros(format_str)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.format_str)
+
+    def format(self, label):
+        """Format the label string for a label.
+
+        This is equivalent to :func:`replace_macros
+        <disseminate.utils.string.replace_macros>` with the label for the
+        '@label' macro.
+
+        Parameters
+        ----------
+        label : :obj:`Label <.label_manager.types.Label>`
+            The label to format.
+
+        Returns
+        -------
+        label_string : str
+            The formatted label string.
+        """
+        macros = {label_macro: label}
+        string = ''.join(segment if isinstance(segment, str) else
+                         resolve_macro(segment[0], segment[1], macros)
+                         for segment in self.segments)
+
+        # The values of the label may include label macros, which are replaced
+        # recursively
+        if label_macro in string:
+            return replace_macros(self.format_str, macros)
+        return string
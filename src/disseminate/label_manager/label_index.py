@@ -0,0 +1,170 @@
+"""
+Secondary indexes and snapshots for the labels of a label manager.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+#: A resolved reference to a label.
+#: The url is the url path to the document owning the label, without the
+#: label's anchor, and the format_str is the label format string with the
+#: label's macros replaced.
+RefResolution = namedtuple('RefResolution', 'label document url format_str')
+
+
+class LabelIndex(object):
+    """Indexes of labels by label_id, kind and doc_id.
+
+    The index is built in a single pass over the labels, and it preserves the
+    order of the labels.
+
+    Parameters
+    ----------
+    labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
+        A dict of labels where the key is the (doc_id, label_id) and the
+        values are the label objects.
+
+    Attributes
+    ----------
+    by_label_id : Dict[str, :obj:`Label <.label_manager.types.Label>`]
+        The first label for each label_id.
+    by_kind : Dict[str, List[:obj:`Label <.label_manager.types.Label>`]]
+        The ordered labels for each kind.
+    by_doc_id : Dict[str, List[:obj:`Label <.label_manager.types.Label>`]]
+        The ordered labels for each doc_id.
+    by_doc_id_kind : Dict[Tuple[str, str], \
+        List[:obj:`Label <.label_manager.types.Label>`]]
+        The ordered labels for each (doc_id, kind).
+
+    Examples
+    --------
+    >>> from disseminate.label_manager.types import Label
+    >>> labels = {('a.dm', 'fig:1'): Label('a.dm', 'fig:1', 'figure'),
+    ...           ('b.dm', 'fig:1'): Label('b.dm', 'fig:1', 'figure'),
+    ...           ('b.dm', 'eq:1'): Label('b.dm', 'eq:1', 'equation')}
+    >>> index = LabelIndex(labels)
+    >>> index.by_label_id['fig:1']
+    Label(doc_id: 'a.dm', id: 'fig:1')
+    >>> index.labels_by_kind('figure', doc_id='b.dm')
+    [Label(doc_id: 'b.dm', id: 'fig:1')]
+    """
+
+    __slots__ = ('by_label_id', 'by_kind', 'by_doc_id', 'by_doc_id_kind')
+
+    def __init__(self, labels):
+        self.by_label_id = dict()
+        self.by_kind = dict()
+        self.by_doc_id = dict()
+        self.by_doc_id_kind = dict()
+
+        for (doc_id, label_id), label in labels.items():
+            self.by_label_id.setdefault(label_id, label)
+            self.by_doc_id.setdefault(label.doc_id, []).append(label)
+
+            for kind in dict.fromkeys(label.kind or ()):  # unique kinds
+                self.by_kind.setdefault(kind, []).append(label)
+                key = (label.doc_id, kind)
+                self.by_doc_id_kind.setdefault(key, []).append(label)
+
+    def labels_by_kind(self, kind, doc_id=None):
+        """The ordered labels of a kind.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the labels. ex: 'figure'
+        doc_id : Optional[str]
+            If specified, only labels for the given document id are returned.
+
+        Returns
+        -------
+        labels : List[:obj:`Label <.label_manager.types.Label>`]
+            The list of labels.
+        """
+        if doc_id is None:
+            return list(self.by_kind.get(kind, ()))
+        return list(self.by_doc_id_kind.get((doc_id, kind), ()))
+
+    def labels_by_doc_id(self, doc_id):
+        """The ordered labels for a document.
+
+        Parameters
+        ----------
+        doc_id : str
+            The document id of the labels.
+
+        Returns
+        -------
+        labels : List[:obj:`Label <.label_manager.types.Label>`]
+            The list of labels.
+        """
+        return list(self.by_doc_id.get(doc_id, ()))
+
+
+class LabelSnapshot(object):
+    """A read-only, versioned view of registered labels.
+
+    Snapshots are created by the label manager when labels are registered,
+    and they can be used by other threads without locking. The mapping of
+    labels in a snapshot doesn't change when labels are later added or
+    removed from the label manager, and the label manager registers copies of
+    the labels, rather than changing the orders and heading labels of the
+    labels in a snapshot.
+
+    Parameters
+    ----------
+    labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
+        A dict of labels where the key is the (doc_id, label_id) and the
+        values are the label objects.
+    version : int
+        The version number of the snapshot.
+
+    Attributes
+    ----------
+    labels : Mapping[Tuple[str,str], \
+        :obj:`Label <.label_manager.types.Label>`]
+        A read-only copy of the labels.
+    version : int
+        The version number of the snapshot. Later snapshots have larger
+        version numbers.
+    index : :obj:`LabelIndex`
+        The index for the labels.
+    """
+
+    __slots__ = ('labels', 'version', 'index')
+
+    def __init__(self, labels, version):
+        labels = dict(labels)
+        self.labels = MappingProxyType(labels)
+        self.version = version
+        self.index = LabelIndex(labels)
+
+    def __repr__(self):
+        return "{}(version={}, labels={})".format(self.__class__.__name__,
+                                                  self.version,
+                                                  len(self.labels))
+
+
+class RefTable(dict):
+    """A table of resolved references for a version of registered labels.
+
+    The keys are (doc_id, label_id, target, link settings) tuples for the
+    doc_id of the document referencing the label, the label_id of the
+    referenced label, the target format and the context settings for links.
+    The values are :obj:`RefResolution` tuples.
+
+    Parameters
+    ----------
+    version : int
+        The version of the registered labels used to resolve the references.
+
+    Attributes
+    ----------
+    fragments : Dict[tuple, Union[str, :obj:`lxml.etree.Element`]]
+        The rendered references keyed by the doc_id, label_id, attributes,
+        link settings and format.
+    """
+
+    def __init__(self, version):
+        super().__init__()
+        self.version = version
+        self.fragments = dict()
@@ -2,15 +2,18 @@
 The manager for labels.
 """
 from collections import OrderedDict
-from threading import Lock
+from copy import copy
 
 from .types import ContentLabel, DocumentLabel
 from .exceptions import LabelNotFound, DuplicateLabel
-from .register_orders import register_orders
+from .label_index import LabelIndex, LabelSnapshot, RefTable
+from .label_format import LabelFormat
+from .register_orders import register_orders, get_doc_ids
 from .register_content_labels import register_content_labels
 from ..utils.classes import weakattr
 from ..utils.dict import find_entry
-from ..utils.string import replace_macros
+from ..utils.locks import RWLock
+from ..utils.trace import tracer
 from .. import settings
 
 
@@ -65,38 +68,200 @@ class LabelManager(object):
     labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
         A list of labels where the key is the (doc_id, label_id) and the values
         are the label objects.
+    version : int
+        The version of the registered labels. The version is incremented each
+        time the labels are registered.
+    restored : Set[Tuple[str, str]]
+        The keys of labels added with :meth:`add_labels`, like the labels
+        restored from a :obj:`LabelCache <.label_cache.LabelCache>`, that
+        haven't been added again by :meth:`add_label`.
+
+    Notes
+    -----
+    The label manager is shared by the documents of a project, and it may be
+    used from multiple threads. Labels are added, removed and registered while
+    holding the write lock. Registered labels are read from a
+    :obj:`LabelSnapshot <.label_index.LabelSnapshot>`, which can be used
+    without holding a lock. The labels of a snapshot are not changed by later
+    registrations: the orders and heading labels are assigned to copies of
+    the labels instead. The titles of labels created from tags are formatted
+    when the labels are registered, so the labels of a snapshot don't
+    depend on the tags.
     """
 
     root_context = weakattr()
     labels = None
     collected_labels = None
+    restored = None
     registered = False
+    version = 0
+
+    _lock = None
+    _snapshot = None
+    _ref_table = None
+    _label_formats = None
+    _versioned = None
+    _index = None
+    _checkpoints = None
+    _registered_doc_ids = None
+    _changed_doc_ids = None
 
     def __init__(self, root_context):
         self.labels = OrderedDict()
+        self.restored = set()
         self.root_context = root_context
+        self._lock = RWLock()
+        self._versioned = dict()
+        self._checkpoints = dict()
+        self._changed_doc_ids = set()
+
+    @property
+    def index(self):
+        """The :obj:`LabelIndex <.label_index.LabelIndex>` for the labels.
+
+        The index is created when it's first needed after the labels change.
+        """
+        index = self._index
+        if index is None:
+            with self._lock.read():
+                index = LabelIndex(self.labels)
+            self._index = index
+        return index
+
+    def snapshot(self):
+        """The snapshot of the registered labels.
+
+        .. note:: This function registers the added labels.
+
+        Returns
+        -------
+        snapshot : :obj:`LabelSnapshot <.label_index.LabelSnapshot>`
+            The versioned view of the registered labels.
+        """
+        self.register()
+        return self._snapshot
+
+    def ref_table(self):
+        """The table of resolved references for the registered labels.
+
+        .. note:: This function registers the added labels.
+
+        Returns
+        -------
+        ref_table : :obj:`RefTable <.label_index.RefTable>`
+            The reference table for the current version of the labels. A new
+            table is created each time the labels are registered.
+        """
+        snapshot = self.snapshot()
+        table = self._ref_table
+        if table is None or table.version != snapshot.version:
+            table = RefTable(version=snapshot.version)
+            self._ref_table = table
+        return table
+
+    def versioned(self, name, factory):
+        """Retrieve a shared object for the current version of the registered
+        labels.
+
+        Objects derived from the registered labels, like tables of contents,
+        are created once for each version of the labels and shared by the
+        documents of the project.
+
+        .. note:: This function registers the added labels.
+
+        Parameters
+        ----------
+        name : str
+            The name of the object.
+        factory : Callable[[], object]
+            A function to create the object, if it hasn't been created for
+            the current version of the labels.
+
+        Returns
+        -------
+        obj : object
+            The object for the current version of the labels.
+        """
+        version = self.snapshot().version
+        entry = self._versioned.get(name)
+        if entry is None or entry[0] != version:
+            entry = (version, factory())
+            self._versioned[name] = entry
+        return entry[1]
 
     def register(self, context=None):
         """Register the labels.
+
+        The labels are registered from the first document whose labels have
+        changed since the last registration. The labels of the documents
+        before it keep their registered values.
         """
         if self.registered:
             return None
 
         # Only 1 thread should register the labels at a time
-        lock = Lock()
-        lock.acquire(blocking=True, timeout=10)
+        with self._lock.write():
+            # Another thread may have registered the labels while this thread
+            # waited on the lock
+            if self.registered:
+                return None
+            self._register(context)
+
+    def _register(self, context=None):
+        """Register the labels. The write lock must be held."""
         context = context or self.root_context
 
+        # Find the first document with changed labels. The labels are
+        # registered from the start if the counts at the end of the previous
+        # document aren't available
+        doc_ids = get_doc_ids(labels=self.labels, root_context=context)
+        start = self._first_changed(doc_ids)
+        if 0 < start <= len(doc_ids) and \
+           doc_ids[start - 1] not in self._checkpoints:
+            start = 0
+
+        # Labels in the previous snapshot may be in use by other threads, and
+        # these aren't changed. Copies of the labels from the first changed
+        # document are registered instead.
+        previous = self._snapshot.labels if self._snapshot is not None else {}
+        changed_doc_ids = set(doc_ids[start:])
+        for key, label in self.labels.items():
+            if label.doc_id in changed_doc_ids and previous.get(key) is label:
+                self.labels[key] = copy(label)
+
         # Run the registration functions.
         for func in (register_orders,  # Register label 'order' attribute
                      register_content_labels,  # Set chapter/section attributes
                      ):
-            func(labels=self.labels, root_context=context)
-
-        # Labels have been registered. Release the lock
+            with tracer.span(func.__name__, cat='labels',
+                             num_labels=len(self.labels), start=start):
+                func(labels=self.labels, root_context=context,
+                     doc_ids=doc_ids, start=start,
+                     checkpoints=self._checkpoints)
+
+        # Labels have been registered. Create a new snapshot, since labels
+        # may have been reordered or removed
+        self.version += 1
+        self._snapshot = LabelSnapshot(self.labels, version=self.version)
+        self._index = self._snapshot.index
+        self._registered_doc_ids = list(doc_ids)
+        self._changed_doc_ids.clear()
         self.registered = True
-        if lock.locked():
-            lock.release()
+
+    def _first_changed(self, doc_ids):
+        """The index of the first document in the doc_ids whose labels have
+        changed, or whose position has changed, since the last
+        registration."""
+        previous = self._registered_doc_ids
+        if previous is None:
+            return 0
+
+        changed = self._changed_doc_ids
+        for i, doc_id in enumerate(doc_ids):
+            if (i >= len(previous) or previous[i] != doc_id or
+               doc_id in changed):
+                return i
+        return len(doc_ids)
 
     def reset(self, doc_ids=None):
         """Reset the the labels.
@@ -109,15 +274,22 @@ class LabelManager(object):
         # Prepare the parameters
         doc_ids = {doc_ids} if isinstance(doc_ids, str) else doc_ids
 
-        if doc_ids is None:
-            self.labels.clear()
-        else:
-            keys_to_remove = set(filter(lambda k: k[0] in doc_ids,
-                                        self.labels.keys()))
-            for key in keys_to_remove:
-                del self.labels[key]
-
-        self.registered = False
+        with self._lock.write():
+            if doc_ids is None:
+                self.labels.clear()
+                self.restored.clear()
+                self._checkpoints.clear()
+                self._registered_doc_ids = None
+            else:
+                keys_to_remove = set(filter(lambda k: k[0] in doc_ids,
+                                            self.labels.keys()))
+                for key in keys_to_remove:
+                    del self.labels[key]
+                self.restored -= keys_to_remove
+                self._changed_doc_ids.update(doc_ids)
+
+            self._index = None
+            self.registered = False
 
     def add_label(self, id, kind, context, label_cls, *args, **kwargs):
         """Add a label.
@@ -138,6 +310,12 @@ class LabelManager(object):
         label_cls : :class:`Type[Label] <.label_manager.types.Label>`
             The label class (or subclass) to use in creating the label.
 
+        Returns
+        -------
+        label : :obj:`Type[Label] <.label_manager.types.Label>`
+            The created label, or the restored label with the same id. (See
+            :meth:`add_labels`)
+
         Raises
         ------
         DuplicateLabel : :exc:`DuplicateLabel <.DuplicateLabel>`
@@ -145,8 +323,6 @@ class LabelManager(object):
             label manager.
 
         """
-        self.registered = False
-
         # Parse the label_id
         doc_id, label_id = parse_id(id, context=context)
         if doc_id is None:
@@ -156,42 +332,76 @@ class LabelManager(object):
         # Make the key for the labels dict
         label_key = (doc_id, label_id)
 
-        # See if it's a duplicate
-        if label_key in self.labels:
-            other_label = self.labels[label_key]
-            msg = "Label id '{}' already exists in the labels as '{}'."
-            raise DuplicateLabel(msg.format(id, other_label))
-
         # Organize the kind into a tuple, if needed
         if isinstance(kind, str):
             kind = (kind,)
 
-        # Now create the label and add it to the labels
-        label = label_cls(doc_id=doc_id, id=label_id, kind=kind, order=None,
-                          *args, **kwargs)
-        self.labels[label_key] = label
+        with self._lock.write():
+            # Restored labels are used in place of the new labels. These
+            # were created from the same document context, and the registered
+            # labels aren't changed.
+            if label_key in self.restored:
+                self.restored.discard(label_key)
+                return self.labels[label_key]
+
+            self.registered = False
+
+            # See if it's a duplicate
+            if label_key in self.labels:
+                other_label = self.labels[label_key]
+                msg = "Label id '{}' already exists in the labels as '{}'."
+                raise DuplicateLabel(msg.format(id, other_label))
+
+            # Now create the label and add it to the labels
+            label = label_cls(doc_id=doc_id, id=label_id, kind=kind,
+                              order=None, *args, **kwargs)
+            self.labels[label_key] = label
+            self._index = None
+            self._changed_doc_ids.add(doc_id)
 
         return label
 
+    def add_labels(self, labels):
+        """Add label objects, like the labels restored from a
+        :obj:`LabelCache <.label_cache.LabelCache>`.
+
+        The added labels are restored labels: when a label with the same id is
+        later added with :meth:`add_label`, the restored label is returned
+        instead of creating a new label.
+
+        Parameters
+        ----------
+        labels : Iterable[:obj:`Label <.label_manager.types.Label>`]
+            The labels to add. Labels with the same doc_id and label_id as an
+            existing label are not added.
+        """
+        with self._lock.write():
+            self.registered = False
+
+            for label in labels:
+                label_key = (label.doc_id, label.id)
+                if label_key in self.labels:
+                    continue
+                self.labels[label_key] = label
+                self.restored.add(label_key)
+                self._changed_doc_ids.add(label.doc_id)
+            self._index = None
+
     def add_content_label(self, id, kind, title, context):
         """Add content label.
 
         See :meth:`add_label` for usage details.
         """
-        label = self.add_label(id=id, kind=kind, context=context,
-                               label_cls=ContentLabel, title=title)
-        label.title = title
-        return label
+        return self.add_label(id=id, kind=kind, context=context,
+                              label_cls=ContentLabel, title=title)
 
     def add_document_label(self, id, kind, title, context):
         """Add document label.
 
         See :meth:`add_label` for usage details.
         """
-        label = self.add_label(id=id, kind=kind, context=context,
-                               label_cls=DocumentLabel, title=title)
-        label.title = title
-        return label
+        return self.add_label(id=id, kind=kind, context=context,
+                              label_cls=DocumentLabel, title=title)
 
     def get_label(self, id, register=True, context=None):
         """Return the label for the given label id.
@@ -222,24 +432,23 @@ class LabelManager(object):
             A LabelNotFound exception is raised if a label with the given id
             could not be found.
         """
-        # Register the labels
-        self.register()
+        # Register the labels and get the registered labels
+        snapshot = self.snapshot()
 
         # Parse the label_id
         doc_id, label_id = parse_id(id, context=context or self.root_context)
 
         # Try the label key
-        if (doc_id, label_id) in self.labels:
-            return self.labels[(doc_id, label_id)]
+        label = snapshot.labels.get((doc_id, label_id))
+        if label is not None:
+            return label
 
         # Try to find the first label with a matching label_id, if no
         # doc_id is specified
         if doc_id is None:
-            try:
-                return next(l for k, l in self.labels.items()
-                            if k[1] == label_id)
-            except StopIteration:
-                pass
+            label = snapshot.index.by_label_id.get(label_id)
+            if label is not None:
+                return label
 
         # I give up! I can't find the label.
         msg = "Could not find a label with identifier '{}'"
@@ -312,22 +521,19 @@ class LabelManager(object):
         kinds = (kinds if isinstance(kinds, list) or isinstance(kinds, tuple)
                  else [kinds])
 
-        # Register the labels
-        self.register()
-
-        # Filter labels by doc_id.
-        labels = self.labels.values()
-        if doc_id is not None:
-            labels = [label for label in labels if label.doc_id == doc_id]
+        # Register the labels and get the registered labels
+        snapshot = self.snapshot()
 
-        # Filter labels by kind
-        returned_labels = []
+        # Find the labels by kind and doc_id from the index
+        index = snapshot.index
         if kinds:
+            returned_labels = []
             for kind in kinds:
-                returned_labels += [label for label in labels
-                                    if kind in label.kind]
+                returned_labels += index.labels_by_kind(kind, doc_id=doc_id)
+        elif doc_id is not None:
+            returned_labels = index.labels_by_doc_id(doc_id)
         else:
-            returned_labels = labels
+            returned_labels = list(snapshot.labels.values())
 
         return returned_labels
 
@@ -349,7 +555,33 @@ class LabelManager(object):
             If specified, try finding format strings for the given target.
         """
         label = self.get_label(id=id)
+        keys = keys if len(keys) > 0 else label.kind
+        return self.label_format(*keys, target=target).format(label)
+
+    def label_format(self, *keys, target=None):
+        """Retrieve the compiled label format for the given keys and target.
+
+        Label formats are compiled once for each (keys, target) and version of
+        the registered labels.
+
+        Parameters
+        ----------
+        keys : Tuple[str]
+            The keys to find entries in the format_str dict.
+            (see :func:`find_entry <disseminate.utils.dict.find_entry>`)
+        target : Optional[str]
+            If specified, try finding format strings for the given target.
 
+        Returns
+        -------
+        label_format : :obj:`LabelFormat <.label_format.LabelFormat>`
+            The compiled label format.
+
+        Raises
+        ------
+        KeyError
+            Raised if a label format string could not be found.
+        """
         dicts = []
         if 'label_fmts' in self.root_context:
             dicts.append(self.root_context['label_fmts'])
@@ -358,10 +590,21 @@ class LabelManager(object):
         target = (target[1:] if isinstance(target, str) and
                   target.startswith('.') else target)
 
-        # Find the label format string
-        if len(keys) > 0:
+        # Compiled label formats are reset when the labels are registered or
+        # the label format strings are replaced
+        fmts = dicts[0] if dicts else None
+        cached = self._label_formats
+        if (cached is None or cached[0] is not fmts or
+           cached[1] != self.version):
+            cached = (fmts, self.version, dict())
+            self._label_formats = cached
+        label_formats = cached[2]
+
+        # Find and compile the label format string
+        key = (tuple(keys), target)
+        label_format = label_formats.get(key)
+        if label_format is None:
             fmt_string = find_entry(dicts, *keys, suffix=target)
-        else:
-            fmt_string = find_entry(dicts, *label.kind, suffix=target)
-
-        return replace_macros(fmt_string, {'@label': label})
+            label_format = LabelFormat(fmt_string)
+            label_formats[key] = label_format
+        return label_format
@@ -1,11 +1,15 @@
 """
 Signals for label events
 """
+from itertools import islice
+
 from .label_manager import LabelManager
+from .label_cache import context_key
 from ..signals import signal
 
 
 document_onload = signal('document_onload')
+document_tree_updated = signal('document_tree_updated')
 
 
 @document_onload.connect_via(order=1050)
@@ -24,3 +28,77 @@ def reset_label_manager(context, **kwargs):
     doc_id = context.get('doc_id', None)
     if doc_id is not None:
         label_manager.reset(doc_ids=doc_id)
+
+
+@document_onload.connect_via(order=9000)
+def restore_cached_labels(document, context, reload=False, **kwargs):
+    """Restore the labels of a document from the label cache, and defer the
+    creation of its tags, if the document's context matches the cached
+    entry.
+
+    The labels and 'ref_label_ids' of the document are needed by the other
+    documents of the project, but its tags are only needed when it's
+    rendered. (See :meth:`Document.load_deferred
+    <disseminate.document.Document.load_deferred>`) Documents that are
+    reloaded with the reload flag are fully loaded.
+    """
+    document.deferred = None
+    label_cache = getattr(context.get('environment', None), 'label_cache',
+                          None)
+    label_manager = context.get('label_manager', None)
+    if label_cache is None or label_manager is None:
+        return
+
+    doc_id = context['doc_id']
+    key = context_key(context)
+    entry = None if reload else label_cache.entry(doc_id=doc_id, key=key)
+
+    if entry is None:
+        # Record the labels created by the document's tags. These are added
+        # after the current labels.
+        label_cache.pending[doc_id] = (key, len(label_manager.labels))
+        return
+
+    label_manager.add_labels(label_cache.load_labels(entry))
+
+    # Set the context entries from the tags, and keep the current values to
+    # restore when the tags are created
+    document.deferred = {'label_count': context.get('label_count', None),
+                         'ref_label_ids': None}
+    context['ref_label_ids'] = set(entry['ref_label_ids'])
+    if entry['label_count'] is not None:
+        context['label_count'] = entry['label_count']
+
+
+@document_onload.connect_via(order=10200)
+def record_cached_labels(document, context, **kwargs):
+    """Update the label cache entry of a document after its tags are
+    created."""
+    label_cache = getattr(context.get('environment', None), 'label_cache',
+                          None)
+    doc_id = context.get('doc_id', None)
+    if label_cache is None or doc_id not in label_cache.pending:
+        return
+
+    key, start = label_cache.pending.pop(doc_id)
+    label_manager = context['label_manager']
+    labels = [label_manager.labels[label_key]
+              for label_key in islice(label_manager.labels, start, None)]
+    label_cache.update(doc_id=doc_id, key=key, labels=labels,
+                       ref_label_ids=context.get('ref_label_ids', ()),
+                       label_count=context.get('label_count', None))
+
+
+@document_tree_updated.connect_via(order=3000)
+def purge_label_cache(root_document):
+    """Remove the label cache entries for documents that are no longer in a
+    document tree."""
+    context = root_document.context
+    label_cache = getattr(context.get('environment', None), 'label_cache',
+                          None)
+    if label_cache is None:
+        return
+
+    documents = root_document.documents_list(only_subdocuments=False,
+                                             recursive=True)
+    label_cache.purge(document.doc_id for document in documents)
@@ -4,8 +4,9 @@ A function to register content labels
 from .types import ContentLabel, DocumentLabel
 
 
-def register_content_labels(labels, **kwargs):
-    """Assign chapter/section/subsection links for Content labels.
+def register_content_labels(labels, doc_ids=None, start=0, **kwargs):
+    """Assign chapter/section/subsection links for Content labels, and
+    resolve their titles.
 
     This processor only works on content labels (:obj:`ContentLabel
     <.types.ContentLabel>`)
@@ -15,6 +16,11 @@ def register_content_labels(labels, **kwargs):
     labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
         A list of labels where the key is the (doc_id, label_id) and the values
         are the label objects.
+    doc_ids : Optional[List[str]]
+        The ordered doc_ids for the documents of the labels.
+    start : Optional[int]
+        The index in the doc_ids of the first document whose labels need
+        to be assigned. The labels of the documents before it are unchanged.
     """
 
     # Keep track of the current heading registered_labels
@@ -28,10 +34,32 @@ def register_content_labels(labels, **kwargs):
     content_labels = [label for label in labels.values()
                       if isinstance(label, ContentLabel)]
 
+    # Skip the labels for the documents before the start, and continue from
+    # the heading labels of the last skipped label
+    if doc_ids and start > 0:
+        skipped_doc_ids = set(doc_ids[:start])
+        skipped = 0
+        for label in content_labels:
+            if label.doc_id not in skipped_doc_ids:
+                break
+            skipped += 1
+
+        if skipped > 0:
+            last_label = content_labels[skipped - 1]
+            part_label = last_label.part_label
+            chapter_label = last_label.chapter_label
+            section_label = last_label.section_label
+            subsection_label = last_label.subsection_label
+            subsubsection_label = last_label.subsubsection_label
+        content_labels = content_labels[skipped:]
+
     # Keep track of the current doc_id
     doc_id = None
 
     for label in content_labels:
+        # Format the titles from the labels' tags
+        label.resolve_title()
+
         # Switch the local count whenever a new document is encountered.
         # However, the local_counter is not reset between documents
         if not isinstance(label, DocumentLabel) and doc_id != label.doc_id:
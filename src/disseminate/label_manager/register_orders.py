@@ -5,9 +5,8 @@ Function(s) for setting the label order attributes.
 from collections import Counter
 
 
-def reorder_and_purge_labels_by_doc_id(labels, root_context):
-    """Reorder labels by doc_id and remove labels that refer to a doc_id for
-    a document that no longer exists.
+def get_doc_ids(labels, root_context):
+    """The ordered doc_ids for the documents of a project.
 
     Parameters
     ----------
@@ -16,32 +15,66 @@ def reorder_and_purge_labels_by_doc_id(labels, root_context):
         are the label objects.
     root_context : :obj:`.document.DocumentContext`
         The context for the root document.
-    """
 
+    Returns
+    -------
+    doc_ids : List[str]
+        The doc_ids from the project, or the doc_ids of the labels in order,
+        if the project's root document isn't available.
+    """
     # Get the order of doc_ids from the root_context
     root_doc = root_context.root_document
     if root_doc is not None:
         # Use the doc_ids from the project
-        doc_ids = root_doc.doc_ids if root_doc is not None else []
+        return root_doc.doc_ids
     else:
         # Use the doc_ids from the labels themselves
-        doc_ids = [label.doc_id for label in labels.values()]
+        return list(dict.fromkeys(label.doc_id for label in labels.values()))
+
+
+def reorder_and_purge_labels_by_doc_id(labels, root_context, doc_ids=None):
+    """Reorder labels by doc_id and remove labels that refer to a doc_id for
+    a document that no longer exists.
 
-    # Remove labels that aren't listed in the doc_ids
-    filtered_labels = filter(lambda l: l.doc_id in doc_ids, labels.values())
+    Parameters
+    ----------
+    labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
+        A list of labels where the key is the (doc_id, label_id) and the values
+        are the label objects.
+    root_context : :obj:`.document.DocumentContext`
+        The context for the root document.
+    doc_ids : Optional[List[str]]
+        The ordered doc_ids for the documents of the project. If not
+        specified, these are retrieved with :func:`get_doc_ids`.
+
+    Returns
+    -------
+    doc_ids, segments : Tuple[List[str], \
+        Dict[str, List[:obj:`Label <.label_manager.types.Label>`]]]
+        The ordered doc_ids and the ordered labels for each doc_id.
+    """
+    if doc_ids is None:
+        doc_ids = get_doc_ids(labels, root_context)
 
-    # Sort filtered labels by doc_id
-    reordered_labels = sorted([(count, label)
-                               for count, label in enumerate(filtered_labels)],
-                              key=lambda k: (doc_ids.index(k[1].doc_id), k[0]))
+    # Group the labels by doc_id. Labels that aren't listed in the doc_ids
+    # are removed
+    segments = {doc_id: [] for doc_id in doc_ids}
+    for label in labels.values():
+        segment = segments.get(label.doc_id)
+        if segment is not None:
+            segment.append(label)
 
     # Repopulate the labels dict (which should be an ordered dict)
     labels.clear()
-    for count, label in reordered_labels:
-        labels[label.doc_id, label.id] = label
+    for doc_id in doc_ids:
+        for label in segments[doc_id]:
+            labels[label.doc_id, label.id] = label
+
+    return doc_ids, segments
 
 
-def register_orders(labels, root_context, **kwargs):
+def register_orders(labels, root_context, doc_ids=None, start=0,
+                    checkpoints=None, **kwargs):
     """Set the order attributes of labels.
 
     - The order is a tuple of integers that indicate the order or a label
@@ -67,6 +100,11 @@ def register_orders(labels, root_context, **kwargs):
     - This function uses reorder_and_purge_labels_by_doc_id, which removes
       labels with a doc_id for documents that no longer exist.
 
+    - The counts for each kind at the end of each document are stored in
+      the checkpoints, if specified. Registration can then start from the
+      first changed document, and the labels of the documents before it keep
+      their orders.
+
     Parameters
     ----------
     labels : Dict[Tuple[str,str], :obj:`Label <.label_manager.types.Label>`]
@@ -74,12 +112,28 @@ def register_orders(labels, root_context, **kwargs):
         are the label objects.
     root_context : :obj:`.document.DocumentContext`
         The context for the root document.
+    doc_ids : Optional[List[str]]
+        The ordered doc_ids for the documents of the project.
+    start : Optional[int]
+        The index in the doc_ids of the first document whose labels need
+        orders.
+    checkpoints : Optional[Dict[str, :obj:`collections.Counter`]]
+        The counts for each kind at the end of each document, keyed by
+        doc_id. These are updated for the documents with new orders.
     """
     # Reorder labels
-    reorder_and_purge_labels_by_doc_id(labels, root_context)
-
-    # Keep track of the counts for each kind
-    count = Counter()
+    doc_ids, segments = reorder_and_purge_labels_by_doc_id(labels,
+                                                           root_context,
+                                                           doc_ids=doc_ids)
+
+    # Keep track of the counts for each kind. Start from the counts at the end
+    # of the previous document, if available
+    previous_doc_id = doc_ids[start - 1] if 0 < start <= len(doc_ids) else None
+    if previous_doc_id is not None and previous_doc_id in (checkpoints or ()):
+        count = Counter(checkpoints[previous_doc_id])
+    else:
+        start = 0
+        count = Counter()
 
     # Retrieve the label_resets.
     if 'label_resets' in root_context:
@@ -88,22 +142,31 @@ def register_orders(labels, root_context, **kwargs):
         reset_counts = dict()
 
     # Process labels with a kind listed.
-    filtered_labels = [label for label in labels.values()
-                       if label.kind is not None]
-    for label in filtered_labels:
-
-        # Get the count for each of the kind items
-        order = []
-        for k in label.kind:
-            # Increment the count for the kind
-            count[k] += 1
-
-            # Reset counters, if specified
-            if k in reset_counts:
-                for i in reset_counts[k]:
-                    count[i] = 0
-
-            # Append the count
-            order.append(count[k])
-
-        label.order = tuple(order)
+    for doc_id in doc_ids[start:]:
+        for label in segments[doc_id]:
+            if label.kind is None:
+                continue
+
+            # Get the count for each of the kind items
+            order = []
+            for k in label.kind:
+                # Increment the count for the kind
+                count[k] += 1
+
+                # Reset counters, if specified
+                if k in reset_counts:
+                    for i in reset_counts[k]:
+                        count[i] = 0
+
+                # Append the count
+                order.append(count[k])
+
+            label.order = tuple(order)
+
+        if checkpoints is not None:
+            checkpoints[doc_id] = Counter(count)
+
+    # Remove the checkpoints for documents that no longer exist
+    if checkpoints is not None:
+        for doc_id in checkpoints.keys() - segments.keys():
+            del checkpoints[doc_id]
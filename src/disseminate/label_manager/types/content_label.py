@@ -1,4 +1,7 @@
+import weakref
+
 from .label import Label
+from ..exceptions import LabelError
 from ...utils.classes import weakattr
 
 
@@ -15,6 +18,14 @@ class ContentLabel(Label):
     """A label for content, like a heading (chapter, section, subsection) or
     an item that should show up in a table of contents, like a figure caption.
 
+    Parameters
+    ----------
+    title : Union[str, :obj:`Tag <disseminate.tags.Tag>`]
+        The title of the label. If a tag is given, a weak reference to the tag
+        is kept and the title is formatted from the tag's short title when
+        the label is registered. (See :meth:`resolve_title`) The tag should
+        exist until then.
+
     Attributes
     ----------
     document_label : :obj:`DocumentLabel <.types.DocumentLabel>`
@@ -29,20 +40,67 @@ class ContentLabel(Label):
         The label for the subsubsection under which this label is under.
     """
 
-    title = None
+    __slots__ = ('_title', '_document_label', '_title_label', '_part_label',
+                 '_chapter_label', '_section_label', '_subsection_label',
+                 '_subsubsection_label')
 
-    document_label = weakattr()
-    title_label = weakattr()
-    part_label = weakattr()
-    chapter_label = weakattr()
-    section_label = weakattr()
-    subsection_label = weakattr()
-    subsubsection_label = weakattr()
+    document_label = weakattr(slot='_document_label')
+    title_label = weakattr(slot='_title_label')
+    part_label = weakattr(slot='_part_label')
+    chapter_label = weakattr(slot='_chapter_label')
+    section_label = weakattr(slot='_section_label')
+    subsection_label = weakattr(slot='_subsection_label')
+    subsubsection_label = weakattr(slot='_subsubsection_label')
 
     def __init__(self, doc_id, id, kind, title, order=None):
         super().__init__(doc_id=doc_id, id=id, kind=kind, order=order)
         self.title = title
 
+    @property
+    def title(self):
+        """The title of the label.
+
+        The title of a label that hasn't been resolved is formatted from its
+        tag each time it's read.
+
+        Raises
+        ------
+        LabelError : :exc:`LabelError <.exceptions.LabelError>`
+            Raised if the title is formatted from a tag that no longer exists.
+        """
+        title = self._title
+        if isinstance(title, weakref.ref):
+            # Format the title from the tag
+            tag = title()
+            if tag is None:
+                msg = ("The tag for the title of the label '{}' no longer "
+                       "exists.".format(self.id))
+                raise LabelError(msg)
+            title = tag.short
+        return title
+
+    @title.setter
+    def title(self, value):
+        if value is None or isinstance(value, str):
+            self._title = value
+        else:
+            self._title = weakref.ref(value)
+
+    def resolve_title(self):
+        """Format the title from the label's tag, and keep the formatted
+        title in place of the reference to the tag.
+
+        Titles are resolved when the labels are registered, before the labels
+        are shared in a :obj:`LabelSnapshot <.label_index.LabelSnapshot>`, so
+        that the labels of a snapshot aren't changed when they're read.
+
+        Raises
+        ------
+        LabelError : :exc:`LabelError <.exceptions.LabelError>`
+            Raised if the title is formatted from a tag that no longer exists.
+        """
+        self._title = self.title
+
     def __repr__(self):
         if self.title is not None:
             return super().__repr__(title=self.title)
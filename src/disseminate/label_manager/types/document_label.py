@@ -4,7 +4,7 @@ from .label import Label
 class DocumentLabel(Label):
     """A label for documents.
     """
-    title = None
+    __slots__ = ('title',)
 
     def __init__(self, doc_id, id, kind, title, order=None):
         super().__init__(doc_id=doc_id, id=id, kind=kind, order=order)
@@ -1,6 +1,43 @@
 """
 The label base class for the label manager.
 """
+import sys
+
+#: The interned label kinds. Labels with the same kind share a kind tuple,
+#: and the strings of the kind tuples are interned.
+kind_registry = dict()
+
+
+def intern_kind(kind):
+    """Return the shared kind tuple for a label kind.
+
+    Parameters
+    ----------
+    kind : Union[str, List[str], Tuple[str], None]
+        The kind of a label. ex: 'figure', ('heading', 'chapter')
+
+    Returns
+    -------
+    interned_kind : Union[Tuple[str], None]
+        The kind tuple from the :data:`kind_registry`.
+
+    Examples
+    --------
+    >>> intern_kind('figure')
+    ('figure',)
+    >>> intern_kind(['heading', 'chapter']) is intern_kind(('heading',
+    ...                                                      'chapter'))
+    True
+    """
+    if kind is None:
+        return None
+
+    kind = (kind,) if isinstance(kind, str) else tuple(kind)
+    interned_kind = kind_registry.get(kind)
+    if interned_kind is None:
+        interned_kind = tuple(map(sys.intern, kind))
+        interned_kind = kind_registry.setdefault(interned_kind, interned_kind)
+    return interned_kind
 
 
 class Label(object):
@@ -17,7 +54,8 @@ class Label(object):
     kind : Tuple[str]
         The kind of the label is a tuple that identifies the kind of a label
         from least specific to most specific. ex: ('figure',), ('chapter',),
-        ('equation',), ('heading', 'chapter',)
+        ('equation',), ('heading', 'chapter',). The kind tuples are interned
+        with :func:`intern_kind`.
     order : Optional[Tuple[int]]
         The order/number of the label. The order is a tuple of integers with a
         length that matches the 'kind' tuple. Each entry represents the
@@ -32,18 +70,27 @@ class Label(object):
         <disseminate.label_manager.processors.OrderLabels>`)
     """
 
-    doc_id = None
-    id = None
-    kind = None
-    order = None
+    __slots__ = ('doc_id', 'id', 'kind', 'order', '__weakref__')
 
     def __init__(self, doc_id, id, kind, order=None):
         self.doc_id = doc_id
         self.id = id
         self.order = order
 
-        # Wrap the kind in a tuple, if it's a string
-        self.kind = (kind,) if isinstance(kind, str) else kind
+        # Wrap the kind in a tuple, if it's a string, and use the shared kind
+        # tuple
+        self.kind = intern_kind(kind)
+
+    def __copy__(self):
+        # Copy the values of the slots. Heading labels are stored as weak
+        # references in slots, and the copy refers to the same labels.
+        cls = self.__class__
+        label = cls.__new__(cls)
+        for klass in cls.__mro__:
+            for slot in getattr(klass, '__slots__', ()):
+                if slot != '__weakref__' and hasattr(self, slot):
+                    setattr(label, slot, getattr(self, slot))
+        return label
 
     def __repr__(self, **params):
         cls_name = self.__class__.__name__
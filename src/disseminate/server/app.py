@@ -17,16 +17,17 @@ class TornadoApp(tornado.web.Application):
         tornado.web.Application.__init__(self, url_patterns, **kwargs)
 
 
-def get_app(in_path, out_dir, debug=False, **kwargs):
+def get_app(in_path, out_dir, debug=False, watch=False, **kwargs):
     """Create the Tornado app instance"""
     app = TornadoApp(in_path=in_path, out_dir=out_dir, debug=debug,
+                     watch=watch,
                      template_path=server_template_path,
                      default_handler_class=ServerHandler)
     return app
 
 
 def run_server(in_path, out_dir, port=settings.default_port,
-               debug=False):
+               debug=False, watch=True):
     """Create and run the web-server.
 
     Parameters
@@ -39,8 +40,11 @@ def run_server(in_path, out_dir, port=settings.default_port,
         The network port to serve the web-server.
     debug : Optional[bool]
         If true, include debugging information.
+    watch : Optional[bool]
+        If true, watch the source files and rebuild projects in the
+        background when these change.
     """
-    app = get_app(in_path=in_path, out_dir=out_dir, debug=debug)
+    app = get_app(in_path=in_path, out_dir=out_dir, debug=debug, watch=watch)
 
     http_server = tornado.httpserver.HTTPServer(app)
     http_server.listen(port, '127.0.0.1')  # listen only to the localhost
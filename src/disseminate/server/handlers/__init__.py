@@ -3,8 +3,12 @@ from .tree import TreeHandler
 from .checkers import CheckerHandler
 from .signals import SignalHandler
 from .pygmentize import PygmentizeHandler
-from .static import CustomStaticFileHandler
+from .static import (CustomStaticFileHandler, LiveReloadStaticFileHandler,
+                     MediaStaticFileHandler)
+from .livereload import LiveReloadHandler
 
 __all__ = ('ServerHandler', 'server_template_path', 'server_static_path',
            'TreeHandler', 'CheckerHandler', 'SignalHandler',
-           'PygmentizeHandler', 'CustomStaticFileHandler')
+           'PygmentizeHandler', 'CustomStaticFileHandler',
+           'LiveReloadStaticFileHandler', 'MediaStaticFileHandler',
+           'LiveReloadHandler')
@@ -0,0 +1,69 @@
+"""
+A handler to push 'rebuilt' events to preview pages.
+"""
+import os
+from pathlib import Path
+
+from tornado.ioloop import IOLoop
+from tornado.websocket import WebSocketHandler, WebSocketClosedError
+
+
+class LiveReloadHandler(WebSocketHandler):
+    """A WebSocket handler that pushes 'rebuilt' events to preview pages.
+
+    The events are JSON messages with the 'doc_id' of the rebuilt document
+    and the url paths of its changed target files.
+
+    ex: {"event": "rebuilt", "doc_id": "file1.dm",
+    "targets": ["/html/file1.html"]}
+    """
+
+    #: The open connections
+    clients = set()
+
+    #: The IOLoop for the open connections
+    loop = None
+
+    def open(self):
+        LiveReloadHandler.loop = IOLoop.current()
+        self.clients.add(self)
+
+    def on_close(self):
+        self.clients.discard(self)
+
+    @classmethod
+    def broadcast(cls, message):
+        """Send a message to all open connections. This must be called from
+        the IOLoop's thread."""
+        for client in list(cls.clients):
+            try:
+                client.write_message(message)
+            except WebSocketClosedError:
+                cls.clients.discard(client)
+
+    @classmethod
+    def notify_rebuilt(cls, document, target_filepaths, root_path='.'):
+        """Send a 'rebuilt' event for a document to all open connections.
+
+        This function can be called from any thread.
+
+        Parameters
+        ----------
+        document : :obj:`Document <.Document>`
+            The rebuilt document.
+        target_filepaths : List[:obj:`TargetPath <.paths.TargetPath>`]
+            The changed target files for the document.
+        root_path : Optional[str]
+            The path served as the root url path.
+        """
+        loop = cls.loop
+        if loop is None or not cls.clients:
+            return
+
+        targets = ['/' + Path(os.path.relpath(target_filepath,
+                                              root_path)).as_posix()
+                   for target_filepath in target_filepaths]
+        message = {'event': 'rebuilt',
+                   'doc_id': document.doc_id,
+                   'targets': targets}
+        loop.add_callback(cls.broadcast, message)
@@ -2,13 +2,63 @@
 Functions to load projects in a session.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from tornado.ioloop import IOLoop
 
 from .store import store
+from .livereload import LiveReloadHandler
+from ..watcher import ProjectWatcher, build_documents
 from ...builders.environment import Environment
+from ...utils.locks import RWLock
 
+#: The executor for loading and building projects off the IOLoop thread.
+#: Builds are run one at a time since projects share global state.
+build_executor = ThreadPoolExecutor(max_workers=1,
+                                    thread_name_prefix='disseminate-preview')
+
+#: The lock held for writing while projects are loaded or built, and for
+#: reading while the documents or their target files are read by requests.
+project_lock = RWLock()
+
+
+def submit(key, func, *args):
+    """Run a function on the build executor, or return the in-flight future
+    for the same key.
+
+    Parameters
+    ----------
+    key : Hashable
+        The key for the function call. Concurrent calls with the same key
+        share a single future.
+    func : Callable
+        The function to run.
+    *args
+        The arguments for the function.
+
+    Returns
+    -------
+    future : :obj:`asyncio.Future`
+        The future for the result of the function.
+    """
+    futures = store.setdefault('futures', dict())
+    future = futures.get(key)
+
+    if future is None or future.done():
+        future = IOLoop.current().run_in_executor(build_executor, func, *args)
+        futures[key] = future
+
+        def remove(f):
+            if futures.get(key) is f:
+                del futures[key]
+        future.add_done_callback(remove)
+
+    return future
+
+
+def create_projects(app):
+    """Create the root documents for the projects of the app and store them.
 
-def load_projects(app):
-    """Retrieve the root documents from the store.
     Returns
     -------
     root_documents : List[:obj:`Document <.Document`]
@@ -17,11 +67,10 @@ def load_projects(app):
     # Get the session and config
     settings = app.settings
 
-    # Make sure the project list is loaded
-    if 'root_documents' not in store:
-        # Get project_filenames
-        in_path = settings.get('in_path', '')
+    # Get project_filenames
+    in_path = settings.get('in_path', '')
 
+    with project_lock.write():
         # Fetch the root documents
         envs = Environment.create_environments(root_path=in_path)
         docs = [env.root_document for env in envs]
@@ -30,9 +79,64 @@ def load_projects(app):
         for doc in docs:
             logging.debug("Loaded root document '{}'".format(doc))
 
-        # Store the root documents in the global store
-        store['root_documents'] = docs
+        # Build the projects
+        if settings.get('watch', False):
+            [doc.build() for doc in docs]
+
+    # Watch the projects for changes
+    if settings.get('watch', False):
+        watcher = ProjectWatcher(root_documents=docs,
+                                 on_build=LiveReloadHandler.notify_rebuilt,
+                                 lock=project_lock)
+        watcher.start()
+        store['watcher'] = watcher
+
+    # Store the root documents in the global store
+    store['root_documents'] = docs
+    return docs
+
 
-    # See if any of the docs need to be built
-    [doc.build() for doc in store['root_documents']]
-    return store['root_documents']
+def build_project(root_document):
+    """Build a project while holding the project lock for writing.
+
+    Parameters
+    ----------
+    root_document : :obj:`Document <.Document>`
+        The root document of the project to build.
+
+    Returns
+    -------
+    status : Union[str, List[str]]
+        The status of the build.
+    """
+    with project_lock.write():
+        return build_documents(root_document,
+                               callback=LiveReloadHandler.notify_rebuilt)
+
+
+async def load_projects(app):
+    """Retrieve the root documents from the store.
+
+    If the 'watch' setting of the app is True, the projects are watched for
+    changes and rebuilt in the background. Otherwise, the projects are
+    rebuilt, if needed, with each call. The projects are loaded and built on
+    the build executor so that the IOLoop isn't blocked, and concurrent calls
+    wait on the same load or build.
+
+    Returns
+    -------
+    root_documents : List[:obj:`Document <.Document`]
+        The loaded root documents.
+    """
+    # Make sure the project list is loaded
+    if 'root_documents' not in store:
+        await submit('load', create_projects, app)
+
+    docs = store['root_documents']
+
+    # See if any of the docs need to be built. Watched projects are built by
+    # the watcher.
+    if store.get('watcher') is None:
+        for doc in docs:
+            await submit(('build', doc.src_filepath), build_project, doc)
+    return docs
@@ -23,10 +23,15 @@ class ServerHandler(RequestHandler):
     """A request handler for server functions"""
 
     def initialize(self, reload_projects=False, *args, **kwargs):
-        if reload_projects:
-            load_projects(self.application)
+        self.reload_projects = reload_projects
         super().initialize(*args, **kwargs)
 
+    async def prepare(self):
+        # Wait for the projects to be loaded and built, without blocking other
+        # requests
+        if self.reload_projects:
+            await load_projects(self.application)
+
     def set_default_headers(self):
         # Disable mimetype sniffing/guessing to allow viewing of plain/text
         self.set_header('X-Content-Type-Options', 'nosniff')
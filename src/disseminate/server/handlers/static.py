@@ -1,11 +1,179 @@
 """
 Static file handlers
 """
+import os
+import re
+import hashlib
+import threading
+from pathlib import Path
+
 from tornado.web import StaticFileHandler
 
 from .server import ServerHandler
+from .store import store
+
+#: A regex for filenames with a hash suffix, like those generated by
+#: :func:`generate_mock_parameters <.builders.utils.generate_mock_parameters>`
+hashed_filename = re.compile(r'_[0-9a-f]{12}\.[^./\\]+$')
+
+#: The client script injected into previewed html pages
+livereload_script = b'<script src="/media/js/livereload.js"></script>'
+
+
+def decider_hash(abspath):
+    """The output hash recorded by the decider of a project for a built
+    file.
+
+    Parameters
+    ----------
+    abspath : str
+        The absolute path of the file.
+
+    Returns
+    -------
+    output_hash : Union[str, None]
+        The output hash for the file, or None if a hash wasn't found.
+    """
+    for root_document in store.get('root_documents', ()):
+        env = root_document.context.get('environment')
+        output_hash = getattr(getattr(env, 'decider', None), 'output_hash',
+                              None)
+        target_root = os.path.abspath(getattr(env, 'target_root', '') or '')
+        if (output_hash is None or
+           not abspath.startswith(target_root + os.sep)):
+            continue
+
+        hash_value = output_hash(abspath)
+        if hash_value is not None:
+            return hash_value
+    return None
 
 
 class CustomStaticFileHandler(ServerHandler, StaticFileHandler):
-    """A custom static file handler that handles rendered error pages"""
+    """A custom static file handler that handles rendered error pages.
+
+    The ETags for files are the output hashes from the project's decider for
+    built files, or a hash of the file's contents otherwise. These are
+    retrieved without reading the file while the file is unchanged. Files
+    with a hash in their filename are cached by browsers.
+
+    The project lock isn't held. Builders replace their output files
+    atomically (See :func:`atomic_open <.utils.file.atomic_open>`), so the
+    files from the last completed build are served while a build is in
+    progress.
+    """
+
+    #: The mtime, size and content hash for files that weren't built, keyed by
+    #: the path of the file
+    _content_hashes = dict()
+    _content_hashes_lock = threading.Lock()
+
+    def compute_etag(self):
+        abspath = self.absolute_path
+        stat = self._stat()
+
+        version = decider_hash(abspath)
+        if version is None:
+            stats = (stat.st_mtime_ns, stat.st_size)
+            with self._content_hashes_lock:
+                entry = self._content_hashes.get(abspath)
+            if entry is not None and entry[:2] == stats:
+                version = entry[2]
+            else:
+                content = self.get_content(abspath)
+                content = [content] if isinstance(content, bytes) else content
+                hasher = hashlib.md5()
+                for chunk in content:
+                    hasher.update(chunk)
+                version = hasher.hexdigest()
+                with self._content_hashes_lock:
+                    self._content_hashes[abspath] = stats + (version,)
+
+        return '"{}"'.format(version)
+
+    def get_cache_time(self, path, modified, mime_type):
+        if hashed_filename.search(path):
+            return self.CACHE_MAX_AGE
+        return super().get_cache_time(path, modified, mime_type)
+
+
+class MediaStaticFileHandler(ServerHandler, StaticFileHandler):
+    """A static file handler for the media files of the server, like the
+    scripts and stylesheets of the server pages.
+
+    The media files are installed with the package, and they don't depend on
+    the projects. These are served without the projects' state, like the
+    project lock or the hashes from the projects' deciders.
+    """
     pass
+
+
+def inject_livereload(content):
+    """Insert the live-reload client script in the body of an html page.
+
+    Parameters
+    ----------
+    content : bytes
+        The contents of the html page.
+
+    Returns
+    -------
+    content : bytes
+        The contents of the html page with the client script.
+
+    Examples
+    --------
+    >>> inject_livereload(b'<body></body>')
+    b'<body><script src="/media/js/livereload.js"></script></body>'
+    """
+    index = content.rfind(b'</body>')
+    if index == -1:
+        return content
+    return content[:index] + livereload_script + content[index:]
+
+
+class LiveReloadStaticFileHandler(CustomStaticFileHandler):
+    """A static file handler for html pages that injects the live-reload
+    client script.
+
+    The html pages with the injected script are cached so that a page is read
+    from disk once for its size and its contents.
+    """
+
+    #: The mtime, size and contents with the injected script for html pages,
+    #: keyed by the path of the file
+    _injected = dict()
+    _injected_lock = threading.Lock()
+
+    @classmethod
+    def get_injected_content(cls, abspath):
+        """The contents of an html page with the live-reload client script.
+
+        Parameters
+        ----------
+        abspath : str
+            The absolute path of the html page.
+
+        Returns
+        -------
+        content : bytes
+            The contents of the html page with the client script.
+        """
+        stat = os.stat(abspath)
+        stats = (stat.st_mtime_ns, stat.st_size)
+        with cls._injected_lock:
+            entry = cls._injected.get(abspath)
+        if entry is not None and entry[:2] == stats:
+            return entry[2]
+
+        content = inject_livereload(Path(abspath).read_bytes())
+        with cls._injected_lock:
+            cls._injected[abspath] = stats + (content,)
+        return content
+
+    @classmethod
+    def get_content(cls, abspath, start=None, end=None):
+        return cls.get_injected_content(abspath)[start:end]
+
+    def get_content_size(self):
+        return len(self.get_injected_content(self.absolute_path))
@@ -7,4 +7,7 @@ store = dict()
 
 def reset_store():
     global store
+    watcher = store.get('watcher')
+    if watcher is not None:
+        watcher.stop()
     store.clear()
@@ -4,19 +4,28 @@ A request handler for rendering the project document tree.
 from datetime import datetime
 
 from .server import ServerHandler
-from .projects import load_projects
+from .projects import load_projects, submit, project_lock
 
 
 class TreeHandler(ServerHandler):
     """A request handler for the project document tree"""
 
-    def get(self):
+    async def get(self):
         # Load the project roo documents
-        projects = load_projects(self.application)
-        tree = self.tree_to_dict(projects)
+        projects = await load_projects(self.application)
+
+        # Read the documents on the build executor, while these aren't being
+        # reloaded
+        tree = await submit('tree', self.locked_tree_to_dict, projects)
 
         self.render("tree.html", projects=tree)
 
+    def locked_tree_to_dict(self, docs):
+        """Convert the root documents into a list of dicts while holding the
+        project lock for reading."""
+        with project_lock.read():
+            return self.tree_to_dict(docs)
+
     def tree_to_dict(self, docs, level=1):
         """Convert the root documents into a list of dicts, suitable for
         rendering
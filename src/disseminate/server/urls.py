@@ -4,19 +4,21 @@ URL routes for the Tornado server
 from tornado.web import url
 
 from .handlers import (TreeHandler, CheckerHandler, SignalHandler,
-                       CustomStaticFileHandler, PygmentizeHandler,
-                       server_static_path)
+                       CustomStaticFileHandler, LiveReloadStaticFileHandler,
+                       MediaStaticFileHandler, LiveReloadHandler,
+                       PygmentizeHandler, server_static_path)
 
 
 url_patterns = [
     url(r"/", TreeHandler, name="tree"),
     url(r"/checkers", CheckerHandler, name="checkers"),
     url(r"/signals", SignalHandler, name="signals"),
-    url(r"/media/(.*)", CustomStaticFileHandler, {'path': server_static_path}),
+    url(r"/livereload", LiveReloadHandler, name="livereload"),
+    url(r"/media/(.*)", MediaStaticFileHandler, {'path': server_static_path}),
     url(r"/(.*\.dm)", PygmentizeHandler, name='disseminate_source'),
     url(r"/(.*\.tex)", PygmentizeHandler, name='latex_source',
         kwargs={'reload_projects': True}),
-    url(r"/(.*\.html)", CustomStaticFileHandler,
+    url(r"/(.*\.html)", LiveReloadStaticFileHandler,
         kwargs={'path': '.', 'reload_projects': True}),
     url(r"/(.*\.epub)", CustomStaticFileHandler,
         kwargs={'path': '.', 'reload_projects': True}),
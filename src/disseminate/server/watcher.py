@@ -0,0 +1,386 @@
+"""
+A filesystem watcher that rebuilds projects when their source files change.
+
+The watcher uses `watchdog <https://github.com/gorakhargosh/watchdog>`_
+(inotify on Linux), if it's installed, and it falls back to polling the
+mtimes of files otherwise.
+"""
+import os
+import logging
+import pathlib
+import threading
+
+from .. import settings
+from ..utils.locks import RWLock
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional
+    Observer = None
+
+
+def target_mtimes(root_document):
+    """The mtimes of the target files for a document tree.
+
+    Parameters
+    ----------
+    root_document : :obj:`Document <.Document>`
+        The root document of the document tree.
+
+    Returns
+    -------
+    mtimes : Dict[:obj:`TargetPath <.paths.TargetPath>`, \
+        Tuple[:obj:`Document <.Document>`, Union[float, None]]]
+        The documents and mtimes of the target files keyed by the target
+        filepaths. The mtime is None for missing target files.
+    """
+    mtimes = dict()
+    for document in root_document.documents_list(recursive=True):
+        for target_filepath in document.targets.values():
+            try:
+                mtime = os.stat(target_filepath).st_mtime
+            except OSError:
+                mtime = None
+            mtimes[target_filepath] = (document, mtime)
+    return mtimes
+
+
+def build_documents(root_document, callback=None):
+    """Build a document tree and report the target files that were changed
+    for each document.
+
+    Parameters
+    ----------
+    root_document : :obj:`Document <.Document>`
+        The root document of the document tree to build.
+    callback : Optional[Callable[[:obj:`Document <.Document>`, \
+        List[:obj:`TargetPath <.paths.TargetPath>`]], None]]
+        If specified, this function is called with each document whose
+        target files were changed by the build, and the list of the changed
+        target files.
+
+    Returns
+    -------
+    status : Union[str, List[str]]
+        The status of the build.
+    """
+    if callback is None:
+        return root_document.build()
+
+    before = target_mtimes(root_document)
+    status = root_document.build()
+    after = target_mtimes(root_document)
+
+    changed = dict()
+    for target_filepath, (document, mtime) in after.items():
+        if mtime is not None and before.get(target_filepath,
+                                            (None, None))[1] != mtime:
+            changed.setdefault(document, []).append(target_filepath)
+
+    for document, target_filepaths in changed.items():
+        callback(document, target_filepaths)
+    return status
+
+
+def _watched_file(path):
+    """Return True if changes to the file at the given path should be
+    tracked. Hidden files, like editor swap files, are not tracked."""
+    return not os.path.basename(path).startswith('.')
+
+
+class PollingBackend(object):
+    """A watcher backend that polls directories for changes in the mtimes of
+    their files.
+
+    Parameters
+    ----------
+    callback : Callable[[List[str]], None]
+        The function to call with the list of paths for changed files.
+    interval : Optional[float]
+        The time (in seconds) between polls of the directories.
+    """
+
+    def __init__(self, callback, interval=None):
+        self.callback = callback
+        self.interval = (interval if interval is not None else
+                         settings.preview_watch_interval)
+        self._paths = frozenset()
+        self._snapshot = dict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self, paths=None):
+        """The mtimes of the files in the watched directories.
+
+        Parameters
+        ----------
+        paths : Optional[Iterable[str]]
+            The directories to scan. By default, the watched directories are
+            scanned.
+
+        Returns
+        -------
+        mtimes : Dict[str, float]
+            The mtimes of files keyed by their paths.
+        """
+        paths = self._paths if paths is None else paths
+        mtimes = dict()
+        for dirname in paths:
+            try:
+                with os.scandir(dirname) as entries:
+                    for entry in entries:
+                        if entry.is_file() and _watched_file(entry.path):
+                            mtimes[entry.path] = entry.stat().st_mtime
+            except OSError:
+                continue
+        return mtimes
+
+    def schedule(self, paths):
+        """Set the directories to watch.
+
+        Parameters
+        ----------
+        paths : Iterable[str]
+            The directories to watch.
+        """
+        paths = frozenset(paths)
+        snapshot = self.snapshot(paths)
+        with self._lock:
+            self._paths = paths
+            self._snapshot = snapshot
+
+    def poll(self):
+        """Poll the watched directories and call the callback with the paths
+        of changed files, if any."""
+        with self._lock:
+            old = self._snapshot
+            new = self.snapshot()
+            self._snapshot = new
+
+        changed = [path for path in old.keys() | new.keys()
+                   if old.get(path) != new.get(path)]
+        if changed:
+            self.callback(sorted(changed))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        """Start polling in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='disseminate-poller')
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class WatchdogBackend(object):
+    """A watcher backend that uses the watchdog package to receive
+    filesystem events from the operating system.
+
+    Parameters
+    ----------
+    callback : Callable[[List[str]], None]
+        The function to call with the list of paths for changed files.
+    interval : Optional[float]
+        Not used. Included for compatibility with the :obj:`PollingBackend`.
+    """
+
+    def __init__(self, callback, interval=None):
+        self.callback = callback
+        self._observer = Observer()
+
+    def dispatch(self, event):
+        """Handle a watchdog filesystem event."""
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        paths = [os.fsdecode(p) for p in paths if p]
+        paths = [p for p in paths if _watched_file(p)]
+        if paths:
+            self.callback(paths)
+
+    def schedule(self, paths):
+        """Set the directories to watch.
+
+        Parameters
+        ----------
+        paths : Iterable[str]
+            The directories to watch.
+        """
+        self._observer.unschedule_all()
+        for path in paths:
+            self._observer.schedule(self, path, recursive=False)
+
+    def start(self):
+        """Start receiving events in a background thread."""
+        self._observer.daemon = True
+        self._observer.start()
+
+    def stop(self):
+        """Stop receiving events."""
+        self._observer.stop()
+        self._observer.join()
+
+
+class ProjectWatcher(object):
+    """Watch the source files and templates of projects and rebuild the
+    projects in a background thread when these change.
+
+    The watcher marks the document indexes of the projects as watched so that
+    the mtimes of source files are only scanned again after a change.
+
+    Parameters
+    ----------
+    root_documents : List[:obj:`Document <.Document>`]
+        The root documents for the projects to watch.
+    interval : Optional[float]
+        The time (in seconds) between polls for the polling backend.
+    debounce : Optional[float]
+        The time (in seconds) to wait after a change before rebuilding so that
+        multiple changes are included in one build.
+    backend : Optional[Type[Union[:obj:`WatchdogBackend`, \
+        :obj:`PollingBackend`]]]
+        The backend class to use. By default, the :obj:`WatchdogBackend` is
+        used, if watchdog is installed, and the :obj:`PollingBackend`
+        otherwise.
+    on_build : Optional[Callable[[:obj:`Document <.Document>`, \
+        List[:obj:`TargetPath <.paths.TargetPath>`]], None]]
+        If specified, this function is called from the watcher's thread with
+        each document whose target files were changed by a build, and the
+        list of the changed target files.
+    lock : Optional[:obj:`RWLock <.utils.locks.RWLock>`]
+        The lock to hold for writing while the projects are built. Readers of
+        the documents and target files hold this lock for reading so that they
+        see the last completed build. By default, a new lock is created.
+
+    Attributes
+    ----------
+    lock : :obj:`RWLock <.utils.locks.RWLock>`
+        The lock held for writing while the projects are built.
+    builds : int
+        The number of builds run by the watcher.
+    """
+
+    def __init__(self, root_documents, interval=None, debounce=None,
+                 backend=None, on_build=None, lock=None):
+        self.root_documents = list(root_documents)
+        self.on_build = on_build
+        self.debounce = (debounce if debounce is not None else
+                         settings.preview_watch_debounce)
+        self.lock = lock if lock is not None else RWLock()
+        self.builds = 0
+
+        if backend is None:
+            backend = WatchdogBackend if Observer is not None else \
+                PollingBackend
+        self.backend = backend(callback=self.changed, interval=interval)
+
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """True if the watcher has been started."""
+        return self._thread is not None
+
+    def document_indexes(self):
+        """The document indexes for the projects."""
+        indexes = [doc.document_index for doc in self.root_documents]
+        return [index for index in indexes if index is not None]
+
+    def watched_paths(self):
+        """The directories of the source files and templates for the
+        projects.
+
+        Returns
+        -------
+        paths : Set[str]
+            The paths of the directories to watch.
+        """
+        paths = set()
+        for root_document in self.root_documents:
+            for document in root_document.documents_list(recursive=True):
+                paths.add(document.src_filepath.parent)
+                paths.update(pathlib.Path(p)
+                             for p in document.context.get('paths', []))
+        return {str(path) for path in paths if path.is_dir()}
+
+    def changed(self, paths=None):
+        """Mark the projects as changed.
+
+        Parameters
+        ----------
+        paths : Optional[List[str]]
+            The paths of the changed files.
+        """
+        logging.debug("Changed files: {}".format(paths))
+        for index in self.document_indexes():
+            index.clear_mtimes()
+        self._dirty.set()
+
+    def build(self):
+        """Build the projects.
+
+        Errors are logged, and the previously built target files are kept.
+        """
+        with self.lock.write():
+            for root_document in self.root_documents:
+                try:
+                    build_documents(root_document, callback=self.on_build)
+                except Exception:
+                    logging.exception("The build of '{}' "
+                                      "failed.".format(root_document))
+            self.builds += 1
+
+            # Sub-documents may have been added or removed
+            self.backend.schedule(self.watched_paths())
+
+    def _run(self):
+        while True:
+            self._dirty.wait()
+            if self._stop.is_set():
+                break
+
+            # Wait for further changes before building
+            if self._stop.wait(self.debounce):
+                break
+            self._dirty.clear()
+            self.build()
+
+    def start(self):
+        """Start watching the projects."""
+        if self.running:
+            return
+        for index in self.document_indexes():
+            index.watched = True
+
+        self._stop.clear()
+        self.backend.schedule(self.watched_paths())
+        self.backend.start()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='disseminate-watcher')
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching the projects."""
+        if not self.running:
+            return
+        self.backend.stop()
+        self._stop.set()
+        self._dirty.set()
+        self._thread.join()
+        self._thread = None
+
+        for index in self.document_indexes():
+            index.watched = False
+            index.clear_mtimes()
@@ -14,7 +14,17 @@ document_extension = '.dm'
 document_src_directory = 'src'
 
 #: Maximum file size
-document_max_size = 204800  # 200kB
+document_max_size = 33554432  # 32MB
+
+#: Source documents with a file size greater than this size are memory-mapped
+#: and decoded directly from the mapped file, rather than read into a buffer
+#: first.
+document_mmap_size = 65536  # 64kB
+
+#: The time (in seconds) that a scan of the modification times of source files
+#: is reused. With a value of 0, a scan is only reused within a single load of
+#: a document tree.
+document_mtime_ttl = 0.
 
 #: If True, directories for target files will be created, if they not already
 #: exist
@@ -26,6 +36,14 @@ create_dirs = True
 #: default port on the localhost to listen for http requests
 default_port = 8899
 
+#: The time (in seconds) between polls of the source files for changes, if
+#: watchdog is not installed
+preview_watch_interval = 0.5
+
+#: The time (in seconds) to wait after a source file changes before rebuilding
+#: the project
+preview_watch_debounce = 0.1
+
 #: A list of extensions that will be sent with the 'text/plain' MIME type
 text_extensions = ['.tex', ]
 
@@ -48,6 +66,12 @@ tag_prefix = r'@'
 #: Maximum depth of tag trees
 tag_max_depth = 30
 
+#: If True, the tags for context entries are created in batch mode. The tag
+#: trees are parsed first, and the remaining processing stages are run once
+#: over all of the created tags. The labels of the tags are created once the
+#: tag trees are processed. (see tags.TagFactory.batch)
+tag_batch_mode = True
+
 # If True, converted files will be updated only when they're changed. Otherwise
 # converted files will always be updated
 convert_cache = True
@@ -55,6 +79,15 @@ convert_cache = True
 #: The location in the target_root to store temporary cached files
 cache_path = '.cache'
 
+#: If True, the labels of documents are stored in a cache file in the
+#: cache_path. When a project is loaded again, the labels of unchanged
+#: documents are restored from this file, and the creation of their tags is
+#: deferred until they're rendered.
+label_cache = True
+
+#: The filename of the label cache file in the cache_path
+label_cache_filename = 'labels.json'
+
 #: The default location for media (image, css, js) files.
 media_path = 'media'
 
@@ -79,6 +112,9 @@ context_max_depth = 6
 #: Maximum file size for context header files
 context_max_size = 8192  # 8kB
 
+#: The maximum number of parsed headers (and context.txt files) to cache
+context_header_cache_size = 512
+
 default_context = {
     # Set the disseminate version
     'version': __version__,
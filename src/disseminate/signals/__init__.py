@@ -1,4 +1,6 @@
 from .signals import Signal, signal
+from .profiler import SignalProfiler, profiler
 from .exceptions import DuplicateSignal
 
-__all__ = ('Signal', 'signal', 'DuplicateSignal')
+__all__ = ('Signal', 'signal', 'SignalProfiler', 'profiler',
+           'DuplicateSignal')
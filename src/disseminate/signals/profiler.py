@@ -0,0 +1,181 @@
+"""
+A profiler for the receivers of signals.
+"""
+import time
+import threading
+
+
+class ProfileRecord(object):
+    """The timing statistics for a receiver of a signal.
+
+    Attributes
+    ----------
+    signal : str
+        The name of the signal.
+    receiver : str
+        The name of the receiver.
+    order : int
+        The order of the receiver in the signal.
+    count : int
+        The number of times the receiver was called.
+    cumulative : float
+        The total time (in seconds) spent in the receiver, including the time
+        spent in receivers of signals emitted by this receiver.
+    self_time : float
+        The total time (in seconds) spent in the receiver, excluding the time
+        spent in receivers of signals emitted by this receiver.
+    """
+
+    __slots__ = ('signal', 'receiver', 'order', 'count', 'cumulative',
+                 'self_time')
+
+    def __init__(self, signal, receiver, order):
+        self.signal = signal
+        self.receiver = receiver
+        self.order = order
+        self.count = 0
+        self.cumulative = 0.0
+        self.self_time = 0.0
+
+    def __repr__(self):
+        return ("ProfileRecord({}:{}, order={}, count={}, cumulative={:.6f}s, "
+                "self={:.6f}s)".format(self.signal, self.receiver, self.order,
+                                       self.count, self.cumulative,
+                                       self.self_time))
+
+    @property
+    def key(self):
+        """The (signal, receiver, order) key for the record."""
+        return self.signal, self.receiver, self.order
+
+
+class SignalProfiler(object):
+    """Collect the call counts and timings of signal receivers.
+
+    The profiler is disabled by default, and it has negligible overhead when
+    disabled.
+
+    Attributes
+    ----------
+    enabled : bool
+        If True, receiver calls are profiled.
+    records : Dict[Tuple[str, str, int], :obj:`ProfileRecord`]
+        The profile records keyed by (signal, receiver, order).
+
+    Examples
+    --------
+    >>> profiler = SignalProfiler()
+    >>> profiler.enable()
+    >>> def receiver():
+    ...     return 1
+    >>> profiler.call('test', 'receiver', 100, receiver, {})
+    1
+    >>> record = profiler.records[('test', 'receiver', 100)]
+    >>> record.count
+    1
+    >>> record.self_time <= record.cumulative
+    True
+    """
+
+    enabled = False
+    records = None
+
+    def __init__(self):
+        self.records = dict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, clear=True):
+        """Start profiling receivers.
+
+        Parameters
+        ----------
+        clear : Optional[bool]
+            If True (default), clear the previously collected records.
+        """
+        if clear:
+            self.clear()
+        self.enabled = True
+
+    def disable(self):
+        """Stop profiling receivers."""
+        self.enabled = False
+
+    def clear(self):
+        """Clear the collected records."""
+        with self._lock:
+            self.records.clear()
+
+    def call(self, signal, receiver_name, order, receiver, kwargs):
+        """Call a receiver and record its timing.
+
+        Parameters
+        ----------
+        signal : str
+            The name of the signal.
+        receiver_name : str
+            The name of the receiver.
+        order : int
+            The order of the receiver in the signal.
+        receiver : Callable
+            The receiver function to call.
+        kwargs : dict
+            The keyword arguments for the receiver.
+
+        Returns
+        -------
+        return_value
+            The value returned by the receiver.
+        """
+        # The stack holds the time spent in child receivers for each receiver
+        # currently running in this thread.
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return receiver(**kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            child_time = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+
+            key = (signal, receiver_name, order)
+            with self._lock:
+                record = self.records.get(key)
+                if record is None:
+                    record = ProfileRecord(signal, receiver_name, order)
+                    self.records[key] = record
+                record.count += 1
+                record.cumulative += elapsed
+                record.self_time += elapsed - child_time
+
+    def stats(self, signal=None, sort='cumulative'):
+        """Return the profile records.
+
+        Parameters
+        ----------
+        signal : Optional[str]
+            If specified, only return the records for the signal with the
+            given name.
+        sort : Optional[str]
+            The record attribute to sort the records by, in descending order.
+            ex: 'cumulative', 'self_time', 'count'
+
+        Returns
+        -------
+        records : List[:obj:`ProfileRecord`]
+            The list of profile records.
+        """
+        with self._lock:
+            records = list(self.records.values())
+        if signal is not None:
+            records = [r for r in records if r.signal == signal]
+        return sorted(records, key=lambda r: getattr(r, sort), reverse=True)
+
+
+#: The global profiler for signals
+profiler = SignalProfiler()
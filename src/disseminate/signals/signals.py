@@ -1,6 +1,53 @@
 import weakref
 
 from .exceptions import DuplicateSignal
+from .profiler import profiler
+from ..utils.trace import tracer
+
+
+class ReceiverDict(dict):
+    """A dict of receivers that notifies its signal when it is changed.
+
+    Parameters
+    ----------
+    on_change : Callable
+        A function (with no arguments) to call when the dict is changed.
+    """
+
+    def __init__(self, on_change):
+        super().__init__()
+        self.on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.on_change()
+
+    def clear(self):
+        super().clear()
+        self.on_change()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.on_change()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.on_change()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.on_change()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.on_change()
 
 
 class Signal(object):
@@ -18,12 +65,20 @@ class Signal(object):
     name = None
     receivers = None
 
+    #: A cached tuple of sorted (order, receiver, weak, name) tuples. This is
+    #: rebuilt when the receivers are changed or a weakref receiver dies.
+    _sorted_receivers = None
+
     def __init__(self, name, doc=None):
         self.name = name
         if doc is not None:
             self.__doc__ = doc
 
-        self.receivers = dict()
+        self.receivers = ReceiverDict(on_change=self._clear_cache)
+
+    def _clear_cache(self, *args):
+        """Clear the cached sorted receivers."""
+        self._sorted_receivers = None
 
     def connect(self, receiver, order, weak=True):
         """Connect a receiver to this signal.
@@ -42,7 +97,10 @@ class Signal(object):
                    "signal")
 
             raise DuplicateSignal(msg.format(self.receivers[order], order))
-        self.receivers[order] = (weakref.ref(receiver) if weak else receiver)
+
+        # The cache is cleared if the weakref receiver dies
+        self.receivers[order] = (weakref.ref(receiver, self._clear_cache)
+                                 if weak else receiver)
 
     def connect_via(self, order, weak=True):
         """The decorator for connect"""
@@ -51,24 +109,91 @@ class Signal(object):
             return fn
         return decorator
 
+    def sorted_receivers(self):
+        """The receivers sorted by order.
+
+        Returns
+        -------
+        sorted_receivers : Tuple[Tuple[int, Callable, bool, str]]
+            A tuple of (order, receiver, weak, name) tuples for each live
+            receiver. If weak is True, the receiver is a weakref that should be
+            de-referenced before use.
+        """
+        sorted_receivers = self._sorted_receivers
+
+        if sorted_receivers is None:
+            sorted_receivers = []
+            for order, receiver in sorted(self.receivers.items()):
+                weak = isinstance(receiver, weakref.ref)
+                func = receiver() if weak else receiver
+                if func is None:  # skip dead receivers
+                    continue
+                name = getattr(func, '__name__', repr(func))
+                sorted_receivers.append((order, receiver, weak, name))
+
+            sorted_receivers = tuple(sorted_receivers)
+            self._sorted_receivers = sorted_receivers
+
+        return sorted_receivers
+
     def emit(self, **kwargs):
         """Emit (send) the signal and run the receiver functions."""
+        sorted_receivers = self._sorted_receivers
+        if sorted_receivers is None:
+            sorted_receivers = self.sorted_receivers()
+        if not sorted_receivers:
+            return []
+
+        instrumented = tracer.enabled or profiler.enabled
         return_values = []
-        for order, receiver in sorted(self.receivers.items()):
+        for order, receiver, weak, name in sorted_receivers:
             # De-reference receiver, if needed
-            receiver = (receiver() if isinstance(receiver, weakref.ref) else
-                        receiver)
-            if receiver is not None:
-                return_values.append(receiver(**kwargs))
-            else:
+            if weak:
+                receiver = receiver()
+
+            if receiver is None:
                 return_values.append(None)
+            elif instrumented:
+                return_values.append(self.call_receiver(order, name,
+                                                        receiver, kwargs))
+            else:
+                return_values.append(receiver(**kwargs))
         return return_values
 
+    def call_receiver(self, order, name, receiver, kwargs, **trace_args):
+        """Call a receiver with tracing and profiling, if enabled.
+
+        Parameters
+        ----------
+        order : int
+            The order of the receiver.
+        name : str
+            The name of the receiver.
+        receiver : Callable
+            The (de-referenced) receiver function.
+        kwargs : dict
+            The keyword arguments for the receiver.
+        **trace_args
+            Additional arguments to store with the trace event.
+        """
+        with tracer.span(self.name + ':' + name, cat='signal', order=order,
+                         **trace_args):
+            if profiler.enabled:
+                return profiler.call(self.name, name, order, receiver, kwargs)
+            return receiver(**kwargs)
+
+    def profile_stats(self, sort='cumulative'):
+        """Return the profile records for this signal's receivers.
+
+        See :meth:`SignalProfiler.stats
+        <.signals.profiler.SignalProfiler.stats>`.
+        """
+        return profiler.stats(signal=self.name, sort=sort)
+
     def receivers_dict(self):
         """Return a dict of receivers (values) and their orders (keys)."""
-        d = {order: rec() if isinstance(rec, weakref.ref) else rec
-             for order, rec in self.receivers.items()}
-        return {k: v for k, v in d.items() if v is not None}
+        return {order: receiver() if weak else receiver
+                for order, receiver, weak, name in self.sorted_receivers()}
 
     def reset(self):
         """Reset the signal to its initial state"""
@@ -96,6 +221,32 @@ class Namespace(dict):
         except KeyError:
             return self.setdefault(name, Signal(name, doc))
 
+    @staticmethod
+    def enable_profiling(clear=True):
+        """Profile the call counts and timings of receivers for all
+        signals.
+
+        Parameters
+        ----------
+        clear : Optional[bool]
+            If True (default), clear the previously collected records.
+        """
+        profiler.enable(clear=clear)
+
+    @staticmethod
+    def disable_profiling():
+        """Stop profiling the receivers of signals."""
+        profiler.disable()
+
+    @staticmethod
+    def profile_stats(signal=None, sort='cumulative'):
+        """Return the profile records for receivers.
+
+        See :meth:`SignalProfiler.stats
+        <.signals.profiler.SignalProfiler.stats>`.
+        """
+        return profiler.stats(signal=signal, sort=sort)
+
 
 signals = Namespace()
 signal = signals.signal
@@ -1,7 +1,10 @@
 """
 The Label tag to reference captions and other labels.
 """
+import regex
+
 from .tag import Tag
+from .signals import batch_state
 from .utils import content_to_str
 from .exceptions import assert_content_str
 from .utils import format_content
@@ -9,6 +12,51 @@ from ..attributes import Attributes
 from ..formats import xhtml_tag
 from ..utils.string import titlelize, slugify
 from ..utils.classes import weakattr
+from .. import settings
+
+#: Characters in a formatted label string that are processed by the
+#: tag_created receivers: tags and macros, typography and paragraphs.
+re_label_processing = regex.compile(regex.escape(settings.tag_prefix) +
+                                    r"|['\"\n\u2013\u2014]|--")
+
+
+def label_content(label_string, name, context):
+    """Process a formatted label string into content.
+
+    Label strings that don't need processing are returned as is, without
+    creating a tag. The processed contents of the other label strings are
+    cached for each document and version of the registered labels.
+
+    Parameters
+    ----------
+    label_string : str
+        The formatted label string. ex: 'Fig. 1' or '@b{Fig. 1}'
+    name : str
+        The name of the tag used to process the label string.
+    context : :obj:`DocumentContext <.DocumentContext>`
+        The context for the tags.
+
+    Returns
+    -------
+    content : Union[str, List[Union[str, :obj:`Tag <.Tag>`]], \
+        :obj:`Tag <.Tag>`]
+        The processed content.
+    """
+    if re_label_processing.search(label_string) is None:
+        return label_string
+
+    label_manager = context.get('label_manager', None)
+    cache = (label_manager.versioned('label_contents', dict)
+             if label_manager is not None else dict())
+    key = (label_string, name, context.get('doc_id', None))
+
+    content = cache.get(key)
+    if content is None:
+        processed_tag = Tag(name=name, content=label_string, attributes='',
+                            context=context)
+        content = processed_tag.content
+        cache[key] = content
+    return content
 
 
 def generate_label_id(tag):
@@ -87,7 +135,6 @@ def create_label(tag, kind, label_id=None):
         The label_id of the created label, if successful.
         None if a label could not be created.
     """
-    content = tag.content
     context = tag.context
 
     assert 'label_manager' in context, ("A label manager could not be found "
@@ -101,16 +148,14 @@ def create_label(tag, kind, label_id=None):
     attributes = (Attributes(attributes) if isinstance(attributes, str) else
                   attributes)
 
-    # Form a title from the content
-    if 'short' in attributes:
-        content = attributes['short']
-    else:
-        content = titlelize(content_to_str(content))
+    # Form a title from the content. The titles of tags are formatted from
+    # their content when they're first used.
+    title = attributes['short'] if 'short' in attributes else tag
 
     # Create the content label
     label_manager = context['label_manager']
     label_manager.add_content_label(id=label_id, kind=kind,
-                                    title=content, context=context)
+                                    title=title, context=context)
     return label_id
 
 
@@ -160,7 +205,18 @@ class LabelMixin(object):
         return tuple()
 
     def create_label(self):
-        """Create the label in the label_manager for this tag."""
+        """Create the label in the label_manager for this tag.
+
+        In batch mode, the label is created once the tag trees are processed,
+        so that the label id is generated from the processed content, like in
+        the default mode. (See :meth:`TagFactory.batch
+        <disseminate.tags.TagFactory.batch>`)
+        """
+        callbacks = getattr(batch_state, 'callbacks', None)
+        if callbacks is not None:
+            callbacks.append(self.create_label)
+            return
+
         # Create the label. First,
         label_id = self.generate_label_id()
         kind = self.generate_label_kind()
@@ -264,9 +320,8 @@ class LabelTag(Tag):
 
         if all(i is not None for i in (label_manager, label_id, context)):
             format_str = label_manager.format_string(id=self.label_id)
-            processed_tag = Tag(name='label', content=format_str,
-                                attributes='', context=context)
-            return content_to_str(processed_tag.content)
+            content = label_content(format_str, name='label', context=context)
+            return content_to_str(content)
         else:
             return ''
 
@@ -281,9 +336,8 @@ class LabelTag(Tag):
                                                      target='.tex')
 
             # Process the tags and format the contents for tex
-            processed_tag = Tag(name='label', content=format_str,
-                                attributes='', context=context)
-            content = format_content(content=processed_tag.content,
+            content = label_content(format_str, name='label', context=context)
+            content = format_content(content=content,
                                      format_func='tex_fmt', level=level + 1,
                                      mathmode=mathmode)
             return ''.join(content) if isinstance(content, list) else content
@@ -305,9 +359,8 @@ class LabelTag(Tag):
 
             # Process the tags and format the contents for html (html_fmt) or
             # xhtml (xhtml_fmt)
-            processed_tag = Tag(name='label', content=format_str,
-                                attributes='', context=context)
-            content = format_content(content=processed_tag.content,
+            content = label_content(format_str, name='label', context=context)
+            content = format_content(content=content,
                                      format_func=format_func, level=level + 1)
 
             attributes = (self.attributes.copy()
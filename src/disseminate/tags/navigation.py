@@ -3,7 +3,6 @@ Navigation tags
 """
 import weakref
 from os.path import relpath
-from itertools import groupby
 
 from markupsafe import escape
 
@@ -14,6 +13,169 @@ from ..signals import signal
 
 document_tree_updated = signal('document_tree_updated')
 
+#: The navigation maps keyed by root document
+navigation_maps = weakref.WeakKeyDictionary()
+
+
+class NavigationMap(object):
+    """The previous, current and next heading labels of the documents in a
+    document tree for each target.
+
+    The map is built in a single pass over the ordered documents of the
+    document index. For each target, the documents with that target are
+    given consecutive positions, and the first heading label of each document
+    is stored in an array at its position. The previous and next labels of a
+    document are at the adjacent positions.
+
+    Parameters
+    ----------
+    rows : Tuple[Tuple[str, Tuple[str], \
+        Union[:obj:`Label <.label_manager.types.Label>`, None]]]
+        The doc_id, targets and first heading label (or None) for each
+        document, in document order.
+
+    Attributes
+    ----------
+    version : Union[Tuple[int, Tuple[str]], None]
+        The version of the registered labels and the ordered doc_ids that the
+        map was last checked against. The rows are only created again when
+        the version changes.
+    rows : Tuple[Tuple[str, Tuple[str], \
+        Union[:obj:`Label <.label_manager.types.Label>`, None]]]
+        The rows used to build the map. The map is only built again when the
+        document order, targets or heading labels change.
+    positions : Dict[str, Dict[str, int]]
+        The position of each doc_id, keyed by target.
+    labels : Dict[str, Tuple[Union[:obj:`Label \
+        <.label_manager.types.Label>`, None]]]
+        The first heading label of the document at each position, keyed by
+        target.
+    """
+
+    __slots__ = ('version', 'rows', 'positions', 'labels')
+
+    def __init__(self, rows):
+        self.version = None
+        self.rows = rows
+        self.positions = dict()
+        labels = dict()
+
+        for doc_id, targets, label in rows:
+            for target in targets:
+                target_labels = labels.setdefault(target, [])
+                positions = self.positions.setdefault(target, dict())
+                positions[doc_id] = len(target_labels)
+                target_labels.append(label)
+
+        self.labels = {target: tuple(target_labels)
+                       for target, target_labels in labels.items()}
+
+    @staticmethod
+    def document_rows(documents, label_manager):
+        """The rows of the navigation map for a list of documents.
+
+        Parameters
+        ----------
+        documents : List[:obj:`Document <.Document>`]
+            The ordered documents.
+        label_manager : :obj:`LabelManager <.label_manager.LabelManager>`
+            The label manager with the heading labels of the documents.
+
+        Returns
+        -------
+        rows : Tuple[Tuple[str, Tuple[str], \
+            Union[:obj:`Label <.label_manager.types.Label>`, None]]]
+            The doc_id, targets and first heading label (or None) for each
+            document.
+        """
+        index = label_manager.snapshot().index
+        rows = []
+        for document in documents:
+            doc_id = document.doc_id
+            headings = index.by_doc_id_kind.get((doc_id, 'heading'))
+            rows.append((doc_id, tuple(document.targets),
+                         headings[0] if headings else None))
+        return tuple(rows)
+
+    @classmethod
+    def get(cls, root_document, documents=None):
+        """The navigation map for a document tree.
+
+        The map is stored for the root document, and it's reused until the
+        document order, targets or heading labels change. The rows of the
+        documents are only created again when the version of the registered
+        labels or the document order changes.
+
+        Parameters
+        ----------
+        root_document : :obj:`Document <.Document>`
+            The root document of the document tree.
+        documents : Optional[List[:obj:`Document <.Document>`]]
+            The ordered documents of the document tree, if available.
+
+        Returns
+        -------
+        navigation_map : :obj:`NavigationMap`
+            The navigation map for the document tree.
+        """
+        if documents is None:
+            documents = root_document.documents_list(only_subdocuments=False,
+                                                     recursive=True)
+        label_manager = root_document.context['label_manager']
+        version = (label_manager.snapshot().version,
+                   tuple(document.doc_id for document in documents))
+
+        navigation_map = navigation_maps.get(root_document)
+        if navigation_map is not None and navigation_map.version == version:
+            return navigation_map
+
+        rows = cls.document_rows(documents=documents,
+                                 label_manager=label_manager)
+        if navigation_map is None or not navigation_map.matches(rows):
+            navigation_map = cls(rows)
+            navigation_maps[root_document] = navigation_map
+        navigation_map.version = version
+        return navigation_map
+
+    def matches(self, rows):
+        """Return True if the map was built from the given rows.
+
+        The labels are compared by identity, since labels that are registered
+        again are new label objects.
+        """
+        return (len(self.rows) == len(rows) and
+                all(r1[:2] == r2[:2] and r1[2] is r2[2]
+                    for r1, r2 in zip(self.rows, rows)))
+
+    def links(self, doc_id, target):
+        """The previous, current and next heading labels for a document.
+
+        Parameters
+        ----------
+        doc_id : str
+            The doc_id of the document.
+        target : str
+            The target. ex: '.html'
+
+        Returns
+        -------
+        links : List[Tuple[str, Union[:obj:`Label \
+            <.label_manager.types.Label>`, None]]]
+            The 'prev', 'curr' and 'next' names and their labels. The label
+            is None if it couldn't be found.
+        """
+        position = self.positions.get(target, dict()).get(doc_id)
+        labels = self.labels.get(target, ())
+
+        links = []
+        for name, rel in (('prev', - 1), ('curr', 0), ('next', 1)):
+            # Don't use back-tracking indexes
+            rel_position = position + rel if position is not None else -1
+            label = (labels[rel_position]
+                     if 0 <= rel_position < len(labels) else None)
+            links.append((name, label))
+        return links
+
 
 @document_tree_updated.connect_via(order=10000)
 def set_navigation_labels(root_document):
@@ -22,60 +184,28 @@ def set_navigation_labels(root_document):
     root_context = root_document.context
     assert root_context.is_valid('label_manager')
 
-    # Get doc_ids by target
-    doc_ids_by_target = dict()
     documents = root_document.documents_list(only_subdocuments=False,
                                              recursive=True)
-    for document in documents:
-        targets = document.targets
-        doc_id = document.doc_id
-
-        for target in targets:
-            lst = doc_ids_by_target.setdefault(target, [])
-            lst.append(doc_id)
-
-    # Get all of the document labels
-    label_manager = root_context.get('label_manager')
-    labels = label_manager.get_labels_by_kind(kinds='heading')
-    labels_by_doc_id = {doc_id: next(group) for doc_id, group in
-                        groupby(labels, lambda l: l.doc_id)}
+    navigation_map = NavigationMap.get(root_document, documents=documents)
 
     # Set the prev_labels and next_labels entries in the context of each
     # document
-    for target in targets:
-        if target not in doc_ids_by_target:
-            continue
-        doc_ids = doc_ids_by_target[target]
-
-        for document in documents:
-            doc_id = document.doc_id
-
-            # Find this document's doc_id in the doc_ids_by_target
-            try:
-                position = doc_ids.index(doc_id)
-            except ValueError:
-                position = None
-
-            # See if the prev, next, curr links are avalaiable
-            for name, rel in (('prev', - 1), ('curr', 0), ('next', 1)):
+    for document in documents:
+        context = document.context
+        doc_id = document.doc_id
 
-                # Don't use back-tracking indexes
-                rel_position = position + rel if position is not None else None
-                rel_position = (None if rel_position is None or
-                                rel_position < 0 else rel_position)
+        for target in navigation_map.labels:
+            links = navigation_map.links(doc_id=doc_id, target=target)
+            for name, label in links:
                 key = "_".join((name, target.strip('.')))
-                try:
-                    other_doc_id = doc_ids[rel_position]
-                    other_label = labels_by_doc_id[other_doc_id]
-                    document.context[key] = weakref.ref(other_label)
-                except (IndexError, KeyError, TypeError):
-                    # If the other document could not be found, make sure this
-                    # entry isn't in the context. This can happen if the
+                if label is not None:
+                    context[key] = weakref.ref(label)
+                elif key in context:
+                    # If the other document could not be found, make sure
+                    # this entry isn't in the context. This can happen if the
                     # context contains stale information from a previous
                     # invocation of this function.
-
-                    if key in document.context:
-                        del document.context[key]
+                    del context[key]
 
 
 class Next(Ref):
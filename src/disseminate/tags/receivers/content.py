@@ -77,27 +77,26 @@ def parse_tags(content, context, tag_factory, level=1):
         msg = "Tag content in an unknown format. The tag contents are: {}"
         raise TagError(msg.format(content))
 
-    # The following only processes text
+    # The following only processes text. The text is scanned from the
+    # current position onward, and only the spans for strings and tag
+    # contents are copied from the text.
     text = content
 
     # The parser starts at the start of the text string
     position = 0
 
     # find open tags
-    match_tag = re_open_tag.search(text[position:])
+    match_tag = re_open_tag.search(text, position)
 
     # Process the tag
     while match_tag:
-        # Add the text up to this tag the match start/end are relative to the
-        # truncated text[position:] string, so the match start position has
-        # to be offset when referencing the full 'text' string
-        match_tag_start = position + match_tag.start()
-        sofar = text[position:match_tag_start]  # the string up to this point
+        # Add the text up to this tag
+        sofar = text[position:match_tag.start()]  # the string up to this point
         if sofar:  # only add the sofar string if it isn't an empty string
             new_content.append(sofar)
 
         # Push up the position to the end of the tag match
-        position += match_tag.end()
+        position = match_tag.end()
         start_position = position
 
         # Parse the tag contexts
@@ -108,7 +107,7 @@ def parse_tags(content, context, tag_factory, level=1):
         # Find open and close braces and advance the position
         # up until the match closing brace is found
         brace_level = 1 if d['open'] is not None else 0
-        match = re_brace.search(text[position:])
+        match = re_brace.search(text, position)
         while match and 0 < brace_level < 10:
             # Increment or decrement the match
             if match.group() == '}':
@@ -116,10 +115,10 @@ def parse_tags(content, context, tag_factory, level=1):
             elif match.group() == '{':
                 brace_level += 1
 
-            position += match.end()
+            position = match.end()
 
             # Get the next match
-            match = re_brace.search(text[position:])
+            match = re_brace.search(text, position)
 
         # Raise an error if the brace wasn't closed
         if brace_level > 0:
@@ -145,7 +144,7 @@ def parse_tags(content, context, tag_factory, level=1):
         new_content.append(tag)
 
         # Find the next tag
-        match_tag = re_open_tag.search(text[position:])
+        match_tag = re_open_tag.search(text, position)
 
     # Add the remainer
     remainder = text[position:]
@@ -3,7 +3,7 @@ Receivers for processing a tag's paragraphs on tag creation.
 """
 import regex
 
-from ..signals import tag_created
+from ..signals import tag_created, tag_tree_created
 
 
 @tag_created.connect_via(order=400)
@@ -18,6 +18,24 @@ def process_paragraphs(tag, tag_factory, tag_base_cls, **kwargs):
     return tag
 
 
+@tag_tree_created.connect_via(order=400)
+def process_tree_paragraphs(tags, tag_factory, tag_base_cls, **kwargs):
+    """A receiver to parse the paragraphs of tags created in batch mode.
+
+    The paragraph tags created by this receiver are appended to the tags list,
+    and these are also checked.
+    """
+    count = 0
+    while count < len(tags):
+        tag = tags[count]
+        count += 1
+
+        if getattr(tag, 'process_paragraphs', True):
+            process_paragraphs(tag=tag, tag_factory=tag_factory,
+                               tag_base_cls=tag_base_cls)
+    return tags
+
+
 re_para = regex.compile(r'(?:\s*\n\s*\n\s*\n*)')
 
 
@@ -3,7 +3,7 @@ Receivers for processing a tag's typography.
 """
 import regex
 
-from ..signals import tag_created
+from ..signals import tag_created, tag_tree_created
 
 
 @tag_created.connect_via(order=300)
@@ -12,6 +12,20 @@ def process_typography(tag, tag_base_cls, **kwargs):
     return process_tag_typography(tag=tag, tag_base_cls=tag_base_cls)
 
 
+@tag_tree_created.connect_via(order=300)
+def process_tree_typography(tags, tag_base_cls, **kwargs):
+    """A receiver to parse the typography of tags created in batch mode.
+
+    Each tag is visited once, and only the strings it directly contains are
+    processed, since its sub-tags are also in the tags list.
+    """
+    for tag in tags:
+        if getattr(tag, 'process_typography', True):
+            tag.content = process_string_typography(tag.content,
+                                                    tag_base_cls=tag_base_cls)
+    return tags
+
+
 re_endash = regex.compile(r"[\s\u00a0]*(--|\u2013)[\s\u00a0]*")
 re_emdash = regex.compile(r"[\s\u00a0]*(---|\u2014)[\s\u00a0]*")
 re_apostrophe = regex.compile(r"(?<=\w)'(?=\w)")
@@ -43,14 +57,7 @@ def process_tag_typography(tag, tag_base_cls, level=1):
     """
     if isinstance(tag, str):
         # Process the tag if it's simply a string
-        tag = re_emdash.sub('\u2014', tag)
-        tag = re_endash.sub('\u2013', tag)
-        tag = re_apostrophe.sub('’', tag)
-        tag = re_single_start.sub('‘', tag)
-        tag = re_single_end.sub('’', tag)
-        tag = re_double_start.sub('“', tag)
-        tag = re_double_end.sub('”', tag)
-        return tag
+        return typography(tag)
 
     elif (isinstance(tag, tag_base_cls) and
           getattr(tag, 'process_typography', False)):
@@ -68,3 +75,46 @@ def process_tag_typography(tag, tag_base_cls, level=1):
                                         level=level + 1)
 
     return tag
+
+
+def process_string_typography(content, tag_base_cls):
+    """Process the typography for the strings in a tag's content without
+    processing the content of sub-tags.
+
+    Parameters
+    ----------
+    content : Union[str, list, :obj:`Tag <.Tag>`]
+        A string, a tag or a list of strings, tags and lists.
+    tag_base_cls : :class:`Tag <.Tag>`
+        The base class for Tag objects.
+
+    Returns
+    -------
+    content : Union[str, list, :obj:`Tag <.Tag>`]
+        The content with the typography of strings processed.
+    """
+    if isinstance(content, str):
+        return typography(content)
+    elif isinstance(content, list):
+        for i, element in enumerate(content):
+            content[i] = process_string_typography(element,
+                                                   tag_base_cls=tag_base_cls)
+    return content
+
+
+def typography(string):
+    """Replace the dashes and quotes in a string with typographic characters.
+
+    Examples
+    --------
+    >>> typography("It's a 'small' test -- a dash")
+    'It’s a ‘small’ test–a dash'
+    """
+    string = re_emdash.sub('\u2014', string)
+    string = re_endash.sub('\u2013', string)
+    string = re_apostrophe.sub('’', string)
+    string = re_single_start.sub('‘', string)
+    string = re_single_end.sub('’', string)
+    string = re_double_start.sub('“', string)
+    string = re_double_end.sub('”', string)
+    return string
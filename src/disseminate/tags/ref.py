@@ -1,25 +1,36 @@
 """
 The Ref tag to reference captions and other labels.
 """
+from copy import deepcopy
+
 from .tag import Tag
+from .label import label_content
 from .exceptions import assert_content_str
 from .utils import content_to_str, format_content
 from ..label_manager.types import DocumentLabel
+from ..label_manager.label_index import RefResolution
 from ..signals import signal
 from ..formats import xhtml_tag, tex_cmd
 
 
 ref_label_dependencies = signal("ref_label_dependencies")
+document_onload = signal("document_onload")
+document_load_deferred = signal("document_load_deferred")
 
 
-@ref_label_dependencies.connect_via(order=1000)
-def add_ref_labels(builder, **kwargs):
-    """Find and add the labels associated with Ref tags for all tags in
-    the context.
-    """
-    context = builder.context
+def find_ref_label_ids(context):
+    """Find the label ids of the Ref tags for all tags in the context.
+
+    Parameters
+    ----------
+    context : :obj:`DocumentContext <.DocumentContext>`
+        The context with tags to search.
 
-    # Find tags in the context and get the ref tag labels
+    Returns
+    -------
+    ref_label_ids : Set[str]
+        The label ids of the Ref tags.
+    """
     ref_label_ids = set()
     for tag in filter(lambda t: isinstance(t, Tag), context.values()):
         # Flatten the tag tree
@@ -31,14 +42,71 @@ def add_ref_labels(builder, **kwargs):
 
     # Remove None entries
     ref_label_ids.discard(None)
+    return ref_label_ids
+
+
+@document_onload.connect_via(order=10100)
+@document_load_deferred.connect_via(order=1100)
+def record_ref_label_ids(context, document=None, **kwargs):
+    """Record the label ids of Ref tags in the context's 'ref_label_ids'
+    entry once the context's tags are created.
+
+    The entry is removed when the context is reset for a document reload.
+    Documents with deferred tags have the entry restored from the label
+    cache instead.
+    """
+    if document is not None and document.deferred is not None:
+        return context
+    context['ref_label_ids'] = find_ref_label_ids(context)
+    return context
 
-    # Retrieve the labels
+
+@ref_label_dependencies.connect_via(order=1000)
+def add_ref_labels(builder, **kwargs):
+    """Find and add the labels associated with Ref tags in the context.
+
+    The label ids are read from the 'ref_label_ids' entry recorded when the
+    document was loaded, if available, and the labels are cached in the
+    context's 'ref_labels' entry for each version of the registered labels
+    and set of label ids.
+    """
+    context = builder.context
+    ref_label_ids = context.get('ref_label_ids', None)
+    if ref_label_ids is None:
+        ref_label_ids = find_ref_label_ids(context)
     label_man = context.get('label_manager')
-    if label_man is not None and ref_label_ids:
-        return sorted(label_man.get_labels_by_id(ids=ref_label_ids))
-    else:
+
+    if label_man is None or not ref_label_ids:
         return []
 
+    # See if the labels have been cached for this version of the registered
+    # labels and label ids
+    key = (label_man.snapshot().version, frozenset(ref_label_ids))
+    cached = context.get('ref_labels', None)
+
+    if cached is None or cached[0] != key:
+        labels = sorted(label_man.get_labels_by_id(ids=ref_label_ids))
+        cached = (key, labels)
+        context['ref_labels'] = cached
+    return list(cached[1])
+
+
+def link_settings(context):
+    """The context settings that change the url paths of links.
+
+    Parameters
+    ----------
+    context : :obj:`DocumentContext <.DocumentContext>`
+        The context with the settings.
+
+    Returns
+    -------
+    settings : Tuple[bool, Union[str, None]]
+        The 'relative_links' and 'base_url' settings.
+    """
+    return (context.get('relative_links', True),
+            context.get('base_url', None))
+
 
 class RefError(Exception):
     """A reference to a document could not be found."""
@@ -67,6 +135,13 @@ class Ref(Tag):
     doc_id = None
     label_id = None
 
+    #: The url targets for format targets, if different. ex: tex documents
+    #: link to compiled pdf documents.
+    url_targets = {'.tex': '.pdf'}
+
+    #: The label format string targets for format targets, if different.
+    format_targets = {'.xhtml': '.html'}
+
     def __init__(self, name, content, *args, **kwargs):
         assert_content_str(content)
 
@@ -85,6 +160,127 @@ class Ref(Tag):
         else:
             return None
 
+    def resolve(self, target=None, label=None):
+        """Resolve the label, document, url and label format string for this
+        tag.
+
+        Resolutions are stored in the reference table of the label manager
+        (:meth:`LabelManager.ref_table \
+        <.label_manager.LabelManager.ref_table>`) so that they're only
+        evaluated once for each version of the registered labels.
+
+        Parameters
+        ----------
+        target : Optional[str]
+            The target format. ex: '.html', '.xhtml' or '.tex'.
+            If None, the url is not resolved.
+        label : Optional[:obj:`Label <.label_manager.types.Label>`]
+            If specified, resolve the reference to this label instead of the
+            label for the tag's label id.
+
+        Returns
+        -------
+        resolution : Union[:obj:`RefResolution \
+            <.label_manager.label_index.RefResolution>`, None]
+            The resolved reference, or None if a label manager or label id
+            isn't available.
+        """
+        label_manager = self.context.get('label_manager')
+        if label_manager is None or (label is None and self.label_id is None):
+            return None
+
+        table = label_manager.ref_table()
+        label_key = (self.label_id if label is None else
+                     (label.doc_id, label.id))
+        key = (self.context.get('doc_id', None), label_key, target,
+               link_settings(self.context))
+        resolution = table.get(key)
+
+        if resolution is None:
+            label = label or label_manager.get_label(id=self.label_id)
+            cache = {'label': label}
+
+            # Find the url path and document. The document is cached by url
+            # for labels owned by other documents.
+            document, url = None, None
+            if target is not None:
+                url = self.url(target=self.url_targets.get(target, target),
+                               include_anchor=False, cache=cache)
+                document = cache.get('document', None)
+            if document is None and label.doc_id == key[0]:
+                document = self.context.document
+
+            # Find the label format string
+            keys = ('ref', *label.kind)
+            format_str = label_manager.format_string(
+                label.id, *keys,
+                target=self.format_targets.get(target, target))
+
+            resolution = RefResolution(label=label, document=document,
+                                       url=url, format_str=format_str)
+            table[key] = resolution
+        return resolution
+
+    def fragment(self, key, render, label=None):
+        """Retrieve a rendered fragment of this tag from the reference table
+        of the label manager, or render it.
+
+        Parameters
+        ----------
+        key : tuple
+            The key for the format of the fragment.
+        render : Callable[[], Union[str, :obj:`lxml.etree.Element`]]
+            The function to render the fragment.
+        label : Optional[:obj:`Label <.label_manager.types.Label>`]
+            If specified, the fragment references this label instead of the
+            label for the tag's label id.
+
+        Returns
+        -------
+        fragment : Union[str, :obj:`lxml.etree.Element`]
+            The rendered fragment. Elements are copied so that they can be
+            added to other elements.
+        """
+        label_manager = self.context.get('label_manager')
+        if label_manager is None:
+            return render()
+
+        fragments = label_manager.ref_table().fragments
+        label_key = (self.label_id if label is None else
+                     (label.doc_id, label.id))
+        key = (self.context.get('doc_id', None), label_key,
+               tuple((k, str(v)) for k, v in self.attributes.items()),
+               link_settings(self.context)) + key
+
+        fragment = fragments.get(key)
+        if fragment is None:
+            fragment = render()
+            fragments[key] = fragment
+        return fragment if isinstance(fragment, str) else deepcopy(fragment)
+
+    @staticmethod
+    def resolved_url(resolution, include_anchor=True):
+        """The url path for a resolved reference.
+
+        Parameters
+        ----------
+        resolution : :obj:`RefResolution \
+            <.label_manager.label_index.RefResolution>`
+            The resolved reference.
+        include_anchor : Optional[bool]
+            If True (default), the html link anchor will be appended to the
+            url path.
+
+        Returns
+        -------
+        url_path : Union[str, None]
+            The url path, or None if the url couldn't be resolved.
+        """
+        url = resolution.url
+        if url is None or not include_anchor:
+            return url
+        return url + '#' + resolution.label.id
+
     def document(self, cache=None):
         """The document that owns the label referenced by this tag.
 
@@ -94,6 +290,7 @@ class Ref(Tag):
             If specified, the cache values will be used instead of being
             evaluated. Possibilities:
             - 'label': :obj:`.types.Label`
+            - 'document': :obj:`document.Document`
             - 'documents_by_id': Dict[str, :obj:`document.Document`]
 
         Returns
@@ -105,6 +302,8 @@ class Ref(Tag):
         """
         assert self.context.is_valid('root_document')
         cache = dict() if cache is None else cache
+        if 'document' in cache:
+            return cache['document']
         label = cache.setdefault('label', self.label)
         documents_by_id = cache.get('documents_by_id', None)
 
@@ -132,10 +331,9 @@ class Ref(Tag):
         else:
             docs_by_doc_ids = documents_by_id
 
-        if other_doc_id in docs_by_doc_ids:
-            return docs_by_doc_ids[other_doc_id]
-        else:
-            return None
+        document = docs_by_doc_ids.get(other_doc_id, None)
+        cache['document'] = document
+        return document
 
     def url(self, target='.html', include_anchor=True, cache=None):
         """The url path for the document referenced by the label for this tag.
@@ -152,6 +350,7 @@ class Ref(Tag):
             If specified, the cache values will be used instead of being
             evaluated. Possibilities:
             - 'label': :obj:`.types.Label`
+            - 'document': :obj:`document.Document`
             - 'documents_by_id': Dict[str, :obj:`document.Document`]
 
         Returns
@@ -207,9 +406,9 @@ class Ref(Tag):
             It can either be a string or an attributes dict.
         cache : Optional[dict]
             If specified, the cache values will be used instead of being
-            evaluated. Possibilities:
+            evaluated. References are resolved and cached by :meth:`resolve`.
+            Possibilities:
             - 'label': :obj:`.types.Label`
-            - 'documents_by_id': Dict[str, :obj:`document.Document`]
 
         Returns
         -------
@@ -217,19 +416,15 @@ class Ref(Tag):
             A text string with the tags stripped.
         """
         # Get the label tag format
-        label_manager = self.context.get('label_manager')
         context = self.context
-        cache = dict() if cache is None else cache
-        label = cache.setdefault('label', self.label)
-
-        if all(i is not None for i in (label_manager, label, context)):
-            # Format the format string keys for a ref
-            keys = ('ref', *label.kinds)
-            format_str = label_manager.format_string(id=self.label.id, *keys)
-
-            processed_tag = Tag(name='ref', content=format_str, attributes='',
-                                context=context)
-            return content_to_str(processed_tag.content)
+        label = cache.get('label') if cache else None
+        resolution = self.resolve(label=label)
+
+        if resolution is not None:
+            # Process the format string for a ref
+            processed_content = label_content(resolution.format_str,
+                                              name='ref', context=context)
+            return content_to_str(processed_content)
         else:
             return ''
 
@@ -253,9 +448,9 @@ class Ref(Tag):
             latex text mode is assumed.
         cache : Optional[dict]
             If specified, the cache values will be used instead of being
-            evaluated. Possibilities:
+            evaluated. References are resolved and cached by :meth:`resolve`.
+            Possibilities:
             - 'label': :obj:`.types.Label`
-            - 'documents_by_id': Dict[str, :obj:`document.Document`]
         level : Optional[int]
             The level of the tag.
 
@@ -264,32 +459,28 @@ class Ref(Tag):
         tex_string : str
             The formatted tex string.
         """
-        label_manager = self.context.get('label_manager')
-        context = self.context
-        cache = dict() if cache is None else cache
-        label = cache.setdefault('label', self.label)
-
-        if all(i is not None for i in (label_manager, label, context)):
-            # Retrieve the format string for the reference
-            keys = ('ref', *label.kind)
-            format_str = label_manager.format_string(label.id, *keys,
-                                                     target='.tex')
-
-            # process the tags and format the contents
-            # for html
-            processed_tag = Tag(name='ref', content=format_str, attributes='',
-                                context=context)
-            content = format_content(content=processed_tag.content,
+        label = cache.get('label') if cache else None
+
+        # The rendered references are cached for each version of the labels
+        def render():
+            resolution = self.resolve(target='.tex', label=label)
+            if resolution is None:
+                return ''
+
+            # process the tags in the format string for the reference and
+            # format the contents
+            processed_content = label_content(resolution.format_str,
+                                              name='ref', context=self.context)
+            content = format_content(content=processed_content,
                                      format_func='tex_fmt', level=level + 1)
 
             # setup a url path and include the anchor if the label is not
             # for a DocumentLabel. DocumentLabels should just point to the
             # file itself.
             # Tex formats will only work with pdf links
-            include_anchor = not isinstance(label, DocumentLabel)
+            include_anchor = not isinstance(resolution.label, DocumentLabel)
 
-            url = self.url(target='.pdf', include_anchor=include_anchor,
-                           cache=cache)
+            url = self.resolved_url(resolution, include_anchor=include_anchor)
 
             # Add a target-specific attribute to the url so that it's
             # properly parsed for the '.tex' target
@@ -299,8 +490,8 @@ class Ref(Tag):
             # just return a regular text string
             return (tex_cmd('href', attributes=url, formatted_content=content)
                     if url else content)
-        else:
-            return ''
+
+        return self.fragment(('tex_fmt', level), render, label=label)
 
     def html_fmt(self, content=None, attributes=None, cache=None,
                  format_func='html_fmt', method='html', level=1, **kwargs):
@@ -317,10 +508,9 @@ class Ref(Tag):
             It can either be a string or an attributes dict.
         cache : Optional[dict]
             If specified, the cache values will be used instead of being
-            evaluated. Possibilities:
+            evaluated. References are resolved and cached by :meth:`resolve`.
+            Possibilities:
             - 'label': :obj:`.types.Label`
-            - 'documents_by_id': Dict[str, :obj:`document.Document`]
-            - 'format_str': str
         format_func : Optional[str]
             The tag format function to use in rendering the reference tag.
             (ex: 'html_fmt' or 'xhtml_fmt')
@@ -334,24 +524,22 @@ class Ref(Tag):
         html : str or html element
             A string in HTML format or an HTML element (:obj:`lxml.builder.E`).
         """
-        label_manager = self.context.get('label_manager')
-        cache = dict() if cache is None else cache
-        label = cache.setdefault('label', self.label)
-        context = self.context
+        label = cache.get('label') if cache else None
+        target = method if method.startswith('.') else '.' + method
 
-        if all(i is not None for i in (label_manager, label, context)):
-
-            # Retrieve the format string for the reference
-            # Use the 'html' format_str for html and xhtml
-            keys = ('ref', *label.kind)
-            format_str = label_manager.format_string(label.id, *keys,
-                                                     target='.html')
+        # The rendered references are cached for each version of the labels,
+        # unless alternative attributes are given
+        def render():
+            resolution = self.resolve(target=target, label=label)
+            if resolution is None:
+                return ''
 
             # substitute the link, process the tags and format the contents
-            # for html (html_fmt) or xhtml (xhtml_fmt)
-            processed_tag = Tag(name='ref', content=format_str, attributes='',
-                                context=context)
-            content = format_content(content=processed_tag.content,
+            # for html (html_fmt) or xhtml (xhtml_fmt). The 'html' format_str
+            # is used for html and xhtml
+            processed_content = label_content(resolution.format_str,
+                                              name='ref', context=self.context)
+            content = format_content(content=processed_content,
                                      format_func=format_func, level=level + 1)
 
             attrs = (self.attributes.copy() if attributes is None else
@@ -361,13 +549,16 @@ class Ref(Tag):
             # setup the url path and include the anchor if the label is not
             # for a DocumentLabel. DocumentLabels should just point to the
             # file itself.
-            include_anchor = not isinstance(label, DocumentLabel)
-            attrs['href'] = self.url(target=method, cache=cache,
-                                     include_anchor=include_anchor)
+            include_anchor = not isinstance(resolution.label, DocumentLabel)
+            attrs['href'] = self.resolved_url(resolution,
+                                              include_anchor=include_anchor)
 
             # wrap content in 'a' tag
             return xhtml_tag('a', attributes=attrs, formatted_content=content,
                              level=level, method=method,
                              pretty_print=False)  # no line breaks
-        else:
-            return ''
+
+        if attributes is not None:
+            return render()
+        return self.fragment((format_func, method, level), render,
+                             label=label)
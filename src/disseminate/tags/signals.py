@@ -1,34 +1,91 @@
 """
 Tag event signals
 """
-import weakref
+import threading
 from types import MethodType
 
 from ..signals import signal
+from ..signals.profiler import profiler
+from ..utils.trace import tracer
 
 tag_created = signal('tag_created', doc=("A signal emitted when a tag is "
                                          "created. Receivers take a tag "
                                          "parameter."))
 
+tag_tree_created = signal('tag_tree_created',
+                          doc=("A signal emitted after tags are created in "
+                               "batch mode. Receivers take a list of tags "
+                               "and process them in a single pass. In batch "
+                               "mode, the tag_created receivers with the same "
+                               "order are deferred to these receivers."))
+
+#: The state of batch mode for the current thread. The 'tags' attribute is a
+#: list of tags created in batch mode, or None if batch mode isn't active. The
+#: 'callbacks' attribute is a list of functions that are called once the
+#: tag_tree_created receivers are run, outside of batch mode.
+batch_state = threading.local()
+
+
+#: A cache of the (sorted receivers, deferred orders) for the tag_tree_created
+#: signal.
+_deferred_orders = [None, frozenset()]
+
+
+def deferred_orders():
+    """The orders of tag_created receivers deferred in batch mode.
+
+    Returns
+    -------
+    orders : FrozenSet[int]
+        The orders of receivers connected to the tag_tree_created signal.
+    """
+    sorted_receivers = tag_tree_created.sorted_receivers()
+    if _deferred_orders[0] is not sorted_receivers:
+        _deferred_orders[:] = [sorted_receivers,
+                               frozenset(r[0] for r in sorted_receivers)]
+    return _deferred_orders[1]
+
 
 def emit(self, tag, **kwargs):
     """A custom emitter that checks which receivers to run based on attributes
-    in the tag object."""
+    in the tag object.
+
+    In batch mode, the tag is added to the batch's list of tags, and receivers
+    deferred to the tag_tree_created signal are skipped.
+    """
+    sorted_receivers = self._sorted_receivers
+    if sorted_receivers is None:
+        sorted_receivers = self.sorted_receivers()
+
+    batch = getattr(batch_state, 'tags', None)
+    if batch is not None:
+        batch.append(tag)
+        deferred = deferred_orders()
+    else:
+        deferred = ()
+
+    instrumented = tracer.enabled or profiler.enabled
     return_values = []
-    for order, receiver in sorted(self.receivers.items()):
+    for order, receiver, weak, name in sorted_receivers:
         # De-reference receiver, if needed
-        receiver = (receiver() if isinstance(receiver, weakref.ref) else
-                    receiver)
+        if weak:
+            receiver = receiver()
 
         # Only run the receiver if it exists and the tag doesn't have
         # an attribute with the receiver's name as False.
         # ex: tag.process_content = False
         #     will not run the 'process_content' receiver
-        if (receiver is not None and
-           getattr(tag, receiver.__name__, True)):  # here is the difference
-            return_values.append(receiver(tag=tag, **kwargs))
-        else:
+        if (receiver is None or
+           not getattr(tag, name, True) or  # here is the difference
+           order in deferred):
             return_values.append(None)
+        elif instrumented:
+            receiver_kwargs = dict(kwargs, tag=tag)
+            return_values.append(self.call_receiver(order, name, receiver,
+                                                    receiver_kwargs,
+                                                    tag=tag.name))
+        else:
+            return_values.append(receiver(tag=tag, **kwargs))
     return return_values
 
 
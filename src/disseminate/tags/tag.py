@@ -1,16 +1,18 @@
 """
 Core classes and functions for tags.
 """
+from contextlib import contextmanager
+
 from .exceptions import TagError
-from .signals import tag_created
+from .signals import tag_created, tag_tree_created, batch_state
 from ..formats import tex_env, tex_cmd, xhtml_tag
 from ..attributes import Attributes
 from .utils import format_content, replace_context, copy_tag
 from ..utils.string import titlelize
-from ..utils.classes import weakattr, all_subclasses
+from ..utils.classes import weakattr, all_subclasses, RegisteredClass
 
 
-class Tag(object):
+class Tag(RegisteredClass):
     """A tag to format text in the markup document.
 
     Parameters
@@ -142,7 +144,7 @@ class Tag(object):
         short_attr = self.attributes.get('short', None)
         return short_attr if short_attr is not None else self.title
 
-    def copy(self, new_context=None):
+    def copy(self, new_context=None, shallow=False):
         """Create a copy of this tag and all sub-tabs.
 
         The tag copy is a deep copy of the attributes and content, but the
@@ -153,12 +155,17 @@ class Tag(object):
         ----------
         new_context : Optional[:obj:`Type[BaseContext] <.context.BaseContext>`]
             The new context to replace, if specified.
+        shallow : Optional[bool]
+            If True, the content is shared with this tag, and the new_context
+            is only set for the copied tag.
         """
         # Copy the tag
-        cp = copy_tag(tag=self)
+        cp = copy_tag(tag=self, shallow=shallow)
 
         # Set the new context
-        if new_context is not None:
+        if new_context is not None and shallow:
+            cp.context = new_context
+        elif new_context is not None:
             replace_context(tag=cp, new_context=new_context)
         return cp
 
@@ -392,6 +399,48 @@ class TagFactory(object):
                       attributes=tag_attributes, context=context)
         return tag
 
+    @classmethod
+    @contextmanager
+    def batch(cls):
+        """A context manager to create tags in batch mode.
+
+        In batch mode, tags created in the 'with' block only run the
+        tag_created receivers that build the tag tree, like the parsing of
+        content. The remaining tag_created receivers are deferred, and their
+        tag_tree_created counterparts are run once over all of the created
+        tags when the 'with' block exits. Nested batches join the outer
+        batch.
+
+        Functions added to the batch's callbacks, like the creation of
+        labels, are called after the tag_tree_created receivers, once batch
+        mode is exited.
+
+        Yields
+        ------
+        tags : List[:obj:`Tag <disseminate.tags.Tag>`]
+            The list of tags created in batch mode.
+        """
+        tags = getattr(batch_state, 'tags', None)
+        if tags is not None:
+            yield tags
+            return
+
+        tags = batch_state.tags = []
+        callbacks = batch_state.callbacks = []
+        try:
+            yield tags
+
+            # Run the deferred receivers over all of the tags
+            tag_tree_created.emit(tags=tags, tag_base_cls=Tag,
+                                  tag_factory=cls)
+        finally:
+            batch_state.tags = None
+            batch_state.callbacks = None
+
+        # Run the callbacks for the processed tags
+        for callback in callbacks:
+            callback()
+
     @classmethod
     def tag_class(cls, tag_name, context):
         """Retrieve the tag class for the given tag_name"""
@@ -1,8 +1,10 @@
 """
 Formatting of Table of Contents for documents
 """
+from copy import deepcopy
+
 from .headings import toc_levels as heading_toc_levels, Heading
-from .ref import Ref
+from .ref import Ref, link_settings
 from .tag import Tag
 from . import exceptions
 from ..formats import xhtml_tag, xhtml_list
@@ -25,6 +27,9 @@ class TocRef(Ref):
 
     html_name = "li"
 
+    #: The label referenced by the tag
+    toc_label = None
+
     def tex_fmt(self, content=None, attributes=None, mathmode=False,
                 cache=None, level=1, **kwargs):
         list_level = self.attributes['level']
@@ -110,6 +115,28 @@ class Toc(Tag):
             self.header_tag = Heading(name='TOC', content='Table of Contents',
                                       attributes='nolabel', context=context)
 
+    @property
+    def toc_model(self):
+        """The project's :obj:`TocModel` for the current version of the
+        labels."""
+        assert self.context.is_valid('label_manager')
+        return TocModel.get(self.context['label_manager'])
+
+    @property
+    def entries(self):
+        """The (label, level) entries for this TOC.
+
+        Returns
+        -------
+        entries : List[Tuple[:obj:`.label_manager.types.Label`, int]]
+            The labels referenced by this TOC and their list levels.
+        """
+        label_manager = self.context['label_manager']
+        entries = self.toc_model.get_entries(label_manager=label_manager,
+                                             toc_kind=self.toc_kind,
+                                             doc_id=self.context.get('doc_id'))
+        return list(entries)
+
     def get_labels(self):
         """Get the labels, ordering function and labeling type.
 
@@ -118,107 +145,208 @@ class Toc(Tag):
         labels : List[:obj:`.label_manager.types.Label`]
             The labels referenced by this TOC.
         """
-        assert self.context.is_valid('label_manager')
-
-        # If 'all' is specified in the toc_kind, then all documents should be
-        # selected. This is done by having a doc_id of None with the
-        # 'get_labels_by_kind' method of the label manager. If 'all' is not
-        # specified, then use this document's doc_id. This will return labels
-        # only for this document and its context from the 'get_labels_by_kind'
-        # method of the label manager.
-        context = self.context
-        doc_id = context.get('doc_id') if 'all' not in self.toc_kind else None
-        label_manager = self.context['label_manager']
-
-        labels = []
-        if 'heading' in self.toc_kind or 'headings' in self.toc_kind:
-            labels += label_manager.get_labels_by_kind(doc_id=doc_id,
-                                                       kinds='heading')
-        if 'document' in self.toc_kind or 'documents' in self.toc_kind:
-            labels += label_manager.get_labels_by_kind(doc_id=doc_id,
-                                                       kinds='document')
-
-        # Now filter apply additional filters
-        doc_id = context.get('doc_id')
-        if 'abbreviated' in self.toc_kind:
-            current_doc_id = None
-            filtered_labels = []
-
-            for label in labels:
-                if label.doc_id == doc_id:
-                    # This is a label for the current document keep it
-                    filtered_labels.append(label)
-                elif label.doc_id != current_doc_id:
-                    # This is a label for a different document. Only keep it
-                    # if it's the first label for this other document
-                    filtered_labels.append(label)
-                current_doc_id = label.doc_id
-
-            # Transfer the filtered list
-            labels.clear()
-            labels += filtered_labels
-
-        return labels
+        return [label for label, level in self.entries]
 
     @property
     def reference_tags(self):
         """This tag's TocRef tag items.
-        """
-        labels = self.get_labels()
-
-        # Collect the created tags.
-        tags = []
-
-        # Got through the labels and keep track of the levels
-        current_level = 1
-        for label in labels:
-            # Get the level for the label
-            if label.kind[-1] in heading_toc_levels:
-                level = heading_toc_levels.index(label.kind[-1])
-            else:
-                level = current_level
-            current_level = level
-
-            # Create the tag and add it to the tags list
-            tag_name = 'toc-' + label.kind[-1]
-            tag = TocRef(name=tag_name, content=label.id,
-                         attributes=self.attributes, context=self.context)
-            tag.attributes['level'] = level
 
-            tags.append(tag)
+        The tags are created once for each version of the labels.
+        """
+        model = self.toc_model
+        if self._ref_tags is None or self._ref_tags[0] is not model:
+            # Create the tags from the entries
+            tags = []
+            for label, level in self.entries:
+                tag_name = 'toc-' + label.kind[-1]
+                tag = TocRef(name=tag_name, content=label.id,
+                             attributes=self.attributes, context=self.context)
+                tag.attributes['level'] = level
+                tag.toc_label = label
+                tags.append(tag)
+            self._ref_tags = (model, tags)
+
+        return list(self._ref_tags[1])
+
+    def fragment(self, key, render):
+        """Retrieve a rendered fragment of this TOC from the TOC model, or
+        render it.
+
+        Parameters
+        ----------
+        key : tuple
+            The key for the format of the fragment.
+        render : Callable[[], Union[str, :obj:`lxml.etree.Element`]]
+            The function to render the fragment.
 
-        return tags
+        Returns
+        -------
+        fragment : Union[str, :obj:`lxml.etree.Element`]
+            The rendered fragment. Elements are copied so that they can be
+            added to other elements.
+        """
+        fragments = self.toc_model.fragments
+        toc_kind = self.toc_kind
+        key = (self.context.get('doc_id'),
+               toc_kind if isinstance(toc_kind, str) else tuple(toc_kind),
+               tuple((k, str(v)) for k, v in self.attributes.items()),
+               link_settings(self.context)) + key
+
+        fragment = fragments.get(key)
+        if fragment is None:
+            fragment = render()
+            fragments[key] = fragment
+        return fragment if isinstance(fragment, str) else deepcopy(fragment)
 
     def tex_fmt(self, content=None, attributes=None, mathmode=False, level=1,
                 **kwargs):
-        tags = list(self.reference_tags)
-        tags[0:0] = "\\ListProperties(Hide=2)\n"  # Add to front
-        return super().tex_fmt(content=tags, attributes=self.list_style)
+        def render():
+            tags = list(self.reference_tags)
+            tags[0:0] = "\\ListProperties(Hide=2)\n"  # Add to front
+            return super(Toc, self).tex_fmt(content=tags,
+                                            attributes=self.list_style)
+        return self.fragment(('tex_fmt',), render)
 
     def html_fmt(self, content=None, attributes=None, cache=None,
                  format_func='html_fmt', method='html', level=1, **kwargs):
-        tags = self.reference_tags
-        elements = []
+        def render():
+            elements = []
+            for tag in self.reference_tags:
+                listlevel = tag.attributes['level']
+                func = getattr(tag, format_func)
+                tag_html = func(cache={'label': tag.toc_label}, method=method,
+                                level=level + 1)
+                elements.append((listlevel, tag_html))
+
+            return xhtml_list(*elements, attributes='class="toc"',
+                              listtype=self.html_name, method=method,
+                              level=level)
+        return self.fragment((format_func, method, level), render)
+
+
+class TocModel(object):
+    """The table of contents for a version of the registered labels of a
+    project.
+
+    The model is shared by the Toc tags of a project, and it's created again
+    when the labels are registered again. (See :meth:`LabelManager.versioned
+    <.label_manager.LabelManager.versioned>`)
+
+    Attributes
+    ----------
+    entries : Dict[tuple, List[Tuple[:obj:`.label_manager.types.Label`, int]]]
+        The (label, level) entries keyed by the TOC kind and doc_id. The
+        entries that list all documents are shared by all documents, unless
+        they're abbreviated.
+    fragments : Dict[tuple, Union[str, :obj:`lxml.etree.Element`]]
+        The rendered TOCs keyed by the doc_id, TOC kind, attributes, link
+        settings and format.
+    """
 
-        root_document = self.context.root_document
-        documents_by_id = (root_document.documents_by_id(recursive=True)
-                           if root_document is not None else None)
+    __slots__ = ('entries', 'fragments')
 
-        # Get the labels
-        labels = self.get_labels()
-        labels_by_id = {label.id: label for label in labels}
+    def __init__(self):
+        self.entries = dict()
+        self.fragments = dict()
 
-        for tag in tags:
-            listlevel = tag.attributes['level']
-            label = labels_by_id.get(tag.label_id, None)
+    @classmethod
+    def get(cls, label_manager):
+        """The TOC model for the current version of the labels of a label
+        manager."""
+        return label_manager.versioned('toc_model', cls)
 
-            cache = dict() if cache is None else cache
-            cache['label'] = label
-            cache['documents_by_id'] = documents_by_id
+    def get_entries(self, label_manager, toc_kind, doc_id):
+        """Get the (label, level) entries for a TOC.
 
-            func = getattr(tag, format_func)
-            tag_html = func(cache=cache, method=method, level=level + 1)
-            elements.append((listlevel, tag_html))
+        Parameters
+        ----------
+        label_manager : :obj:`LabelManager <.label_manager.LabelManager>`
+            The label manager with the labels.
+        toc_kind : Union[str, List[str]]
+            The kind of the TOC. ex: ['all', 'headings', 'collapsed']
+        doc_id : Union[str, None]
+            The doc_id of the document with the TOC.
 
-        return xhtml_list(*elements, attributes='class="toc"',
-                          listtype=self.html_name, method=method, level=level)
+        Returns
+        -------
+        entries : List[Tuple[:obj:`.label_manager.types.Label`, int]]
+            The labels referenced by the TOC and their list levels.
+        """
+        all_docs = 'all' in toc_kind and 'abbreviated' not in toc_kind
+        key = (toc_kind if isinstance(toc_kind, str) else tuple(toc_kind),
+               None if all_docs else doc_id)
+
+        entries = self.entries.get(key)
+        if entries is None:
+            labels = toc_labels(label_manager=label_manager,
+                                toc_kind=toc_kind, doc_id=doc_id)
+
+            # Go through the labels and keep track of the levels
+            entries = []
+            current_level = 1
+            for label in labels:
+                # Get the level for the label
+                if label.kind[-1] in heading_toc_levels:
+                    level = heading_toc_levels.index(label.kind[-1])
+                else:
+                    level = current_level
+                current_level = level
+                entries.append((label, level))
+
+            self.entries[key] = entries
+        return entries
+
+
+def toc_labels(label_manager, toc_kind, doc_id):
+    """Get the labels for a TOC.
+
+    Parameters
+    ----------
+    label_manager : :obj:`LabelManager <.label_manager.LabelManager>`
+        The label manager with the labels.
+    toc_kind : Union[str, List[str]]
+        The kind of the TOC. ex: ['all', 'headings', 'collapsed']
+    doc_id : Union[str, None]
+        The doc_id of the document with the TOC.
+
+    Returns
+    -------
+    labels : List[:obj:`.label_manager.types.Label`]
+        The labels referenced by the TOC.
+    """
+    # If 'all' is specified in the toc_kind, then all documents should be
+    # selected. This is done by having a doc_id of None with the
+    # 'get_labels_by_kind' method of the label manager. If 'all' is not
+    # specified, then use this document's doc_id. This will return labels
+    # only for this document and its context from the 'get_labels_by_kind'
+    # method of the label manager.
+    kinds_doc_id = doc_id if 'all' not in toc_kind else None
+
+    labels = []
+    if 'heading' in toc_kind or 'headings' in toc_kind:
+        labels += label_manager.get_labels_by_kind(doc_id=kinds_doc_id,
+                                                   kinds='heading')
+    if 'document' in toc_kind or 'documents' in toc_kind:
+        labels += label_manager.get_labels_by_kind(doc_id=kinds_doc_id,
+                                                   kinds='document')
+
+    # Now filter apply additional filters
+    if 'abbreviated' in toc_kind:
+        current_doc_id = None
+        filtered_labels = []
+
+        for label in labels:
+            if label.doc_id == doc_id:
+                # This is a label for the current document keep it
+                filtered_labels.append(label)
+            elif label.doc_id != current_doc_id:
+                # This is a label for a different document. Only keep it
+                # if it's the first label for this other document
+                filtered_labels.append(label)
+            current_doc_id = label.doc_id
+
+        # Transfer the filtered list
+        labels.clear()
+        labels += filtered_labels
+
+    return labels
@@ -105,7 +105,7 @@ def replace_context(tag, new_context):
         tag.context = new_context
 
 
-def copy_tag(tag):
+def copy_tag(tag, shallow=False):
     """Create a copy of the given tag.
 
     The tag, attributes and content are deep copies, and the context points to
@@ -115,6 +115,9 @@ def copy_tag(tag):
     ----------
     tag : Union[str, list :obj:`Tag <disseminate.tags.core.Tag>`]
         The tag to copy.
+    shallow : Optional[bool]
+        If True, the content is not copied, and it's shared with the given
+        tag.
 
     Returns
     -------
@@ -141,7 +144,8 @@ def copy_tag(tag):
             setattr(tag_copy, field, value.copy())
 
     # Copy its content
-    tag_copy.content = copy_tag(tag_copy.content)
+    if not shallow:
+        tag_copy.content = copy_tag(tag_copy.content)
 
     return tag_copy
 
@@ -0,0 +1,46 @@
+/*
+ * Live-reload client for the disseminate preview server.
+ *
+ * The client listens for 'rebuilt' events and swaps in the new page when
+ * the target file for the current page was rebuilt.
+ */
+(function () {
+  "use strict";
+
+  var protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  var url = protocol + "//" + window.location.host + "/livereload";
+  var retryDelay = 1000;  // ms
+
+  function swapPage() {
+    var scrollY = window.scrollY;
+    fetch(window.location.pathname, {cache: "no-store"})
+      .then(function (response) {
+        if (!response.ok) { throw new Error(response.statusText); }
+        return response.text();
+      })
+      .then(function (html) {
+        var doc = new DOMParser().parseFromString(html, "text/html");
+        document.title = doc.title;
+        document.body.replaceWith(doc.body);
+        window.scrollTo(0, scrollY);
+      })
+      .catch(function () { window.location.reload(); });
+  }
+
+  function connect() {
+    var socket = new WebSocket(url);
+
+    socket.onmessage = function (event) {
+      var message = JSON.parse(event.data);
+      if (message.event === "rebuilt" &&
+          message.targets.indexOf(window.location.pathname) !== -1) {
+        swapPage();
+      }
+    };
+
+    // Reconnect if the server is restarted
+    socket.onclose = function () { setTimeout(connect, retryDelay); };
+  }
+
+  connect();
+})();
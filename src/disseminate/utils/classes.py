@@ -5,6 +5,109 @@ import weakref
 from itertools import chain as i_chain
 
 
+class ClassMetadata(object):
+    """A registry of cached class hierarchy metadata.
+
+    The subclasses and attribute values of class hierarchies are frequently
+    retrieved, and these are cached for classes derived from
+    :class:`RegisteredClass`. The cached values are invalidated whenever a
+    new registered class is defined.
+
+    The classes are only weakly referenced by the cache, so that classes that
+    are no longer used, like classes defined in functions, can be garbage
+    collected.
+
+    Attributes
+    ----------
+    generation : int
+        A counter incremented each time the cache is invalidated.
+    """
+
+    generation = 0
+
+    def __init__(self):
+        self._subclasses = weakref.WeakKeyDictionary()
+        self._attributes_values = weakref.WeakKeyDictionary()
+
+    def invalidate(self):
+        """Clear the cached metadata."""
+        self._subclasses.clear()
+        self._attributes_values.clear()
+        self.generation += 1
+
+    def subclasses(self, cls):
+        """The cached subclasses for the given class.
+
+        Parameters
+        ----------
+        cls : Type
+            The class object to inspect for subclasses.
+
+        Returns
+        -------
+        subclasses : Tuple[Type]
+            The subclasses, sub-subclasses and so on for the class.
+        """
+        # The subclasses are stored as weak references. These are found
+        # again if one of the subclasses was garbage collected.
+        refs = self._subclasses.get(cls)
+        subclasses = (tuple(r() for r in refs) if refs is not None else
+                      (None,))
+        if None in subclasses:
+            subclasses = tuple(_all_subclasses(cls))
+            self._subclasses[cls] = tuple(map(weakref.ref, subclasses))
+        return subclasses
+
+    def attributes_values(self, cls, attribute):
+        """The cached values of an attribute for the given class and all of
+        its parent classes.
+
+        Parameters
+        ----------
+        cls : Type
+            The class object to inspect for parent classes.
+        attribute : str
+            The attribute whose value should be retrieved from each class.
+
+        Returns
+        -------
+        values : FrozenSet
+            The set of all values for the attribute.
+        """
+        cls_values = self._attributes_values.get(cls)
+        if cls_values is None:
+            cls_values = dict()
+            self._attributes_values[cls] = cls_values
+
+        values = cls_values.get(attribute)
+        if values is None:
+            values = frozenset(_all_attributes_values(cls, attribute))
+            cls_values[attribute] = values
+        return values
+
+
+#: The registry of metadata for registered classes
+class_metadata = ClassMetadata()
+
+
+class RegisteredClass(object):
+    """A mixin for classes whose hierarchy metadata is cached.
+
+    Defining a subclass invalidates the cached metadata, so that new
+    subclasses are found by :func:`all_subclasses`.
+
+    .. note:: Class attributes that are modified after a class is defined
+              are not updated in the cached values of
+              :func:`all_attributes_values`.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        class_metadata.invalidate()
+
+
 def all_subclasses(cls):
     """Retrieve all subclasses, sub-subclasses and so on for a class
 
@@ -27,8 +130,14 @@ def all_subclasses(cls):
     [<class 'disseminate.utils.classes.B'>, \
 <class 'disseminate.utils.classes.C'>]
     """
+    if issubclass(cls, RegisteredClass):
+        return list(class_metadata.subclasses(cls))
+    return _all_subclasses(cls)
+
+
+def _all_subclasses(cls):
     return cls.__subclasses__() + [g for s in cls.__subclasses__()
-                                   for g in all_subclasses(s)]
+                                   for g in _all_subclasses(s)]
 
 
 def all_parent_classes(cls):
@@ -71,8 +180,8 @@ def all_attributes_values(cls, attribute):
 
     Returns
     -------
-    parent_attributes : list
-        The list of all parent classe attributes.
+    parent_attributes : set
+        The set of all parent classe attributes.
 
     Examples
     --------
@@ -89,6 +198,12 @@ def all_attributes_values(cls, attribute):
     >>> sorted(all_attributes_values(C, 'value2'))
     [1, 2, 3]
     """
+    if issubclass(cls, RegisteredClass):
+        return set(class_metadata.attributes_values(cls, attribute))
+    return _all_attributes_values(cls, attribute)
+
+
+def _all_attributes_values(cls, attribute):
     bases = [cls] + all_parent_classes(cls)
     return set(i_chain(*[getattr(b, attribute) for b in bases
                          if hasattr(b, attribute)]))
@@ -126,22 +241,41 @@ def all_dicts(cls):
 
 
 class weakattr(object):
-    """A descriptor to store a weakref to an object attribute"""
+    """A descriptor to store a weakref to an object attribute
+
+    Parameters
+    ----------
+    slot : Optional[str]
+        The name of the slot to store the weakref in, for classes with
+        __slots__. By default, the weakref is stored in the object's __dict__.
+    """
+
+    def __init__(self, slot=None):
+        self.slot = slot
 
     def __get__(self, obj, objtype=None):
-        weakref_dict = obj.__dict__.setdefault('__weakrefattrs__', dict())
-        attrname = self.attrname(obj)
-        value = weakref_dict.get(attrname, None)
+        if self.slot is not None:
+            value = getattr(obj, self.slot, None)
+        else:
+            weakref_dict = obj.__dict__.setdefault('__weakrefattrs__', dict())
+            attrname = self.attrname(obj)
+            value = weakref_dict.get(attrname, None)
         return value() if callable(value) else None
 
     def __set__(self, obj, value):
         if value is None:  # do nothing is a value of None is assigned
             return
+        if self.slot is not None:
+            setattr(obj, self.slot, weakref.ref(value))
+            return
         weakref_dict = obj.__dict__.setdefault('__weakrefattrs__', dict())
         attrname = self.attrname(obj)
         weakref_dict[attrname] = weakref.ref(value)
 
     def __delete__(self, obj):
+        if self.slot is not None:
+            delattr(obj, self.slot)
+            return
         weakref_dict = obj.__dict__.setdefault('__weakrefattrs__', dict())
         attrname = self.attrname(obj)
         del weakref_dict[attrname]
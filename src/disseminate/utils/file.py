@@ -2,8 +2,12 @@
 Utilities for manipulating files and paths
 """
 import os
+import mmap
+import uuid
+import locale
 import shutil
 import logging
+from contextlib import contextmanager
 
 
 def parents(path):
@@ -71,3 +75,114 @@ def link_or_copy(src, dst):
         return os.link(src, dst)
     except OSError:
         return shutil.copyfile(src, dst)
+
+
+def read_text(filepath, mmap_size=None, encoding=None):
+    """Read the text of a file.
+
+    Files larger than mmap_size are memory-mapped and decoded directly from the
+    mapped file. Unlike :meth:`pathlib.Path.read_text`, this avoids holding
+    both the raw bytes and the decoded string of a large file in memory.
+
+    Parameters
+    ----------
+    filepath : Union[str, :obj:`pathlib.Path`]
+        The path of the file to read.
+    mmap_size : Optional[int]
+        If specified, files with a size (in bytes) greater than this value are
+        memory-mapped.
+    encoding : Optional[str]
+        The encoding of the file. By default, the preferred encoding for the
+        system is used--the same as :func:`open`.
+
+    Returns
+    -------
+    text : str
+        The text of the file with universal newlines ('\\n').
+    """
+    encoding = encoding or locale.getpreferredencoding(False)
+
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if mmap_size is None or size <= mmap_size:
+            with open(f.fileno(), 'r', encoding=encoding, closefd=False) as t:
+                return t.read()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            text = str(m, encoding)
+
+    # Translate newlines, like files opened in text mode
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+@contextmanager
+def atomic_open(filepath, mode='w', encoding=None):
+    """Open a file for writing that atomically replaces the given filepath
+    once it's written.
+
+    The file is written to a temporary file in the same directory, and it
+    replaces the filepath when the context manager exits without an exception.
+    Readers of the filepath therefore find either the previous file or the
+    complete new file.
+
+    Parameters
+    ----------
+    filepath : Union[str, :obj:`pathlib.Path`]
+        The path of the file to write.
+    mode : Optional[str]
+        The mode to open the file. Either 'w' or 'wb'.
+    encoding : Optional[str]
+        The encoding for text files.
+
+    Returns
+    -------
+    f : file object
+        The file object for the temporary file.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.mkdtemp(), 'test.txt')
+    >>> with atomic_open(filepath) as f:
+    ...     _ = f.write('test')
+    ...     os.path.exists(filepath)
+    False
+    >>> open(filepath).read()
+    'test'
+    """
+    dirname, basename = os.path.split(str(filepath))
+    tmp_filepath = os.path.join(dirname, '.{}.{}.tmp'.format(basename,
+                                                             uuid.uuid4().hex))
+
+    try:
+        # The temporary file is created exclusively with the permissions of
+        # new files
+        with open(tmp_filepath, mode.replace('w', 'x'),
+                  encoding=encoding) as f:
+            yield f
+        os.replace(tmp_filepath, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_filepath)
+        except OSError:
+            pass
+        raise
+
+
+def write_text(filepath, text, encoding=None):
+    """Write the text of a file atomically.
+
+    Parameters
+    ----------
+    filepath : Union[str, :obj:`pathlib.Path`]
+        The path of the file to write.
+    text : str
+        The text to write.
+    encoding : Optional[str]
+        The encoding of the file. By default, the preferred encoding for the
+        system is used--the same as :func:`open`.
+    """
+    with atomic_open(filepath, 'w', encoding=encoding) as f:
+        f.write(text)
@@ -0,0 +1,118 @@
+"""
+Locks for sharing objects between threads.
+"""
+import threading
+from contextlib import contextmanager
+
+
+class RWLock(object):
+    """A reader/writer lock.
+
+    Multiple threads can hold the lock for reading at the same time, but only
+    one thread can hold the lock for writing. Waiting writers take precedence
+    over new readers so that writers are not starved.
+
+    The thread holding the write lock can acquire the read or write lock
+    again. A thread holding the read lock should not acquire the read lock
+    again, or acquire the write lock, since this may deadlock with a waiting
+    writer.
+
+    Examples
+    --------
+    >>> lock = RWLock()
+    >>> with lock.read():
+    ...     lock.readers
+    1
+    >>> with lock.write():
+    ...     with lock.read():  # writers can read
+    ...         lock.writing
+    True
+    >>> lock.writing
+    False
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    @property
+    def readers(self):
+        """The number of threads holding the read lock."""
+        return self._readers
+
+    @property
+    def writing(self):
+        """True if a thread holds the write lock."""
+        return self._writer is not None
+
+    def acquire_read(self, blocking=True):
+        """Acquire the lock for reading.
+
+        Unlike :meth:`read`, the lock may be released from a different thread
+        with :meth:`release_read`. The thread holding the write lock should
+        use :meth:`read` instead.
+
+        Parameters
+        ----------
+        blocking : Optional[bool]
+            If False, return immediately if the lock cannot be acquired.
+
+        Returns
+        -------
+        acquired : bool
+            True if the lock was acquired for reading.
+        """
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                if not blocking:
+                    return False
+                self._cond.wait()
+            self._readers += 1
+        return True
+
+    def release_read(self):
+        """Release the lock acquired with :meth:`acquire_read`."""
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """A context manager to hold the lock for reading."""
+        owner = self._writer == threading.get_ident()
+        if not owner:
+            self.acquire_read()
+        try:
+            yield self
+        finally:
+            if not owner:
+                self.release_read()
+
+    @contextmanager
+    def write(self):
+        """A context manager to hold the lock for writing."""
+        ident = threading.get_ident()
+        with self._cond:
+            if self._writer == ident:
+                self._writer_depth += 1
+            else:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = ident
+                self._writer_depth = 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self._writer_depth -= 1
+                if self._writer_depth == 0:
+                    self._writer = None
+                    self._cond.notify_all()
@@ -496,39 +496,7 @@ def replace_macros(s, *dicts):
     """
     # Replace the values
     def _substitute(m):
-        # Get the string for the match
-        # ex: macro = '@friend.name'
-        d = m.groupdict()
-        macro = d['macro']
-
-        # Split at periods
-        # ex: pieces = ['@friend', 'name']
-        pieces = macro.split('.')
-
-        # See if the first piece corresponds to an entry in kwargs
-        obj = None
-        while pieces:
-            piece = pieces.pop(0)
-
-            if obj is None and any(piece in d for d in dicts):
-                for d in dicts:
-                    if piece in d:
-                        obj = d[piece]
-                        break
-            elif hasattr(obj, piece):
-                obj = getattr(obj, piece)
-            else:
-                # Match not found. Re-add piece to the pieces list
-                pieces.insert(0, piece)
-                break
-
-        # Convert obj and the remaining pieces to a string
-        if obj is None:
-            # no match found. Return the match
-            return m.group()
-        else:
-            # match(es) found, replace with the string
-            return str(obj) + ''.join('.' + piece for piece in pieces)
+        return resolve_macro(m.group('macro'), m.group(), *dicts)
 
     # Return a string with the dicts substituted. Keep substituting until
     # all dicts are replaced or the string is no longer changing
@@ -539,3 +507,93 @@ def replace_macros(s, *dicts):
         s, num_subs = _re_macro.subn(_substitute, s)
 
     return s
+
+
+def split_macros(s):
+    """Split a string into literal strings and macros.
+
+    Parameters
+    ----------
+    s : str
+        The input string to split.
+
+    Returns
+    -------
+    segments : List[Union[str, Tuple[str, str]]]
+        The literal strings and the macros of the string, in order. Macros
+        are (macro, text) tuples of the macro name and the matched text.
+
+    Examples
+    --------
+    >>> split_macros('@b{Fig. @label.number}. ')
+    [('@b', '@b'), '{Fig. ', ('@label.number', '@label.number'), '}. ']
+    """
+    segments = []
+    position = 0
+    for m in _re_macro.finditer(s):
+        if m.start() > position:
+            segments.append(s[position:m.start()])
+        segments.append((m.group('macro'), m.group()))
+        position = m.end()
+    if position < len(s):
+        segments.append(s[position:])
+    return segments
+
+
+def resolve_macro(macro, text, *dicts):
+    """Resolve the value of a macro.
+
+    Parameters
+    ----------
+    macro : str
+        The name of the macro, including attributes separated by periods.
+        ex: '@friend.name'
+    text : str
+        The text of the macro to return if the macro isn't found.
+    *dicts : Tuple[dict]
+        One or more dicts containing variables defined for a specific document.
+        Values will be replaced with the first dict found with that value.
+
+    Returns
+    -------
+    value : str
+        The string for the macro's value, or the text if the macro wasn't
+        found.
+
+    Examples
+    --------
+    >>> resolve_macro('@name', '@name{}', {'@name': 'Bob'})
+    'Bob'
+    >>> resolve_macro('@name.missing', '@name.missing', {'@name': 'Bob'})
+    'Bob.missing'
+    >>> resolve_macro('@other', '@other{}', {'@name': 'Bob'})
+    '@other{}'
+    """
+    # Split at periods
+    # ex: pieces = ['@friend', 'name']
+    pieces = macro.split('.')
+
+    # See if the first piece corresponds to an entry in kwargs
+    obj = None
+    while pieces:
+        piece = pieces.pop(0)
+
+        if obj is None and any(piece in d for d in dicts):
+            for d in dicts:
+                if piece in d:
+                    obj = d[piece]
+                    break
+        elif hasattr(obj, piece):
+            obj = getattr(obj, piece)
+        else:
+            # Match not found. Re-add piece to the pieces list
+            pieces.insert(0, piece)
+            break
+
+    # Convert obj and the remaining pieces to a string
+    if obj is None:
+        # no match found. Return the match
+        return text
+    else:
+        # match(es) found, replace with the string
+        return str(obj) + ''.join('.' + piece for piece in pieces)
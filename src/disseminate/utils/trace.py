@@ -0,0 +1,209 @@
+"""
+Utilities for recording build traces in the Chrome trace-event format.
+
+The generated trace files can be opened in Chrome (chrome://tracing) or in
+Perfetto (https://ui.perfetto.dev). Each thread is shown on its own track.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import nullcontext
+
+
+class Span(object):
+    """A context manager that records a complete ('X') trace event for the
+    duration of the 'with' block.
+
+    Parameters
+    ----------
+    tracer : :obj:`Tracer`
+        The tracer to record the event in.
+    name : str
+        The name of the event.
+    cat : str
+        The category of the event. ex: 'signal', 'builder'
+    args : Optional[dict]
+        Additional arguments to store with the event.
+    """
+
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args=None):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.add_event(name=self.name, cat=self.cat, start=self.start,
+                              end=time.perf_counter(), args=self.args)
+        return False
+
+
+#: A span that does nothing. This is used when a tracer is disabled.
+null_span = nullcontext()
+
+
+class Tracer(object):
+    """A recorder for timed events in the Chrome trace-event format.
+
+    The tracer is disabled by default, and it has negligible overhead when
+    disabled.
+
+    Attributes
+    ----------
+    enabled : bool
+        If True, events are recorded.
+    events : List[dict]
+        The recorded (complete) trace events.
+
+    Examples
+    --------
+    >>> tracer = Tracer()
+    >>> tracer.enable()
+    >>> with tracer.span('load', cat='document', doc_id='main.dm'):
+    ...     pass
+    >>> event = tracer.events[0]
+    >>> event['name'], event['cat'], event['ph'], event['args']
+    ('load', 'document', 'X', {'doc_id': 'main.dm'})
+    >>> tracer.disable()
+    >>> with tracer.span('load', cat='document'):
+    ...     pass
+    >>> len(tracer.events)
+    1
+    """
+
+    enabled = False
+    events = None
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+        self._thread_names = dict()
+        self._start = time.perf_counter()
+
+    def enable(self):
+        """Clear previously recorded events and start recording events."""
+        self.clear()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording events."""
+        self.enabled = False
+
+    def clear(self):
+        """Clear the recorded events."""
+        with self._lock:
+            self.events.clear()
+            self._thread_names.clear()
+            self._start = time.perf_counter()
+
+    def add_event(self, name, cat, start, end, args=None):
+        """Add a complete ('X') event for the current thread.
+
+        Parameters
+        ----------
+        name : str
+            The name of the event.
+        cat : str
+            The category of the event.
+        start, end : float
+            The start and end times of the event from
+            :func:`time.perf_counter`.
+        args : Optional[dict]
+            Additional arguments to store with the event.
+        """
+        thread = threading.current_thread()
+        event = {'name': name,
+                 'cat': cat,
+                 'ph': 'X',
+                 'ts': (start - self._start) * 1e6,  # microseconds
+                 'dur': (end - start) * 1e6,
+                 'pid': os.getpid(),
+                 'tid': thread.ident}
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    def span(self, name, cat='', **args):
+        """Return a context manager to record an event for a 'with' block.
+
+        Parameters
+        ----------
+        name : str
+            The name of the event.
+        cat : Optional[str]
+            The category of the event.
+        **args
+            Additional arguments to store with the event.
+        """
+        if not self.enabled:
+            return null_span
+        return Span(tracer=self, name=name, cat=cat, args=args)
+
+    def wrap(self, func, name, cat='', **args):
+        """Wrap a function so that its execution is recorded as an event.
+
+        This is useful for functions submitted to executor pools, since the
+        event is recorded in the track of the thread that runs the function.
+
+        Parameters
+        ----------
+        func : Callable
+            The function to wrap.
+        name : str
+            The name of the event.
+        cat : Optional[str]
+            The category of the event.
+        **args
+            Additional arguments to store with the event.
+
+        Returns
+        -------
+        wrapped_func : Callable
+            The wrapped function, or the original function if the tracer
+            is disabled.
+        """
+        if not self.enabled:
+            return func
+
+        def wrapped(*func_args, **func_kwargs):
+            with Span(tracer=self, name=name, cat=cat, args=args):
+                return func(*func_args, **func_kwargs)
+        return wrapped
+
+    def trace_events(self):
+        """The list of trace events, including the thread name metadata
+        events."""
+        pid = os.getpid()
+        with self._lock:
+            metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid,
+                         'tid': tid, 'args': {'name': thread_name}}
+                        for tid, thread_name in self._thread_names.items()]
+            return metadata + list(self.events)
+
+    def save(self, filepath):
+        """Save the recorded events to a trace file.
+
+        Parameters
+        ----------
+        filepath : Union[str, :obj:`pathlib.Path`]
+            The path of the JSON file to write.
+        """
+        trace = {'traceEvents': self.trace_events(),
+                 'displayTimeUnit': 'ms'}
+        with open(filepath, 'w') as f:
+            json.dump(trace, f, default=str)
+
+
+#: The global tracer
+tracer = Tracer()
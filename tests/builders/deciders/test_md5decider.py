@@ -81,3 +81,34 @@ def test_md5decider(env):
 
     # But a the decision can still be reset
     assert not decision.build_needed(**kwargs, reset=True)
+
+
+def test_md5decider_output_hash(env, wait):
+    """Test the recorded output hashes of the md5decider"""
+    tmpdir = env.context['target_root']
+
+    infilepath = SourcePath(project_root=tmpdir, subpath='test1.txt')
+    outfilepath = TargetPath(target_root=tmpdir, subpath='out.txt')
+    infilepath.write_text('in')
+    outfilepath.write_text('out')
+    decider = Md5Decider(env=env)
+    kwargs = {'inputs': [infilepath], 'output': outfilepath}
+
+    # 1. Output hashes aren't available before a build
+    assert decider.output_hash(outfilepath) is None
+
+    # 2. A reset records the output hash
+    assert not decider.decision.build_needed(**kwargs, reset=True)
+    _, output_hash = decider.decision.calculate_hash(**kwargs)
+    assert decider.output_hash(outfilepath) == output_hash
+    assert decider.output_hash(str(outfilepath)) == output_hash
+
+    # The output hash is available from the database for new deciders
+    decider2 = Md5Decider(env=env)
+    assert decider2.output_hash(outfilepath) == output_hash
+
+    # 3. Changing the output file invalidates the output hash
+    wait()  # sleep time offset needed for different mtimes
+    outfilepath.write_text('changed')
+    assert decider.output_hash(outfilepath) is None
+    assert decider2.output_hash(outfilepath) is None
@@ -1,11 +1,14 @@
 """
 Test the 'build' subcommand from the CLI.
 """
+import json
 from pathlib import Path
 
 from click.testing import CliRunner
 
 from disseminate.cli import main
+from disseminate.builders.environment import Environment
+from disseminate.utils.trace import tracer
 
 
 # Setup the example paths
@@ -40,6 +43,75 @@ def test_cli_build_simple_document(tmpdir):
     assert target_tex.stat().st_size > 0
 
 
+def test_cli_build_trace(tmpdir):
+    """Test the CLI build subcommand with a build trace."""
+    # Setup the CLI runner and paths
+    tmpdir = Path(tmpdir)
+    runner = CliRunner()
+    trace_filepath = tmpdir / 'trace.json'
+
+    result = runner.invoke(main, ['build', '-i',
+                                  str(ex1_root / ex1_subpath),
+                                  '-o', str(tmpdir),
+                                  '--trace', str(trace_filepath)])
+
+    # Make sure the command was successfully run
+    assert result.exit_code == 0
+
+    # Check the trace events
+    trace = json.loads(trace_filepath.read_text())
+    names = {e['name'] for e in trace['traceEvents']}
+    assert 'document_onload:load_document' in names
+    assert 'JinjaRender' in names
+    assert any(name.startswith('tag_created:') for name in names)
+
+
+def test_cli_build_trace_error(tmpdir, monkeypatch):
+    """Test that the CLI build subcommand saves the trace of a failed
+    build."""
+    # Setup the CLI runner and paths
+    tmpdir = Path(tmpdir)
+    runner = CliRunner()
+    trace_filepath = tmpdir / 'trace.json'
+
+    def create_root_builder(self):
+        raise RuntimeError('build failed')
+    monkeypatch.setattr(Environment, 'create_root_builder',
+                        create_root_builder)
+
+    result = runner.invoke(main, ['build', '-i',
+                                  str(ex1_root / ex1_subpath),
+                                  '-o', str(tmpdir),
+                                  '--trace', str(trace_filepath)])
+
+    # The build failed, but the trace was saved
+    assert isinstance(result.exception, RuntimeError)
+    assert not tracer.enabled
+
+    trace = json.loads(trace_filepath.read_text())
+    names = {e['name'] for e in trace['traceEvents']}
+    assert 'document_onload:load_document' in names
+
+
+def test_cli_build_profile_signals(tmpdir):
+    """Test the CLI build subcommand with the signal profile."""
+    # Setup the CLI runner and paths
+    tmpdir = Path(tmpdir)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['build', '-i',
+                                  str(ex1_root / ex1_subpath),
+                                  '-o', str(tmpdir),
+                                  '--profile-signals'])
+
+    # Make sure the command was successfully run
+    assert result.exit_code == 0
+
+    # Check the profile table
+    assert 'Cumulative (s)' in result.output
+    assert 'document_onload' in result.output
+    assert 'process_content' in result.output
+
 # def test_cli_render_multiple_docs(tmpdir):
 #     """Test the CLI render subcommand with multiple root documents"""
 #     runner = CliRunner()
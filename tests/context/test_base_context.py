@@ -321,6 +321,55 @@ def test_base_context_mutables(context_cls):
     assert child['paths'] == [1]
 
 
+def test_base_context_copy_on_reset(context_cls):
+    """Test the copying of mutables and tags from the parent context when a
+    context is reset."""
+
+    # Setup a parent and child contexts with mutables
+    parent = context_cls(a_list=[1], a_set={1}, a_dict={'a': 1}, value=1)
+    tag = Tag(name='tag', content=[Tag(name='b', content='test',
+                                       attributes='', context=parent)],
+              attributes='', context=parent)
+    parent['tag'] = tag
+    child = context_cls(parent_context=parent)
+
+    # Immutables are shared, and mutables are copied
+    for key in ('a_list', 'a_set', 'a_dict'):
+        assert child[key] == parent[key]
+        assert child[key] is not parent[key]
+    assert child['value'] is parent['value']
+
+    # Tags refer to the child context, and their contents are shared
+    assert child['tag'] is not tag
+    assert child['tag'].context is child
+    assert child['tag'].content is tag.content
+    assert tag.context is parent
+
+    # In-place changes to entries aren't seen by the parent or other children
+    sibling = context_cls(parent_context=parent)
+    child['a_dict']['c'] = 3
+    sibling['a_list'].append(5)
+    parent['a_set'].add(6)
+    assert parent['a_dict'] == {'a': 1}
+    assert parent['a_list'] == [1]
+    assert sibling['a_dict'] == {'a': 1}
+    assert sibling['a_set'] == {1}
+    assert child['a_list'] == [1]
+    assert child['a_set'] == {1}
+
+    # Modifying an entry with match_update doesn't change the parent
+    child.match_update({'a_list': [2], 'a_set': [2], 'a_dict': {'b': 2}})
+    assert parent['a_list'] == [1]
+    assert parent['a_dict'] == {'a': 1}
+    assert child['a_list'] == [2, 1]
+    assert child['a_dict'] == {'a': 1, 'b': 2, 'c': 3}
+
+    # Resetting the child copies the parent's current values
+    child.reset()
+    assert child['a_set'] == {1, 6}
+    assert child['a_dict'] == {'a': 1}
+
+
 def test_base_context_match_update(a_in_b):
     """Tests the recursive update method for the BaseContext."""
 
@@ -1,7 +1,8 @@
 """
 Test utilities for BaseContexts.
 """
-from disseminate.context.utils import find_header_entries, load_from_string
+from disseminate.context.utils import (find_header_entries, load_from_string,
+                                       split_header, parse_header)
 
 
 def test_find_header_entries():
@@ -44,3 +45,36 @@ def test_load_from_string():
     assert context == {'name': 'Justin L Lorieau',
                        'contact': ('  address: 1,2,3 lane\n'
                                    '  phone: 333-333-4123.')}
+
+
+def test_split_header():
+    """Test the split_header function."""
+
+    # 1. Test a string with a header
+    header, rest = split_header("---\ntitle: one\n---\nbody\n---\nmore")
+    assert header == 'title: one'
+    assert rest == 'body\n---\nmore'
+
+    # 2. Test strings without a header or with unclosed headers
+    for string in ('body', 'body\n---\ntitle: one\n---\n',
+                   '---\ntitle: one\nbody'):
+        assert split_header(string) == (None, string)
+
+    # 3. The closing line should match the opening dashes
+    header, rest = split_header("----\ntitle: one\n---\n----\nbody")
+    assert header == 'title: one\n---'
+    assert rest == 'body'
+
+
+def test_parse_header():
+    """Test the parse_header function and its cache."""
+
+    header = "title: one\nauthor: two"
+    d1 = parse_header(header)
+    assert d1 == {'title': 'one', 'author': 'two'}
+
+    # Modifying the returned dict does not modify the cached dict
+    d1['title'] = 'three'
+    d2 = parse_header(header)
+    assert d2 == {'title': 'one', 'author': 'two'}
+    assert d1 is not d2
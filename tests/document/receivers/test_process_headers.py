@@ -1,9 +1,12 @@
 """
 Test the process_header processors.
 """
+import os
+import pathlib
+
 from disseminate.document.receivers.process_headers import process_headers, \
     find_template_paths, find_jinja2_parent_templates, \
-    find_additional_context_filepaths
+    find_additional_context_filepaths, TemplateIndex
 from disseminate import settings
 
 
@@ -57,6 +60,51 @@ def test_find_additional_context_filepaths():
             settings.module_template_paths[0] / 'default' / 'context.txt')
 
 
+def test_template_index(tmpdir, monkeypatch):
+    """Test the template index."""
+    tmpdir = pathlib.Path(tmpdir)
+
+    # Create a template with a context.txt file
+    template_dir = tmpdir / 'mytemplate'
+    template_dir.mkdir()
+    (template_dir / 'template.html').write_text('<html></html>')
+    (template_dir / 'media' / 'css').mkdir(parents=True)
+    context_filepath = template_dir / 'context.txt'
+    context_filepath.write_text('title: one')
+    monkeypatch.setattr(settings, 'module_template_paths', [tmpdir])
+
+    index = TemplateIndex()
+    entry = index.get('mytemplate/template')
+    assert entry.template_paths == (template_dir,)
+    assert entry.context_filepaths == (context_filepath,)
+    assert entry.context['title'] == 'one'
+
+    # The entry is cached
+    assert index.get('mytemplate/template') is entry
+
+    # Only the template directories and files and the context files are
+    # checked for changes
+    assert set(entry.mtimes) == {tmpdir, template_dir,
+                                 template_dir / 'template.html',
+                                 context_filepath}
+
+    # Changing the context.txt file invalidates the entry
+    context_filepath.write_text('title: two')
+    mtime = entry.mtimes[context_filepath]
+    os.utime(context_filepath, (mtime + 1, mtime + 1))
+
+    new_entry = index.get('mytemplate/template')
+    assert new_entry is not entry
+    assert new_entry.context['title'] == 'two'
+
+    # Adding a file to the template directory invalidates the entry
+    entry = new_entry
+    (template_dir / 'template.tex').write_text('')
+    mtime = entry.mtimes[template_dir]
+    os.utime(template_dir, (mtime + 1, mtime + 1))
+    assert index.get('mytemplate/template') is not entry
+
+
 # The process_header receiver
 
 def test_process_context_header_basic(context_cls):
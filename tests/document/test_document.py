@@ -8,6 +8,7 @@ import pytest
 from jinja2.exceptions import TemplateNotFound
 
 from disseminate.document import Document
+from disseminate.document.exceptions import DocumentException
 from disseminate.paths import SourcePath, TargetPath
 from disseminate.utils.tests import strip_leading_space
 from disseminate import settings
@@ -418,6 +419,30 @@ def test_document_macros(load_example):
     assert '<i>example</i>' in rendered_html
 
 
+def test_document_large_source(doc, monkeypatch):
+    """Test the loading of source documents larger than the memory-mapped
+    size."""
+    # Write a source document with the last tag close to the end of the
+    # file
+    paragraph = "My @b{bold} and @i{italic @b{nested}} paragraph.\n\n"
+    body = paragraph * 10000 + "The @i{last} tag."
+    doc.src_filepath.write_text("---\ntargets: html\n---\n" + body)
+    assert doc.src_filepath.stat().st_size > settings.document_mmap_size
+
+    # Load the document. The file is memory-mapped.
+    doc.load()
+    tag = doc.context['body']
+    assert tag.content[-1].content[-2].name == 'i'
+    assert tag.content[-1].content[-2].content == 'last'
+    assert tag.txt.count('bold') == 10000
+
+    # Documents larger than the maximum size are not loaded
+    monkeypatch.setattr(settings, 'document_max_size',
+                        doc.src_filepath.stat().st_size - 1)
+    with pytest.raises(DocumentException):
+        doc.load(reload=True)
+
+
 def test_document_load_on_render(doc):
     """Test the proper loading of an updated source file on render."""
 
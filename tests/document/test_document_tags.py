@@ -1,6 +1,7 @@
 """
 Test the documents with specific tags.
 """
+from disseminate import settings
 
 
 def test_document_marginfig(env):
@@ -30,3 +31,48 @@ def test_document_marginfig(env):
         assert doc.targets['.tex'].is_file()
         assert doc.targets['.html'].is_file()
         assert doc.targets['.pdf'].is_file()
+
+
+def load_batch_mode(doc, batch_mode, monkeypatch):
+    """Load the document with or without tag batch mode and return the label
+    ids and titles and the rendered body."""
+    monkeypatch.setattr(settings, 'tag_batch_mode', batch_mode)
+    doc.load(reload=True)
+
+    label_manager = doc.context['label_manager']
+    labels = label_manager.get_labels_by_kind(doc_id=doc.doc_id)
+    return ([(label.id, label.title) for label in labels],
+            doc.context['body'].html)
+
+
+def test_document_batch_mode_headings(doc, monkeypatch):
+    """Test that headings with typography are the same with and without tag
+    batch mode."""
+    doc.src_filepath.write_text("""
+    @chapter{The "first" chapter -- intro}
+    @section[short="It's -- short"]{It's "here"}
+    @toc{all headings}
+    """)
+
+    labels1, html1 = load_batch_mode(doc, False, monkeypatch)
+    labels2, html2 = load_batch_mode(doc, True, monkeypatch)
+
+    assert ('ch:test-dm-the-first-chapter-intro',
+            'The “first” chapter–intro') in labels1
+    assert labels1 == labels2
+    assert html1 == html2
+
+
+def test_document_batch_mode_captions(doc, monkeypatch):
+    """Test that captions with typography are the same with and without tag
+    batch mode."""
+    doc.src_filepath.write_text("""
+    @fig{@caption{A "quoted" caption -- here}}
+    """)
+
+    labels1, html1 = load_batch_mode(doc, False, monkeypatch)
+    labels2, html2 = load_batch_mode(doc, True, monkeypatch)
+
+    assert labels1[-1] == ('caption-a0c94ca8f6', 'A “quoted” caption–here')
+    assert labels1 == labels2
+    assert html1 == html2
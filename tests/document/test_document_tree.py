@@ -55,6 +55,93 @@ def test_documents_list(load_example):
     assert docs[0].src_filepath == src_filepath2
 
 
+def test_document_index(load_example):
+    """Test the cached views of the document index."""
+
+    # 1. Load documents from example7, which has 3 documents in a tree
+    src_filepath1 = SourcePath(project_root=ex7_root,
+                               subpath=Path("file1.dm"))
+    src_filepath2 = SourcePath(project_root=ex7_root,
+                               subpath=Path("sub1") / "file11.dm")
+    doc = load_example(src_filepath1)
+
+    # The views are cached and shared by the documents in the tree
+    docs = doc.documents_list(recursive=True)
+    assert doc.documents_list(recursive=True) is docs
+    doc2 = docs[1]
+    assert doc2.document_index is doc.document_index
+
+    # Lookups by src_filepath and doc_id
+    assert doc.documents_dict(recursive=True)[src_filepath2] is doc2
+    assert doc.documents_by_id()['sub1/file11.dm'] is doc2
+    assert doc.doc_ids == ['file1.dm', 'sub1/file11.dm',
+                           'sub1/subsub1/file111.dm']
+
+    # 2. Changing the subdocuments invalidates the views
+    doc2.subdocuments.clear()
+    assert doc.documents_list(recursive=True) is not docs
+    assert len(doc.documents_list(recursive=True)) == 2
+    assert doc.doc_ids == ['file1.dm', 'sub1/file11.dm']
+
+    # 3. Without a document index, the documents are listed directly
+    del doc.context['document_index']
+    assert doc.document_index is None
+    assert list(doc.documents_dict(recursive=True).values()) == [doc, doc2]
+    assert list(doc.documents_by_id().values()) == [doc, doc2]
+    assert doc.documents_list(recursive=True) == [doc, doc2]
+
+
+def test_document_index_mtimes(doc, wait):
+    """Test the scanned mtimes of the document index."""
+    index = doc.document_index
+    src_filepath = doc.src_filepath
+    doc.load()
+
+    # 1. The scanned mtimes are only used within a scan
+    with index.scanned_mtimes(doc.documents_list(recursive=True)):
+        assert index.scanning
+        mtime = index.src_mtime(src_filepath)
+        assert mtime == src_filepath.stat().st_mtime
+
+        # Changes to the file aren't seen during the scan
+        wait()  # sleep time offset needed for different mtimes
+        src_filepath.write_text('new')
+        assert index.src_mtime(src_filepath) == mtime
+
+    assert not index.scanning
+    assert index.src_mtime(src_filepath) > mtime
+    assert doc.load_required()
+
+    # The document's scanned_mtimes is used for the loads of a build
+    doc.load()
+    with doc.scanned_mtimes():
+        assert index.scanning
+        mtime = doc.src_mtime()
+        wait()  # sleep time offset needed for different mtimes
+        src_filepath.write_text('newest')
+        assert not doc.load_required()
+    assert doc.load_required()
+
+    # 2. Watched indexes reuse the scanned mtimes until they're cleared
+    index.watched = True
+    try:
+        index.scan_mtimes(doc.documents_list(recursive=True))
+        mtime = index.src_mtime(src_filepath)
+        wait()
+        src_filepath.write_text('newer')
+        assert index.src_mtime(src_filepath) == mtime
+
+        index.clear_mtimes()
+        assert index.src_mtime(src_filepath) > mtime
+    finally:
+        index.watched = False
+
+    # 3. Missing files don't have an mtime
+    src_filepath.unlink()
+    assert index.src_mtime(src_filepath) is None
+    assert doc.src_mtime() is None
+
+
 def test_document_tree1(doc, wait):
     """Test the loading of trees and sub-documents from a document."""
 
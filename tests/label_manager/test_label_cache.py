@@ -0,0 +1,142 @@
+"""
+Test the label cache.
+"""
+import os
+
+from disseminate.builders.environment import Environment
+from disseminate.label_manager import LabelManager
+from disseminate.label_manager.label_cache import LabelCache, context_key
+from disseminate.tags import Tag
+from disseminate.paths import SourcePath, TargetPath
+
+
+def test_label_cache_roundtrip(doc, tmpdir):
+    """Test saving and loading the labels of a document in the label
+    cache."""
+    context = doc.context
+    label_man = LabelManager(root_context=context)
+    label_man.add_content_label(id='fig:one', kind=('figure', 'figures'),
+                                title='first fig', context=context)
+    label_man.add_content_label(id='fig:two', kind='figure', title=None,
+                                context=context)
+    labels = label_man.snapshot().index.labels_by_doc_id('test.dm')
+
+    filepath = os.path.join(str(tmpdir), '.cache', 'labels.json')
+    cache = LabelCache(filepath=filepath)
+    cache.update(doc_id='test.dm', key='abc', labels=labels,
+                 ref_label_ids={'fig:two', 'fig:one'}, label_count=2)
+    assert cache.changed
+
+    cache.save()
+    assert not cache.changed
+    assert os.path.isfile(filepath)
+
+    # Load the cache. Entries are only returned for matching keys
+    cache = LabelCache(filepath=filepath)
+    assert cache.entry(doc_id='test.dm', key='abcd') is None
+    assert cache.entry(doc_id='other.dm', key='abc') is None
+
+    entry = cache.entry(doc_id='test.dm', key='abc')
+    assert entry['ref_label_ids'] == ['fig:one', 'fig:two']
+    assert entry['label_count'] == 2
+
+    restored = cache.load_labels(entry)
+    assert [label.id for label in restored] == ['fig:one', 'fig:two']
+    assert restored[0].kind == ('figure', 'figures')
+    assert restored[0].title == 'first fig'
+    assert restored[1].title is None
+
+    # Restored labels are reused when they're added again
+    label_man2 = LabelManager(root_context=context)
+    label_man2.add_labels(restored)
+    assert label_man2.get_label('fig:one').title == 'first fig'
+    version = label_man2.version
+
+    label = label_man2.add_content_label(id='fig:one', kind='figure',
+                                         title='first fig', context=context)
+    assert label is restored[0]
+    assert label_man2.restored == {('test.dm', 'fig:two')}
+    assert label_man2.snapshot().version == version
+
+    # Removed documents are purged
+    cache.purge(doc_ids=[])
+    assert cache.entries == dict()
+    assert cache.changed
+
+
+def test_label_cache_context_key(context_cls):
+    """Test the keys for the entries of a context."""
+    context = context_cls(body='My @b{body}', label_count=3,
+                          process_context_tags={'body'})
+    key = context_key(context)
+
+    # Tags and their strings have the same key
+    context['body'] = Tag(name='body', content='My @b{body}', attributes='',
+                          context=context)
+    assert context['body'].hash is not None
+    assert context_key(context) == key
+
+    # Changes to the entries change the key
+    context['label_count'] = 4
+    assert context_key(context) != key
+
+
+def test_label_cache_environment(tmpdir):
+    """Test the restoring of labels from the label cache of an
+    environment, and the deferred creation of tags."""
+    tmpdir = str(tmpdir)
+    src_filepath = SourcePath(project_root=tmpdir, subpath='test.dm')
+    src_filepath.write_text("""
+    ---
+    targets: html
+    ---
+    @chapter[id=chap-one]{One}
+    @chapter{Two}
+    See @ref{chap-one}.
+    """)
+    target_root = TargetPath(target_root=tmpdir)
+
+    # Load the project and build it, which saves the cache
+    env = Environment(src_filepath=src_filepath, target_root=target_root)
+    doc = env.root_document
+    assert doc.deferred is None
+    assert isinstance(doc.context['body'], Tag)
+
+    cache_filepath = env.label_cache.filepath
+    assert not cache_filepath.is_file()
+    env.build()
+    assert cache_filepath.is_file()
+    html_filepath = doc.targets['.html']
+    html = html_filepath.read_text()
+
+    # A new environment restores the labels and defers the creation of the
+    # document's tags
+    env2 = Environment(src_filepath=src_filepath, target_root=target_root)
+    doc2 = env2.root_document
+    assert doc2.deferred is not None
+    assert isinstance(doc2.context['body'], str)
+    assert doc2.context['ref_label_ids'] == {'chap-one'}
+
+    label_manager = env2.context['label_manager']
+    assert label_manager.get_label('chap-one').title == 'One'
+    label_ids = [label.id for label in
+                 label_manager.get_labels_by_kind(doc_id='test.dm',
+                                                  kinds='chapter')]
+    assert label_ids == ['chap-one', 'ch:test-dm-two']
+
+    # The build isn't needed, and the tags are still deferred
+    assert env2.build() == 'done'
+    assert doc2.deferred is not None
+
+    # The tags are created when the document is rendered
+    html_filepath.unlink()
+    assert env2.build() == 'done'
+    assert doc2.deferred is None
+    assert isinstance(doc2.context['body'], Tag)
+    assert html_filepath.read_text() == html
+
+    # Changing the document loads it fully
+    src_filepath.write_text(src_filepath.read_text() + "\nchanged")
+    env3 = Environment(src_filepath=src_filepath, target_root=target_root)
+    assert env3.root_document.deferred is None
+    assert isinstance(env3.root_document.context['body'], Tag)
@@ -1,10 +1,13 @@
 """
 Test the label manager.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from disseminate.label_manager import LabelManager, ContentLabel, DocumentLabel
 from disseminate.label_manager.exceptions import DuplicateLabel, LabelNotFound
+from disseminate.tags import Tag
 
 
 def test_label_manager_add_label(context):
@@ -155,6 +158,133 @@ def test_label_manager_get_labels_by_kind(context):
     assert len(labels) == 0
 
 
+def test_label_manager_index(context):
+    """Test the label index of the label manager."""
+    label_man = LabelManager(root_context=context)
+
+    label1 = label_man.add_content_label(id='fig:one', kind='figure',
+                                         title='1', context=context)
+    label2 = label_man.add_content_label(id='test2.dm::fig:one',
+                                         kind='figure', title='2',
+                                         context=context)
+
+    # The index is cached until the labels change
+    index = label_man.index
+    assert label_man.index is index
+    assert index.by_label_id['fig:one'] is label1
+    assert index.labels_by_kind('figure') == [label1, label2]
+    assert index.labels_by_kind('figure', doc_id='test2.dm') == [label2]
+    assert index.labels_by_doc_id('test.dm') == [label1]
+
+    # Adding a label invalidates the index
+    label3 = label_man.add_content_label(id='eq:one', kind='equation',
+                                         title='3', context=context)
+    assert label_man.index is not index
+    assert label_man.index.labels_by_kind('equation') == [label3]
+
+    # Resetting labels invalidates the index
+    index = label_man.index
+    label_man.reset(doc_ids='test.dm')
+    assert label_man.index is not index
+    assert label_man.index.labels_by_kind('figure') == [label2]
+    assert 'eq:one' not in label_man.index.by_label_id
+
+
+def test_label_manager_snapshot(context):
+    """Test the versioned snapshots of the label manager."""
+    label_man = LabelManager(root_context=context)
+
+    label1 = label_man.add_content_label(id='fig:one', kind='figure',
+                                         title='1', context=context)
+
+    # Snapshots are created when the labels are registered
+    snapshot = label_man.snapshot()
+    assert snapshot.version == label_man.version == 1
+    assert snapshot is label_man.snapshot()
+    assert dict(snapshot.labels) == {('test.dm', 'fig:one'): label1}
+    assert snapshot.index.labels_by_kind('figure') == [label1]
+
+    # Snapshots are read-only
+    with pytest.raises(TypeError):
+        snapshot.labels[('test.dm', 'fig:two')] = label1
+
+    # Adding a label doesn't change the old snapshot
+    label2 = label_man.add_content_label(id='fig:two', kind='figure',
+                                         title='2', context=context)
+    assert len(snapshot.labels) == 1
+
+    new_snapshot = label_man.snapshot()
+    assert new_snapshot.version == 2
+    assert list(new_snapshot.labels.values()) == [label1, label2]
+    assert label_man.get_labels_by_kind(kinds='figure') == [label1, label2]
+
+
+def test_label_manager_snapshot_titles(context):
+    """Test the titles of labels from tags in the snapshots of the label
+    manager."""
+    label_man = LabelManager(root_context=context)
+    tag = Tag(name='chapter', content='My title', attributes='',
+              context=context)
+    label_man.add_content_label(id='ch:one', kind='chapter', title=tag,
+                                context=context)
+
+    # The titles are formatted when the labels are registered, and the
+    # registered labels don't need the tag
+    snapshot = label_man.snapshot()
+    del tag
+    label = snapshot.labels[('test.dm', 'ch:one')]
+    assert label._title == 'My title'
+    assert label.title == 'My title'
+
+
+def test_label_manager_label_format(context):
+    """Test the compiled label formats of the label manager."""
+    label_man = LabelManager(root_context=context)
+    context['label_fmts']['caption_figure'] = '@b{Fig. @label.number}. '
+
+    label_man.add_content_label(id='fig:one', kind=('caption', 'figure'),
+                                title='one', context=context)
+    assert label_man.format_string('fig:one') == '@b{Fig. 1}. '
+
+    # The label format is compiled once for the keys and target
+    label_format = label_man.label_format('caption', 'figure')
+    assert label_format.format_str == '@b{Fig. @label.number}. '
+    assert label_man.label_format('caption', 'figure') is label_format
+
+    # Label formats are compiled again when the labels are registered
+    label_man.add_content_label(id='fig:two', kind=('caption', 'figure'),
+                                title='two', context=context)
+    assert label_man.format_string('fig:two') == '@b{Fig. 2}. '
+    assert label_man.label_format('caption', 'figure') is not label_format
+
+    # Missing label formats raise a KeyError
+    with pytest.raises(KeyError):
+        label_man.label_format('missing')
+
+
+def test_label_manager_threads(context):
+    """Test the registration and retrieval of labels from multiple
+    threads."""
+    label_man = LabelManager(root_context=context)
+
+    for i in range(50):
+        label_man.add_content_label(id='fig:{}'.format(i), kind='figure',
+                                    title=str(i), context=context)
+
+    def get_labels(i):
+        label = label_man.get_label('fig:{}'.format(i))
+        labels = label_man.get_labels_by_kind(kinds='figure')
+        return label.id, len(labels)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(get_labels, range(50)))
+
+    assert results == [('fig:{}'.format(i), 50) for i in range(50)]
+
+    # The labels were only registered once
+    assert label_man.version == 1
+
+
 def test_label_manager_doc_basic_labels(doc):
     """Tests the basic label_manager functionality with docs."""
 
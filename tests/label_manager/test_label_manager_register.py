@@ -3,6 +3,7 @@ Test the label manager register functionality.
 """
 from collections import OrderedDict
 
+from disseminate.label_manager import LabelManager
 from disseminate.label_manager.types import ContentLabel, DocumentLabel
 from disseminate.label_manager.register_orders import register_orders
 from disseminate.label_manager.register_content_labels \
@@ -257,6 +258,98 @@ def test_label_manager_doc_register_orders(doctree):
     assert len(label_man.get_labels_by_kind(doc_id=doc_id3)) == 0
 
 
+def test_label_manager_incremental_register(doctree):
+    """Test the registration of labels from the first changed document."""
+    context = doctree.context
+    doc_id1, doc_id2, doc_id3 = doctree.doc_ids
+    label_man = LabelManager(root_context=context)
+
+    def add_labels(doc_id, *label_ids):
+        for label_id in label_ids:
+            label_man.add_content_label(id=doc_id + '::' + label_id,
+                                        kind=('heading', 'chapter'),
+                                        title=label_id, context=context)
+
+    add_labels(doc_id1, 'ch:1')
+    add_labels(doc_id2, 'ch:2', 'ch:3')
+    add_labels(doc_id3, 'ch:4')
+    label_man.register()
+
+    labels = label_man.get_labels_by_kind()
+    orders = [label.order for label in labels]
+    assert orders == [(1, 1), (2, 2), (3, 3), (4, 4)]
+    assert labels[3].chapter_label is labels[3]
+
+    # Mark the orders of the labels for the first document. These are not
+    # recomputed when the labels of a later document change
+    labels[0].order = (0, 0)
+
+    # Change the labels for the last document
+    label_man.reset(doc_ids=doc_id3)
+    add_labels(doc_id3, 'ch:5', 'ch:6')
+    labels = label_man.get_labels_by_kind()
+    assert [label.id for label in labels] == ['ch:1', 'ch:2', 'ch:3', 'ch:5',
+                                              'ch:6']
+    orders = [label.order for label in labels]
+    assert orders == [(0, 0), (2, 2), (3, 3), (4, 4), (5, 5)]
+    assert labels[4].chapter_label is labels[4]
+
+    # Changing the labels for the second document recomputes the orders of the
+    # following documents
+    label_man.reset(doc_ids=doc_id2)
+    labels = label_man.get_labels_by_kind()
+    assert [label.order for label in labels] == [(0, 0), (2, 2), (3, 3)]
+
+    # A full reset recomputes all orders
+    label_man.reset()
+    add_labels(doc_id1, 'ch:1')
+    labels = label_man.get_labels_by_kind()
+    assert [label.order for label in labels] == [(1, 1)]
+
+
+def test_label_manager_register_snapshots(doctree):
+    """Test that registration doesn't change the labels of earlier
+    snapshots."""
+    context = doctree.context
+    doc_id1, doc_id2, doc_id3 = doctree.doc_ids
+    label_man = LabelManager(root_context=context)
+
+    def add_label(doc_id, label_id, kind='chapter'):
+        label_man.add_content_label(id=doc_id + '::' + label_id,
+                                    kind=('heading', kind),
+                                    title=label_id, context=context)
+
+    add_label(doc_id1, 'ch:1')
+    add_label(doc_id2, 'ch:2')
+    add_label(doc_id3, 'ch:3')
+    add_label(doc_id3, 'sec:1', kind='section')
+    snapshot1 = label_man.snapshot()
+
+    # Adding a chapter to the second document renumbers the labels of the
+    # second and third documents
+    add_label(doc_id2, 'ch:2b')
+    snapshot2 = label_man.snapshot()
+    assert snapshot2.version > snapshot1.version
+
+    # The labels of the first snapshot keep their orders and heading labels
+    old_ch3 = snapshot1.labels[(doc_id3, 'ch:3')]
+    old_sec1 = snapshot1.labels[(doc_id3, 'sec:1')]
+    assert old_ch3.order == (3, 3)
+    assert old_sec1.chapter_label is old_ch3
+
+    # The new snapshot has copies of the changed labels
+    new_ch3 = snapshot2.labels[(doc_id3, 'ch:3')]
+    new_sec1 = snapshot2.labels[(doc_id3, 'sec:1')]
+    assert new_ch3 is not old_ch3
+    assert new_ch3.order == (4, 4)
+    assert new_ch3.title == 'ch:3'
+    assert new_sec1.chapter_label is new_ch3
+
+    # The labels of the documents before the change are shared
+    key = (doc_id1, 'ch:1')
+    assert snapshot2.labels[key] is snapshot1.labels[key]
+
+
 def test_label_manager_register_content_labels_part():
     """Test the register_content_labels function with 'part' labels."""
 
@@ -1,7 +1,12 @@
 """
 Test the Label class.
 """
+import pytest
+
 from disseminate.label_manager.types import Label, ContentLabel
+from disseminate.label_manager.types.label import intern_kind
+from disseminate.label_manager.exceptions import LabelError
+from disseminate.tags import Tag
 
 
 def test_label_repr():
@@ -47,3 +52,55 @@ def test_contentlabel_repr():
     label = ContentLabel(doc_id='mydoc', id='test1', kind=(), title='My Title')
     assert repr(label) == ("ContentLabel(doc_id: 'mydoc', id: 'test1' "
                            "title: 'My Title')")
+
+
+def test_label_slots():
+    """Test the slots and interned kinds of labels."""
+    label1 = ContentLabel(doc_id='mydoc', id='test1',
+                          kind=['heading', 'chapter'], title='My Title')
+    label2 = ContentLabel(doc_id='mydoc', id='test2',
+                          kind=('heading', 'chapter'), title='My Title')
+
+    # Labels don't have a __dict__
+    assert not hasattr(label1, '__dict__')
+    with pytest.raises(AttributeError):
+        label1.other = 1
+
+    # Labels share kind tuples
+    assert label1.kind == ('heading', 'chapter')
+    assert label1.kind is label2.kind
+    assert label1.kind is intern_kind('heading chapter'.split())
+    assert intern_kind(None) is None
+
+    # The weakref attributes are stored in slots
+    assert label1.chapter_label is None
+    label2.chapter_label = label1
+    assert label2.chapter_label is label1
+    del label1
+    assert label2.chapter_label is None
+
+
+def test_contentlabel_lazy_title(doc):
+    """Test the titles of content labels formatted from tags."""
+    tag = Tag(name='chapter', content='My title. It has 2 lines.',
+              attributes='', context=doc.context)
+    label = ContentLabel(doc_id='mydoc', id='test1', kind='chapter',
+                         title=tag)
+
+    # The title is formatted from the tag without changing the label
+    assert label.title == 'My title'
+    assert label._title() is tag
+
+    # Resolved titles are kept, and they don't need the tag
+    label.resolve_title()
+    assert label._title == 'My title'
+    del tag
+    assert label.title == 'My title'
+
+    # Titles can't be formatted from tags that no longer exist
+    label.title = Tag(name='chapter', content='Other title', attributes='',
+                      context=doc.context)
+    with pytest.raises(LabelError):
+        label.title
+    with pytest.raises(LabelError):
+        label.resolve_title()
@@ -2,15 +2,22 @@
 Tornado unit tests for the handlers
 """
 import shutil
+import json
+import threading
+from asyncio import gather
+from time import sleep
 import tempfile
 import os
 from distutils.dir_util import copy_tree
 from pathlib import Path
 
-from tornado.testing import AsyncHTTPTestCase
+from tornado.testing import AsyncHTTPTestCase, gen_test
+from tornado.websocket import websocket_connect
 
 from disseminate.server.app import get_app
 from disseminate.server.handlers.store import reset_store
+from disseminate.server.handlers.projects import submit, project_lock
+from disseminate.server.handlers.static import LiveReloadStaticFileHandler
 
 # Example path
 ex4 = Path('.') / 'tests' / 'document' / 'examples' / 'ex4'
@@ -226,3 +233,161 @@ class HandlerTestCase(AsyncHTTPTestCase):
         body = response.body.decode('utf-8')  # decode binary
         assert response.code == 200
         assert 'Updated file' in body
+
+    @gen_test
+    async def test_livereload(self):
+        """Test the pushing of 'rebuilt' events to preview pages"""
+        # Connect to the live-reload endpoint
+        ws_url = self.get_url('/livereload').replace('http:', 'ws:')
+        ws = await websocket_connect(ws_url)
+
+        # Loading the page builds the document. The page includes the client
+        # script
+        url = self.get_url('/html/file1.html')
+        response = await self.http_client.fetch(url)
+        body = response.body.decode('utf-8')  # decode binary
+        assert response.code == 200
+        assert '<p>file1.dm</p>' in body
+        assert '/media/js/livereload.js' in body
+
+        # The build sends a 'rebuilt' event for the document
+        message = json.loads(await ws.read_message())
+        assert message['event'] == 'rebuilt'
+        assert message['doc_id'] == 'file1.dm'
+        assert '/html/file1.html' in message['targets']
+
+        # The client script is available
+        url = self.get_url('/media/js/livereload.js')
+        response = await self.http_client.fetch(url)
+        assert response.code == 200
+
+        ws.close()
+
+    def test_livereload_content_cache(self):
+        """Test the caching of html pages with the injected client
+        script"""
+        page = Path(self.temp_dir) / 'test.html'
+        page.write_bytes(b'<body></body>')
+        abspath = str(page)
+
+        # The page is read once for its contents and size
+        content = LiveReloadStaticFileHandler.get_injected_content(abspath)
+        assert b'/media/js/livereload.js' in content
+        assert (LiveReloadStaticFileHandler.get_injected_content(abspath)
+                is content)
+        assert (LiveReloadStaticFileHandler.get_content(abspath, 0, 6) ==
+                b'<body>')
+
+        # Changed pages are read again
+        page.write_bytes(b'<body>changed</body>')
+        content = LiveReloadStaticFileHandler.get_injected_content(abspath)
+        assert b'changed' in content
+
+    def test_project_page_etag(self):
+        """Test the ETags and cache headers for project pages"""
+        url = '/html/file1.html'
+        response = self.fetch(url, raise_error=True)  # Status code 200
+        etag = response.headers['Etag']
+        assert response.code == 200
+        assert etag
+
+        # Unchanged pages are not sent again
+        response = self.fetch(url, headers={'If-None-Match': etag})
+        assert response.code == 304
+
+        # Changed pages are sent with a new ETag
+        root_doc = Path(self.in_path) / 'src' / 'file1.dm'
+        root_doc.write_text("""
+        Updated file
+        """)
+        response = self.fetch(url, headers={'If-None-Match': etag})
+        assert response.code == 200
+        assert response.headers['Etag'] != etag
+        assert 'Updated file' in response.body.decode('utf-8')
+
+        # Pages aren't cached, but files with hashed filenames are
+        assert 'Cache-Control' not in response.headers
+        hashed = Path(self.in_path) / 'html' / 'media' / 'eq_0123456789ab.svg'
+        hashed.parent.mkdir(parents=True, exist_ok=True)
+        hashed.write_text('<svg></svg>')
+        response = self.fetch('/html/media/eq_0123456789ab.svg',
+                              raise_error=True)
+        assert 'max-age' in response.headers['Cache-Control']
+
+    def test_project_file_during_build(self):
+        """Test that the files from the last build are served while a build
+        is in progress."""
+        filepath = Path(self.in_path) / 'html' / 'test.txt'
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text('previous build')
+
+        # Hold the project lock, like a build in progress
+        held = threading.Event()
+        release = threading.Event()
+
+        def build():
+            with project_lock.write():
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=build)
+        thread.start()
+        assert held.wait(5)
+
+        # The file is served without waiting for the build
+        try:
+            response = self.fetch('/html/test.txt', raise_error=True)
+            assert response.code == 200
+            assert response.body == b'previous build'
+            assert not release.is_set()
+        finally:
+            release.set()
+            thread.join(5)
+
+    def test_media_during_build(self):
+        """Test that the server's media files are served while a build is in
+        progress."""
+        # Hold the project lock, like a build in progress
+        held = threading.Event()
+        release = threading.Event()
+
+        def build():
+            with project_lock.write():
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=build)
+        thread.start()
+        assert held.wait(5)
+
+        # The media file is served without waiting for the build
+        try:
+            response = self.fetch('/media/js/livereload.js', raise_error=True)
+            assert response.code == 200
+            assert not release.is_set()
+        finally:
+            release.set()
+            thread.join(5)
+
+    def test_submit_dedupe(self):
+        """Test that concurrent submissions with the same key share a single
+        future."""
+        calls = []
+
+        def func(value):
+            sleep(0.05)
+            calls.append(value)
+            return value
+
+        async def run():
+            future1 = submit('test', func, 1)
+            future2 = submit('test', func, 2)
+            assert future1 is future2
+            results = await gather(future1, future2)
+
+            # A new submission is run once the previous one is done
+            result3 = await submit('test', func, 3)
+            return list(results) + [result3]
+
+        assert self.io_loop.run_sync(run) == [1, 1, 3]
+        assert calls == [1, 3]
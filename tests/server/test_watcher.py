@@ -0,0 +1,77 @@
+"""
+Tests for the project filesystem watcher
+"""
+from time import sleep, monotonic
+
+from disseminate.server.watcher import ProjectWatcher, PollingBackend
+
+
+def wait_for(condition, timeout=5.):
+    """Wait until the condition function returns True"""
+    end = monotonic() + timeout
+    while not condition():
+        if monotonic() > end:
+            return False
+        sleep(0.01)
+    return True
+
+
+def test_polling_backend(tmpdir, wait):
+    """Test the detection of changed files with the polling backend."""
+    changes = []
+    backend = PollingBackend(callback=changes.append)
+
+    # Setup a file in the directory
+    test_file = tmpdir.join('test.dm')
+    test_file.write('test')
+    tmpdir.join('.test.dm.swp').write('swap')
+    backend.schedule([str(tmpdir)])
+
+    # Unchanged files aren't reported
+    backend.poll()
+    assert changes == []
+
+    # Changed and new files are reported. Hidden files are not.
+    wait()  # sleep time offset needed for different mtimes
+    test_file.write('changed')
+    tmpdir.join('new.dm').write('new')
+    tmpdir.join('.new.dm.swp').write('swap')
+    backend.poll()
+    assert changes == [[str(tmpdir.join('new.dm')), str(test_file)]]
+
+    # Removed files are reported
+    tmpdir.join('new.dm').remove()
+    backend.poll()
+    assert changes[-1] == [str(tmpdir.join('new.dm'))]
+
+
+def test_project_watcher(doc, wait):
+    """Test the rebuilding of a project by the project watcher."""
+    doc.load()
+    index = doc.document_index
+    watcher = ProjectWatcher(root_documents=[doc], interval=0.01,
+                             debounce=0.01, backend=PollingBackend)
+
+    # The directory of the source file is watched
+    assert str(doc.src_filepath.parent) in watcher.watched_paths()
+
+    watcher.start()
+    try:
+        assert watcher.running
+        assert index.watched
+
+        # Changing the source file reloads the document in the background
+        wait()  # sleep time offset needed for different mtimes
+        doc.src_filepath.write_text("""
+        ---
+        title: changed
+        targets: html
+        ---
+        """)
+        assert wait_for(lambda: watcher.builds > 0)
+        assert wait_for(lambda: doc.context['title'] == 'changed')
+    finally:
+        watcher.stop()
+
+    assert not watcher.running
+    assert not index.watched
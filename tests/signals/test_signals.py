@@ -6,6 +6,7 @@ from types import MethodType
 import pytest
 
 from disseminate.signals import signal, DuplicateSignal
+from disseminate.signals.signals import signals
 
 
 def test_signal():
@@ -100,3 +101,83 @@ def test_signal_method_replacement():
 
     test2.reset()
     test3.reset()
+
+
+def test_signal_sorted_receivers_cache():
+    """Test the cached sorted receivers of signals."""
+    test4 = signal('test4')
+
+    # Signals without receivers return no values
+    assert test4.sorted_receivers() == ()
+    assert test4.emit() == []
+
+    def receiver1():
+        return 1
+
+    def receiver2():
+        return 2
+
+    test4.connect(receiver2, 200, weak=False)
+    assert test4.emit() == [2]
+
+    # Connecting a receiver rebuilds the cache
+    test4.connect(receiver1, 100)
+    assert [order for order, *_ in test4.sorted_receivers()] == [100, 200]
+    assert test4.emit() == [1, 2]
+
+    # Modifying the receivers dict rebuilds the cache
+    del test4.receivers[200]
+    assert test4.emit() == [1]
+
+    # A dead weakref receiver rebuilds the cache
+    del receiver1
+    assert test4.sorted_receivers() == ()
+    assert test4.emit() == []
+    assert test4.receivers_dict() == dict()
+
+    test4.reset()
+
+
+def test_signal_profiling():
+    """Test the profiling of signal receivers."""
+    outer = signal('test_outer')
+    inner = signal('test_inner')
+
+    @inner.connect_via(100)
+    def inner_receiver():
+        return 'inner'
+
+    @outer.connect_via(100)
+    def outer_receiver():
+        return inner.emit()
+
+    # Profiling is disabled by default
+    assert outer.emit() == [['inner']]
+    assert outer.profile_stats() == []
+
+    # Enable profiling
+    signals.enable_profiling()
+    outer.emit()
+    outer.emit()
+    signals.disable_profiling()
+
+    outer_record, = outer.profile_stats()
+    inner_record, = signals.profile_stats(signal='test_inner')
+
+    assert outer_record.key == ('test_outer', 'outer_receiver', 100)
+    assert inner_record.key == ('test_inner', 'inner_receiver', 100)
+    assert outer_record.count == 2
+    assert inner_record.count == 2
+
+    # The self time for the outer receiver excludes the time of the inner
+    # receiver
+    assert outer_record.self_time <= outer_record.cumulative
+    assert (abs(outer_record.cumulative - outer_record.self_time -
+                inner_record.cumulative) < 1e-6)
+
+    # Profiling stops when disabled
+    outer.emit()
+    assert outer.profile_stats()[0].count == 2
+
+    outer.reset()
+    inner.reset()
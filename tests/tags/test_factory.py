@@ -43,3 +43,32 @@ def test_tag_factory_inactive_tags(doc):
     available = TagFactory.tag(tag_name='available', tag_attributes='',
                                tag_content='', context=context)
     assert not isinstance(available, Available)
+
+
+def test_tag_factory_batch(context_cls):
+    """Tests the creation of tags in batch mode."""
+
+    context = context_cls(process_paragraphs=['root'])
+    content = ("This is my @b{first -- bold} paragraph.\n\n"
+               "It's the @i{second 'italics' @b{nested -- bold}} one.")
+
+    # 1. Create a tag without batch mode
+    tag1 = TagFactory.tag(tag_name='root', tag_attributes='',
+                          tag_content=content, context=context)
+
+    # 2. Create a tag in batch mode. The deferred receivers (typography and
+    #    paragraphs) are run when the batch is completed.
+    with TagFactory.batch() as tags:
+        tag2 = TagFactory.tag(tag_name='root', tag_attributes='',
+                              tag_content=content, context=context)
+
+        # The tree is parsed, but the typography isn't processed yet
+        assert [t.name for t in tags] == ['root', 'b', 'i', 'b']
+        assert tag2.content[1].content == 'first -- bold'
+
+    # The paragraph tags were added to the batch
+    assert [t.name for t in tags] == ['root', 'b', 'i', 'b', 'p', 'p']
+
+    assert tag1.html == tag2.html
+    assert tag2.content[0].content[1].content == 'first–bold'
+    assert tag2.content[1].content[1].content[0] == 'second ‘italics’ '
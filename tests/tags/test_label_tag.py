@@ -3,8 +3,9 @@ Test the Label tag.
 """
 import pytest
 
+from disseminate.tags import Tag
 from disseminate.tags.label import (generate_label_id, create_label,
-                                    LabelAnchor, LabelTag)
+                                    label_content, LabelAnchor, LabelTag)
 from disseminate.label_manager import ContentLabel
 
 
@@ -15,56 +16,56 @@ def test_generate_label_id(mocktag_cls, context_cls):
 
     # 1. Test basic string content
     tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+               context=context)
     assert generate_label_id(tag1) == "tester-my-title"
 
     # 2. Test an extent string content
     tag2 = mocktag_cls(name='label',
-                       content='This is my title. It has 2 lines,',
-                       attributes='', context=context)
+               content='This is my title. It has 2 lines,',
+               attributes='', context=context)
     assert generate_label_id(tag2) == "tester-this-is-my-title"
 
     # 3. Test a non-string content
     tag3 = mocktag_cls(name='label',
-                       content=['This is my title.', ' It has 2 lines'],
-                       attributes='', context=context)
+               content=['This is my title.', ' It has 2 lines'],
+               attributes='', context=context)
     assert generate_label_id(tag3) == "tester-this-is-my-title"
 
     # 4. Test with short title
     tag4 = mocktag_cls(name='label',
-                       content='This is my title. It has 2 lines,',
-                       attributes='short="small title"', context=context)
+               content='This is my title. It has 2 lines,',
+               attributes='short="small title"', context=context)
     assert generate_label_id(tag4) == "tester-small-title"
 
     # 5. Test with a specific id
     tag5 = mocktag_cls(name='label',
-                       content='This is my title. It has 2 lines,',
-                       attributes='id=xrd13', context=context)
+               content='This is my title. It has 2 lines,',
+               attributes='id=xrd13', context=context)
     assert generate_label_id(tag5) == "xrd13"
 
     # 6. Test with an empty content
     # 6.1. (Without a context with a 'doc_id' entry, an error is raised.
 
     tag6 = mocktag_cls(name='label', content='', attributes='',
-                       context=dict())
+               context=dict())
     with pytest.raises(AttributeError):
         generate_label_id(tag6)
 
     # 6.2. Try with a correctly configured context
     tag6 = mocktag_cls(name='label', content='', attributes='',
-                       context=context)
+               context=context)
     assert generate_label_id(tag6) == "tester-1"
 
 
-def test_create_label(context, mocktag_cls):
+def test_create_label(context):
     """Test the create_label function."""
 
     # Get the context and label_manager from the doc
     label_manager = context['label_manager']
 
     # 1. Test a basic heading label
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=())
     label1 = label_manager.get_label(label1_id)
     assert label1_id == 'test-dm-my-title'
@@ -72,10 +73,10 @@ def test_create_label(context, mocktag_cls):
     assert label1.title == 'My title'
 
     # 2. Test an extended string in the content
-    tag2 = mocktag_cls(name='label',
-                       content='This is my title. It has 2 lines,',
-                       attributes='',
-                       context=context)
+    tag2 = Tag(name='label',
+               content='This is my title. It has 2 lines,',
+               attributes='',
+               context=context)
     label2_id = create_label(tag=tag2, kind=())
     label2 = label_manager.get_label(label2_id)
     assert label2_id == 'test-dm-this-is-my-title'
@@ -83,10 +84,10 @@ def test_create_label(context, mocktag_cls):
     assert label2.title == 'This is my title'
 
     # 3. Test with a specified id
-    tag3 = mocktag_cls(name='label',
-                       content='This is my title. It has 2 lines,',
-                       attributes='id=xrd43a',
-                       context=context)
+    tag3 = Tag(name='label',
+               content='This is my title. It has 2 lines,',
+               attributes='id=xrd43a',
+               context=context)
     label3_id = create_label(tag=tag3, kind=())
     label3 = label_manager.get_label(label3_id)
     assert label3_id == 'xrd43a'
@@ -96,12 +97,37 @@ def test_create_label(context, mocktag_cls):
 
 # Test tex targets
 
-def test_labelanchor_tex(context, mocktag_cls):
+def test_label_content(context):
+    """Test the processing of formatted label strings into content."""
+    # Strings without tags, macros or typography are not processed
+    assert label_content('Fig. 1', name='label', context=context) == 'Fig. 1'
+
+    # Other strings are processed into tags
+    content = label_content('@b{Fig. 1}', name='label', context=context)
+    assert isinstance(content, Tag)
+    assert content.name == 'b'
+    assert content.content == 'Fig. 1'
+
+    content = label_content("The 'one'", name='label', context=context)
+    assert content == 'The ‘one’'
+
+    # The processed contents are cached until the labels are registered again
+    content = label_content('@b{Fig. 1}', name='label', context=context)
+    assert label_content('@b{Fig. 1}', name='label', context=context) is content
+
+    label_manager = context['label_manager']
+    label_manager.add_content_label(id='fig:one', kind='figure', title='One',
+                                    context=context)
+    assert (label_content('@b{Fig. 1}', name='label', context=context) is
+            not content)
+
+
+def test_labelanchor_tex(context):
     """Test the LabelAnchor tag with tex targets."""
 
     # 1. Test a basic label
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=())
     assert isinstance(label1_id, str)
 
@@ -110,7 +136,7 @@ def test_labelanchor_tex(context, mocktag_cls):
     assert labelanchor1.tex == '\\label{test-dm-my-title}'
 
 
-def test_labeltag_tex(context, mocktag_cls):
+def test_labeltag_tex(context):
     """Test the LabelTag with tex targets."""
 
     label_man = context['label_manager']
@@ -118,8 +144,8 @@ def test_labeltag_tex(context, mocktag_cls):
     # 1. Test a label tag with a basic kind. kind = ('heading', 'chapter')
     context['label_fmts']['heading'] = '@label.title'
     kind = ('heading',)
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=kind)
 
     labeltag1 = LabelTag(name='label', content=label1_id, attributes='',
@@ -132,8 +158,8 @@ def test_labeltag_tex(context, mocktag_cls):
     context['label_fmts']['heading_chapter'] = 'Chapter @label.chapter_number '
     kind = ('heading', 'chapter')
 
-    tag2 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag2 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label2_id = create_label(tag=tag2, kind=kind)
 
     labeltag2 = LabelTag(name='label', content=label2_id, attributes='',
@@ -143,12 +169,12 @@ def test_labeltag_tex(context, mocktag_cls):
 
 # Test html targets
 
-def test_labelanchor_html(context, mocktag_cls):
+def test_labelanchor_html(context):
     """Test the LabelAnchor tag with html targets."""
 
     # 1. Test a basic label
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=())
     assert isinstance(label1_id, str)
 
@@ -157,7 +183,7 @@ def test_labelanchor_html(context, mocktag_cls):
     assert labelanchor1.html == '<span id="test-dm-my-title"></span>\n'
 
 
-def test_labeltag_html(context, mocktag_cls):
+def test_labeltag_html(context):
     """Test the LabelTag with html targets."""
 
     label_man = context['label_manager']
@@ -165,8 +191,8 @@ def test_labeltag_html(context, mocktag_cls):
     # 1. Test a label tag with a basic kind. kind = ('heading', 'chapter')
     context['label_fmts']['heading'] = '@label.title'
     kind = ('heading',)
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=kind)
 
     labeltag1 = LabelTag(name='label', content=label1_id, attributes='',
@@ -179,8 +205,8 @@ def test_labeltag_html(context, mocktag_cls):
     context['label_fmts']['heading_chapter'] = 'Chapter @label.chapter_number '
     kind = ('heading', 'chapter')
 
-    tag2 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag2 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label2_id = create_label(tag=tag2, kind=kind)
 
     labeltag2 = LabelTag(name='label', content=label2_id, attributes='',
@@ -191,12 +217,12 @@ def test_labeltag_html(context, mocktag_cls):
 
 # Test xhtml targets
 
-def test_labelanchor_xhtml(context, mocktag_cls, is_xml):
+def test_labelanchor_xhtml(context, is_xml):
     """Test the LabelAnchor tag with html targets."""
 
     # 1. Test a basic label
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=())
     assert isinstance(label1_id, str)
 
@@ -206,7 +232,7 @@ def test_labelanchor_xhtml(context, mocktag_cls, is_xml):
     assert is_xml(labelanchor1.xhtml)
 
 
-def test_labeltag_xhtml(context, mocktag_cls, is_xml):
+def test_labeltag_xhtml(context, is_xml):
     """Test the LabelTag with html targets."""
 
     label_man = context['label_manager']
@@ -214,8 +240,8 @@ def test_labeltag_xhtml(context, mocktag_cls, is_xml):
     # 1. Test a label tag with a basic kind. kind = ('heading', 'chapter')
     context['label_fmts']['heading'] = '@label.title'
     kind = ('heading',)
-    tag1 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag1 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label1_id = create_label(tag=tag1, kind=kind)
 
     labeltag1 = LabelTag(name='label', content=label1_id, attributes='',
@@ -229,8 +255,8 @@ def test_labeltag_xhtml(context, mocktag_cls, is_xml):
     context['label_fmts']['heading_chapter'] = 'Chapter @label.chapter_number '
     kind = ('heading', 'chapter')
 
-    tag2 = mocktag_cls(name='label', content='My title', attributes='',
-                       context=context)
+    tag2 = Tag(name='label', content='My title', attributes='',
+               context=context)
     label2_id = create_label(tag=tag2, kind=kind)
 
     labeltag2 = LabelTag(name='label', content=label2_id, attributes='',
@@ -3,7 +3,7 @@ Tests for navigation tags.
 """
 import pathlib
 
-from disseminate.tags.navigation import Next, Prev, Pdflink
+from disseminate.tags.navigation import Next, Prev, Pdflink, NavigationMap
 
 
 ex1_root = pathlib.Path('tests') / 'tags' / 'examples' / 'toc_ex1'
@@ -165,6 +165,62 @@ def test_navigation_missing_target_html(doctree, wait):
             '<a href="test.html#sec:test-dm-0" class="ref">0</a>')
 
 
+def test_navigation_map(doctree, wait, monkeypatch):
+    """Test the navigation map for a document tree."""
+
+    # Get the documents from the doctree
+    doc1, doc2, doc3 = doctree.documents_list(only_subdocuments=False)
+
+    # Without headings, the documents have positions but no labels
+    nav_map = NavigationMap.get(doc1)
+    assert nav_map.positions['.html'] == {'test.dm': 0, 'test2.dm': 1,
+                                          'test3.dm': 2}
+    assert nav_map.labels['.html'] == (None, None, None)
+    assert nav_map.links('test2.dm', '.html') == [('prev', None),
+                                                  ('curr', None),
+                                                  ('next', None)]
+
+    # The map is reused until the headings change, and the rows aren't
+    # created again until the labels are registered again
+    label_manager = doc1.context['label_manager']
+    assert nav_map.version == (label_manager.snapshot().version,
+                               ('test.dm', 'test2.dm', 'test3.dm'))
+
+    calls = []
+    document_rows = NavigationMap.document_rows
+    monkeypatch.setattr(NavigationMap, 'document_rows',
+                        lambda *args, **kwargs:
+                        calls.append(1) or document_rows(*args, **kwargs))
+    assert NavigationMap.get(doc1) is nav_map
+    assert calls == []
+
+    add_headings(doc1, doc2, doc3, wait=wait)
+    new_map = NavigationMap.get(doc1)
+    assert new_map is not nav_map
+    assert len(calls) > 0
+
+    count = len(calls)
+    assert NavigationMap.get(doc1) is new_map
+    assert len(calls) == count
+
+    label1, label2, label3 = new_map.labels['.html']
+    assert label1.id == 'sec:test-dm-0'
+    assert new_map.links('test.dm', '.html') == [('prev', None),
+                                                 ('curr', label1),
+                                                 ('next', label2)]
+    assert new_map.links('test3.dm', '.html') == [('prev', label2),
+                                                  ('curr', label3),
+                                                  ('next', None)]
+
+    # Missing documents and targets have no labels
+    assert new_map.links('missing.dm', '.html') == [('prev', None),
+                                                    ('curr', None),
+                                                    ('next', None)]
+    assert new_map.links('test.dm', '.epub') == [('prev', None),
+                                                 ('curr', None),
+                                                 ('next', None)]
+
+
 def test_pdflink(load_example):
     """Test the pdflink tag."""
 
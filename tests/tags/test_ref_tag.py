@@ -1,10 +1,12 @@
 """
 Test the Ref tag.
 """
+from collections import namedtuple
+
 import pytest
 
 from disseminate.tags import Tag
-from disseminate.tags.ref import Ref
+from disseminate.tags.ref import Ref, add_ref_labels, link_settings
 from disseminate.label_manager import LabelNotFound
 
 
@@ -23,6 +25,45 @@ def test_ref_missing(doc):
         root.html
 
 
+def test_ref_label_dependencies(doc):
+    """Test the recorded label dependencies of ref tags."""
+    doc.src_filepath.write_text("""
+    @chapter[id=ch:one]{One}
+    @chapter[id=ch:two]{Two}
+    @ref{ch:one} @ref{ch:two}
+    """)
+    doc.load()
+
+    # The label ids are recorded when the document is loaded
+    context = doc.context
+    assert context['ref_label_ids'] == {'ch:one', 'ch:two'}
+
+    # The labels are cached until the labels are registered again
+    label_manager = context['label_manager']
+    labels = label_manager.get_labels_by_id(['ch:one', 'ch:two'])
+    builder = namedtuple('Builder', 'context')(context=context)
+
+    assert add_ref_labels(builder) == labels
+    cached = context['ref_labels']
+    assert add_ref_labels(builder) == labels
+    assert context['ref_labels'] is cached
+
+    # The labels are cached for the label ids
+    context['ref_label_ids'] = {'ch:one'}
+    assert add_ref_labels(builder) == labels[:1]
+    context['ref_label_ids'] = {'ch:two'}
+    assert add_ref_labels(builder) == labels[1:]
+
+    label_manager.reset(doc_ids='test.dm')
+    with pytest.raises(LabelNotFound):
+        add_ref_labels(builder)
+
+    # The label ids are removed when the context is reset
+    context.reset()
+    assert 'ref_label_ids' not in context
+    assert 'ref_labels' not in context
+
+
 # tex tests
 
 def test_ref_tex(doc):
@@ -74,6 +115,35 @@ def test_ref_html(doc):
                         '<strong>My Fig. 1</strong></a>')
 
 
+def test_ref_fragments(doc):
+    """Test the caching of rendered ref tags."""
+    context = doc.context
+    label_manager = context['label_manager']
+    label_manager.add_content_label(id='test', kind=('caption', 'figure'),
+                                    title='my test', context=context)
+    ref = Tag(name='root', content='@ref{test}', attributes='',
+              context=context).content
+
+    # The rendered tag is cached for each version of the labels
+    html = ref.html
+    fragments = label_manager.ref_table().fragments
+    assert len(fragments) == 1
+    assert ref.html == html
+    assert ref.tex_fmt() == ref.tex_fmt()
+    assert len(fragments) == 2
+
+    # The elements are copies
+    element = ref.html_fmt(level=2)
+    assert not isinstance(element, str)
+    assert ref.html_fmt(level=2) is not element
+
+    # The cache is replaced when the labels are registered again
+    label_manager.add_content_label(id='test2', kind=('caption', 'figure'),
+                                    title='my test', context=context)
+    assert ref.html == html
+    assert label_manager.ref_table().fragments is not fragments
+
+
 def test_ref_html_crossreference_html(doctree):
     """Test the ref tag between documents, using the html target."""
 
@@ -113,6 +183,45 @@ def test_ref_html_crossreference_html(doctree):
                          '<strong>My Fig. 1</strong></a>')
 
 
+def test_ref_resolve(doctree):
+    """Test the resolution table for ref tags."""
+    doc1 = doctree
+    doc2, doc3 = doc1.documents_list(only_subdocuments=True)
+
+    # Create a label for doc2
+    label_manager = doc1.context['label_manager']
+    label = label_manager.add_content_label(id='doc2',
+                                            kind=('caption', 'figure'),
+                                            title='my test',
+                                            context=doc2.context)
+    fmts = doc1.context['label_fmts']
+    fmts['ref_caption_figure_html'] = 'Fig. @label.number'
+
+    root = Tag(name='root', content='@ref{doc2}', attributes='',
+               context=doc1.context)
+    ref = root.content
+
+    # Resolve the reference
+    resolution = ref.resolve(target='.html')
+    assert resolution.label is label
+    assert resolution.document is doc2
+    assert resolution.url == 'test2.html'
+    assert resolution.format_str == 'Fig. 1'
+    assert Ref.resolved_url(resolution) == 'test2.html#doc2'
+
+    # Resolutions are stored in the table until the labels are registered
+    # again
+    table = label_manager.ref_table()
+    key = ('test.dm', 'doc2', '.html', link_settings(doc1.context))
+    assert table[key] is resolution
+    assert ref.resolve(target='.html') is resolution
+
+    label_manager.add_content_label(id='doc1', kind=('caption', 'figure'),
+                                    title='my test', context=doc1.context)
+    assert label_manager.ref_table() is not table
+    assert ref.resolve(target='.html') is not resolution
+
+
 # xhtml tests
 
 def test_ref_xhtml(doc, is_xml):
@@ -3,7 +3,7 @@ Test the TOC tag.
 """
 import pathlib
 
-from disseminate.tags.toc import Toc
+from disseminate.tags.toc import Toc, TocModel
 
 # setup example paths
 
@@ -106,6 +106,42 @@ def test_toc_reference_tags(load_example):
     assert tags[3].attributes['level'] == 3  # section
 
 
+def test_toc_model(load_example):
+    """Test the TOC model shared by the TOC tags of a project."""
+    doc1 = load_example(ex2_root / 'file1.dm')
+    doc2 = doc1.documents_list(only_subdocuments=True)[0]
+    label_manager = doc1.context['label_manager']
+
+    toc1 = Toc(name='toc', content='all headings', attributes='',
+               context=doc1.context)
+    toc2 = Toc(name='toc', content='all headings', attributes='',
+               context=doc2.context)
+
+    # The TOC model and entries for all documents are shared
+    model = TocModel.get(label_manager)
+    assert toc1.toc_model is toc2.toc_model is model
+    assert toc1.entries == toc2.entries
+    assert [level for label, level in toc1.entries] == [3, 3, 4, 3]
+    assert len(model.entries) == 1
+
+    # Abbreviated entries are specific to each document
+    toc3 = Toc(name='toc', content='all headings abbreviated', attributes='',
+               context=doc2.context)
+    assert len(toc3.entries) == 4
+    assert len(model.entries) == 2
+
+    # The rendered fragments are cached
+    html = toc1.html
+    assert len(model.fragments) == 1
+    assert toc1.html is html
+    assert toc1.reference_tags == toc1.reference_tags
+
+    # A new model is created when the labels are registered again
+    label_manager.reset(doc_ids=doc2.doc_id)
+    assert TocModel.get(label_manager) is not model
+    assert len(toc1.entries) == 2
+
+
 # tex target
 
 def test_toc_heading_tex(load_example):
@@ -1,7 +1,9 @@
 """
 Test classes utility functions.
 """
-from disseminate.utils.classes import weakattr
+from disseminate.utils.classes import (weakattr, all_subclasses,
+                                       all_attributes_values, class_metadata,
+                                       RegisteredClass)
 
 
 def test_weakattrs():
@@ -58,3 +60,79 @@ def test_weakattrs():
     del subtest2
     assert subtest1.a is None
     assert subtest1.c is None
+
+
+def test_weakattrs_slots():
+    """Test weakref attributes stored in slots."""
+
+    class Test(object):
+        __slots__ = ('_a', '__weakref__')
+
+        a = weakattr(slot='_a')
+
+    test1 = Test()
+    test2 = Test()
+
+    assert test1.a is None
+    test1.a = test2
+    assert test1.a is test2
+
+    # Test deleting an attribute
+    del test1.a
+    assert test1.a is None
+
+    # Try removing an object
+    test1.a = test2
+    del test2
+    assert test1.a is None  # Dead link
+
+
+def test_class_metadata():
+    """Test the cached metadata for registered classes."""
+
+    class A(RegisteredClass):
+        values = {'a'}
+
+    class B(A):
+        values = {'b'}
+
+    # The metadata is cached
+    assert all_subclasses(A) == [B]
+    assert all_subclasses(A) is not all_subclasses(A)  # copies are returned
+    assert all_attributes_values(B, 'values') == {'a', 'b'}
+    assert isinstance(all_attributes_values(B, 'values'), set)
+    assert (all_attributes_values(B, 'values') is not
+            all_attributes_values(B, 'values'))  # copies are returned
+
+    # Defining a new subclass invalidates the cache
+    generation = class_metadata.generation
+
+    class C(B):
+        values = {'c'}
+
+    assert class_metadata.generation > generation
+    assert all_subclasses(A) == [B, C]
+    assert all_attributes_values(C, 'values') == {'a', 'b', 'c'}
+
+
+def test_class_metadata_weakrefs():
+    """Test that the class metadata cache doesn't keep classes alive."""
+    import gc
+    import weakref
+
+    class A(RegisteredClass):
+        values = {'a'}
+
+    class B(A):
+        values = {'b'}
+
+    # Cache the subclasses and attribute values
+    assert all_subclasses(A) == [B]
+    assert all_attributes_values(B, 'values') == {'a', 'b'}
+
+    ref = weakref.ref(B)
+    del B
+    gc.collect()
+
+    assert ref() is None
+    assert all_subclasses(A) == []
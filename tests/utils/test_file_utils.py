@@ -5,7 +5,8 @@ import pathlib
 
 import pytest
 
-from disseminate.utils.file import link_or_copy
+from disseminate.utils.file import (link_or_copy, read_text, atomic_open,
+                                   write_text)
 
 
 def test_link_or_copy(tmpdir):
@@ -40,3 +41,47 @@ def test_link_or_copy(tmpdir):
     link_or_copy(src, dst)
 
     assert src.read_text() == dst.read_text()
+
+
+def test_read_text(tmpdir):
+    """Test the read_text function"""
+    tmpdir = pathlib.Path(tmpdir)
+    filepath = tmpdir / "source_file.dm"
+
+    filepath.write_bytes("My \u2018first\u2019 line\r\nsecond\rthird\n"
+                         .encode('utf-8'))
+    expected = filepath.read_text(encoding='utf-8')
+
+    # 1. Read the file directly and memory-mapped
+    assert read_text(filepath, encoding='utf-8') == expected
+    assert read_text(filepath, mmap_size=1, encoding='utf-8') == expected
+    assert expected == 'My \u2018first\u2019 line\nsecond\nthird\n'
+
+    # 2. Read an empty file
+    filepath.write_text('')
+    assert read_text(filepath, mmap_size=0) == ''
+
+
+def test_atomic_open(tmpdir):
+    """Test the atomic replacement of files with atomic_open and
+    write_text."""
+    tmpdir = pathlib.Path(tmpdir)
+    filepath = tmpdir / 'test.txt'
+
+    write_text(filepath, 'first')
+    assert filepath.read_text() == 'first'
+
+    # The file isn't replaced until it's written
+    with atomic_open(filepath, 'wb') as f:
+        f.write(b'second')
+        assert filepath.read_text() == 'first'
+    assert filepath.read_text() == 'second'
+
+    # The file isn't replaced, and the temporary file is removed, if the
+    # write fails
+    with pytest.raises(ValueError):
+        with atomic_open(filepath) as f:
+            f.write('third')
+            raise ValueError
+    assert filepath.read_text() == 'second'
+    assert [p.name for p in tmpdir.iterdir()] == ['test.txt']
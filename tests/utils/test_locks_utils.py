@@ -0,0 +1,84 @@
+"""
+Test the lock utilities.
+"""
+import threading
+
+from disseminate.utils.locks import RWLock
+
+
+def test_rwlock_readers():
+    """Test that multiple threads can hold the read lock."""
+    lock = RWLock()
+    barrier = threading.Barrier(3, timeout=5)
+    readers = []
+
+    def read():
+        with lock.read():
+            barrier.wait()  # all threads hold the read lock
+            readers.append(lock.readers)
+            barrier.wait()
+
+    threads = [threading.Thread(target=read) for i in range(3)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    assert readers == [3, 3, 3]
+    assert lock.readers == 0
+
+
+def test_rwlock_writer():
+    """Test that the write lock excludes readers and other writers."""
+    lock = RWLock()
+    events = []
+    started = threading.Event()
+
+    def read():
+        started.set()
+        with lock.read():
+            events.append('read')
+
+    def write():
+        with lock.write():
+            events.append('write')
+
+    with lock.write():
+        # The writer is reentrant
+        with lock.write():
+            pass
+        assert lock.writing
+
+        threads = [threading.Thread(target=read),
+                   threading.Thread(target=write)]
+        [t.start() for t in threads]
+        started.wait(5)
+        events.append('first')
+
+    [t.join(5) for t in threads]
+
+    assert events[0] == 'first'
+    assert sorted(events[1:]) == ['read', 'write']
+    assert not lock.writing
+
+
+def test_rwlock_acquire_read():
+    """Test the acquisition and release of the read lock from different
+    threads."""
+    lock = RWLock()
+    assert lock.acquire_read(blocking=False)
+    assert lock.readers == 1
+
+    # The read lock can be released by another thread
+    thread = threading.Thread(target=lock.release_read)
+    thread.start()
+    thread.join(5)
+    assert lock.readers == 0
+
+    # The read lock isn't available while a writer holds the lock
+    with lock.write():
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(lock.acquire_read(blocking=False)))
+        thread.start()
+        thread.join(5)
+        assert results == [False]
+    assert lock.readers == 0
@@ -7,7 +7,7 @@ from collections import namedtuple
 
 from disseminate.utils.string import (hashtxt, titlelize, strip_end_quotes,
                                       str_to_dict, str_to_list, group_strings,
-                                      replace_macros)
+                                      replace_macros, split_macros)
 
 
 def test_hashtxt(tmpdir):
@@ -200,6 +200,20 @@ def test_group_strings():
             ['ab', [1, 'cd'], 'ef'])
 
 
+def test_split_macros():
+    """Test the split_macros function."""
+    assert split_macros('') == []
+    assert split_macros('no macros') == ['no macros']
+    assert (split_macros('My @test.name{} and @other.') ==
+            ['My ', ('@test.name', '@test.name{}'), ' and ',
+             ('@other.', '@other.')])
+
+    # The segments are joined into the original string
+    s = '@b{Fig. @label.number}. '
+    assert ''.join(seg if isinstance(seg, str) else seg[1]
+                   for seg in split_macros(s)) == s
+
+
 def test_replace_macros_basic():
     """Basic tests of the replace_macros function."""
 
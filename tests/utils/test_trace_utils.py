@@ -0,0 +1,55 @@
+"""
+Test the trace utilities.
+"""
+import json
+import threading
+
+from disseminate.utils.trace import Tracer
+
+
+def test_tracer_disabled():
+    """Test that a disabled tracer does not record events."""
+    tracer = Tracer()
+
+    with tracer.span('test', cat='test'):
+        pass
+
+    def func():
+        return 1
+
+    assert tracer.wrap(func, name='func') is func
+    assert len(tracer.events) == 0
+
+
+def test_tracer_threads(tmpdir):
+    """Test that events from different threads are recorded on separate
+    tracks and saved in the trace-event format."""
+    tracer = Tracer()
+    tracer.enable()
+
+    with tracer.span('main', cat='test', key='value'):
+        pass
+
+    # Run a wrapped function in a separate thread
+    func = tracer.wrap(lambda: None, name='worker', cat='test')
+    thread = threading.Thread(target=func, name='worker-thread')
+    thread.start()
+    thread.join()
+
+    assert len(tracer.events) == 2
+    main_event, worker_event = tracer.events
+    assert main_event['name'] == 'main'
+    assert main_event['args'] == {'key': 'value'}
+    assert worker_event['name'] == 'worker'
+    assert main_event['tid'] != worker_event['tid']
+
+    # Save the trace
+    filepath = tmpdir / 'trace.json'
+    tracer.save(str(filepath))
+    trace = json.loads(filepath.read_text(encoding='utf-8'))
+
+    events = trace['traceEvents']
+    thread_names = {e['tid']: e['args']['name'] for e in events
+                    if e['ph'] == 'M'}
+    assert thread_names[worker_event['tid']] == 'worker-thread'
+    assert len([e for e in events if e['ph'] == 'X']) == 2